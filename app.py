@@ -1,13 +1,22 @@
-from flask import Flask, render_template, request, redirect, url_for, session, flash, jsonify, send_file, send_from_directory
+from flask import Flask, Response, render_template, request, redirect, url_for, session, flash, jsonify, send_file, send_from_directory
 from werkzeug.security import generate_password_hash, check_password_hash
 from werkzeug.utils import secure_filename
-from google_sheets_db import GoogleSheetsDB
+from storage_backend import create_db, SHEET_HEADERS
+from rate_limiter import shared_limiter
+from log_writer import ActivityLogWriter
+from bulk_moves import parse_asset_codes, plan_moves
+from asset_import import import_assets, IMPORT_EXTENSIONS
+from export_jobs import ExportJobs
+from reports import Filter, REPORTS, run_report, export_file, export_filename, iter_csv, REPORT_FORMATS
+from pagination import paginate, PER_PAGE_CHOICES
 from config import Config
 from datetime import datetime
-import io
+import atexit
 import os
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+import tempfile
+import threading
+import time
+import uuid
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.lib.units import inch
@@ -31,6 +40,9 @@ DOCUMENT_FOLDER = os.path.join(UPLOAD_FOLDER, 'documents')
 ALLOWED_IMAGE_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'webp'}
 ALLOWED_DOCUMENT_EXTENSIONS = {'pdf', 'doc', 'docx', 'xls', 'xlsx', 'txt'}
 
+# Asset columns read by the dashboard (Asset Code is always included)
+DASHBOARD_ASSET_COLUMNS = ['Asset Category', 'Location', 'Asset Status', 'Brand', 'Amount']
+
 # Create upload directories if they don't exist
 os.makedirs(IMAGE_FOLDER, exist_ok=True)
 os.makedirs(DOCUMENT_FOLDER, exist_ok=True)
@@ -44,8 +56,8 @@ def allowed_file(filename, allowed_extensions):
 
 # Initialize database
 try:
-    db = GoogleSheetsDB()
-    print("[SUCCESS] Google Sheets connection established successfully")
+    db = create_db()
+    print(f"[SUCCESS] {type(db).__name__} storage backend ready ({Config.STORAGE_BACKEND})")
 except FileNotFoundError as e:
     print(f"[ERROR] Credentials file not found: {e}")
     print("Please ensure credentials.json exists in the project root directory.")
@@ -60,27 +72,81 @@ except Exception as e:
     traceback.print_exc()
     db = None
 
+# Activity logs are written in the background so requests don't wait on them
+log_writer = ActivityLogWriter(db) if db else None
+if log_writer:
+    atexit.register(log_writer.close)
+
+# Report exports built by a worker pool instead of inside the request
+export_jobs = ExportJobs(db, Config.EXPORT_DIR, Config.EXPORT_WORKERS,
+                         Config.EXPORT_REUSE_SECONDS, Config.EXPORT_KEEP_SECONDS) if db else None
+if export_jobs:
+    atexit.register(export_jobs.close)
+
+def activity_entry(action, entity_type, entity_id, description, details=''):
+    """Build an ActivityLogs entry for the current user, without an ID"""
+    return {
+        'Date & Time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'Type': 'Activity',
+        'User': session.get('user_id', 'Unknown'),
+        'Action': action,
+        'Entity Type': entity_type,
+        'Entity ID': str(entity_id),
+        'Description': description,
+        'Details': details
+    }
+
 def log_activity(action, entity_type, entity_id, description, details=''):
     """Helper function to log activities"""
     if not db:
         return
     try:
-        log_id = db.get_next_id('ActivityLogs')
-        log_data = {
-            'ID': log_id,
-            'Date & Time': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-            'Type': 'Activity',
-            'User': session.get('user_id', 'Unknown'),
-            'Action': action,
-            'Entity Type': entity_type,
-            'Entity ID': str(entity_id),
-            'Description': description,
-            'Details': details
-        }
-        db.insert('ActivityLogs', log_data)
+        # The writer assigns the ID when the entry is written
+        log_writer.log(activity_entry(action, entity_type, entity_id, description, details))
     except Exception as e:
         print(f"Error logging activity: {e}")
 
+@app.context_processor
+def inject_listing_options():
+    """Export formats and page sizes the listing templates offer"""
+    return {'export_formats': REPORT_FORMATS, 'per_page_choices': PER_PAGE_CHOICES}
+
+# Fields the asset and movement listings can be sorted by, and what ?search= matches
+ASSET_SORT_FIELDS = ['Asset Code', 'Item Name', 'Asset Category', 'Asset SubCategory', 'Brand',
+                     'Location', 'Amount', 'Asset Status']
+ASSET_SEARCH = Filter('search', match='search', fields=['Asset Code', 'Item Name'])
+MOVEMENT_SORT_FIELDS = ['ID', 'Asset Code', 'From Location', 'To Location', 'Movement Date', 'Moved By']
+MOVEMENT_SEARCH = Filter('search', match='search',
+                         fields=['Asset Code', 'From Location', 'To Location', 'Moved By', 'Notes'])
+
+def listing_page(sheet_name, search, sortable):
+    """The page of a sheet's records asked for by the query string (search, sort, order, page, per_page)"""
+    records = db.get_all(sheet_name)
+    term = request.args.get('search', '').strip()
+    if term:
+        records = [r for r in records if search.accepts(r, term)]
+    return paginate(records, request.args, sortable)
+
+def report_page(result):
+    """The page of a report's rows asked for by the query string, sortable by any output column"""
+    return paginate(result.rows, request.args, [c.field for c in result.report.columns])
+
+def page_json(page):
+    """JSON for a page of records, with the URL of the next page"""
+    data = page.to_dict()
+    data['next_url'] = None
+    if page.has_next:
+        args = request.args.to_dict()
+        args.update(request.view_args, page=page.page + 1)
+        data['next_url'] = url_for(request.endpoint, **args)
+    return jsonify(data)
+
+def amount_value(value):
+    try:
+        return float(str(value).replace(',', '') or 0)
+    except ValueError:
+        return 0
+
 def login_required(f):
     """Decorator to require login"""
     from functools import wraps
@@ -191,9 +257,7 @@ def dashboard():
         flash('Database not configured. Please check your Google Sheets setup.', 'danger')
         return redirect(url_for('login'))
     
-    assets = db.get_all('Assets')
-    categories = db.get_all('Categories')
-    locations = db.get_all('Locations')
+    assets = db.get_all('Assets', columns=DASHBOARD_ASSET_COLUMNS)
     
     # Prepare data for graphs
     # Assets by Category
@@ -416,6 +480,36 @@ def delete_brand(brand_id):
         flash('Brand deleted successfully', 'success')
     return redirect(url_for('brands'))
 
+# Running and finished asset imports, keyed by job ID
+import_jobs = {}
+import_jobs_lock = threading.Lock()
+
+def expire_import_jobs():
+    """Forget imports that finished more than IMPORT_KEEP_SECONDS ago (import_jobs_lock held)"""
+    now = time.time()
+    for job_id, job in list(import_jobs.items()):
+        if job['status'] != 'running' and now - job['finished_at'] > Config.IMPORT_KEEP_SECONDS:
+            del import_jobs[job_id]
+
+def run_import_job(job_id, path, filename, log_data):
+    """Import an uploaded file in the background, recording progress in import_jobs"""
+    def progress(result):
+        with import_jobs_lock:
+            import_jobs[job_id].update(result)
+    
+    try:
+        result = import_assets(db, path, filename, progress)
+        log_writer.log(dict(log_data, Description=f"Imported {result['imported']} assets from {filename}",
+                            Details=f"{result['failed']} rows rejected"))
+        status = {'status': 'done'}
+    except Exception as e:
+        print(f"Error importing assets from {filename}: {e}")
+        status = {'status': 'failed', 'error': str(e)}
+    finally:
+        os.remove(path)
+    with import_jobs_lock:
+        import_jobs[job_id].update(status, finished_at=time.time())
+
 # Asset Entry Routes
 @app.route('/assets')
 @login_required
@@ -424,12 +518,16 @@ def assets():
         flash('Database not configured', 'danger')
         return redirect(url_for('dashboard'))
     
-    assets_list = db.get_all('Assets')
-    # Debug: Print number of assets retrieved
-    print(f"DEBUG: Retrieved {len(assets_list)} assets from Google Sheets")
-    if assets_list:
-        print(f"DEBUG: First asset: {assets_list[0]}")
-    return render_template('assets.html', assets=assets_list, role=session.get('role'))
+    page = listing_page('Assets', ASSET_SEARCH, ASSET_SORT_FIELDS)
+    return render_template('assets.html', page=page, assets=page.items,
+                         current_search=request.args.get('search', '').strip(), role=session.get('role'))
+
+@app.route('/api/assets')
+@login_required
+def api_assets():
+    if not db:
+        return jsonify({'error': 'Database not configured'}), 503
+    return page_json(listing_page('Assets', ASSET_SEARCH, ASSET_SORT_FIELDS))
 
 @app.route('/assets/add', methods=['GET', 'POST'])
 @login_required
@@ -510,14 +608,57 @@ def add_asset():
             flash('Failed to add asset', 'danger')
     
     # Get master data for dropdowns
-    categories = db.get_all('Categories')
-    subcategories = db.get_all('Subcategories')
-    brands = db.get_all('Brands')
-    locations = db.get_all('Locations')
+    master = db.get_many(['Categories', 'Subcategories', 'Brands', 'Locations'])
+    categories = master['Categories']
+    subcategories = master['Subcategories']
+    brands = master['Brands']
+    locations = master['Locations']
     
     return render_template('add_asset.html', categories=categories, 
                          subcategories=subcategories, brands=brands, locations=locations)
 
+@app.route('/assets/import', methods=['GET', 'POST'])
+@login_required
+def asset_import_page():
+    if not db:
+        flash('Database not configured', 'danger')
+        return redirect(url_for('assets'))
+    
+    if request.method == 'POST':
+        import_file = request.files.get('import_file')
+        if not import_file or not import_file.filename or not allowed_file(import_file.filename, IMPORT_EXTENSIONS):
+            flash('Please choose a CSV or XLSX file', 'danger')
+            return redirect(url_for('asset_import_page'))
+        
+        # The upload is spooled to disk so the import can outlive the request
+        filename = secure_filename(import_file.filename)
+        fd, path = tempfile.mkstemp(suffix=os.path.splitext(filename)[1])
+        with os.fdopen(fd, 'wb') as temp_file:
+            import_file.save(temp_file)
+        
+        job_id = uuid.uuid4().hex
+        with import_jobs_lock:
+            expire_import_jobs()
+            import_jobs[job_id] = {'status': 'running', 'filename': filename, 'user': session.get('user_id'),
+                                   'rows': 0, 'imported': 0, 'failed': 0, 'errors': [], 'finished_at': 0}
+        log_data = activity_entry('Import', 'Asset', filename, '')
+        threading.Thread(target=run_import_job, args=(job_id, path, filename, log_data),
+                         name=f'asset-import-{job_id[:8]}', daemon=True).start()
+        return redirect(url_for('asset_import_page', job=job_id))
+    
+    return render_template('import_assets.html', job_id=request.args.get('job', ''),
+                           columns=SHEET_HEADERS['Assets'])
+
+@app.route('/assets/import/<job_id>/status')
+@login_required
+def asset_import_status(job_id):
+    """Progress and row errors of an asset import"""
+    with import_jobs_lock:
+        job = dict(import_jobs.get(job_id) or {})
+    if not job:
+        return jsonify({'error': 'Unknown import job'}), 404
+    return jsonify(job)
+
 @app.route('/assets/edit/<asset_code>', methods=['GET', 'POST'])
 @login_required
 def edit_asset(asset_code):
@@ -602,10 +743,11 @@ def edit_asset(asset_code):
         else:
             flash('Failed to update asset', 'danger')
     
-    categories = db.get_all('Categories')
-    subcategories = db.get_all('Subcategories')
-    brands = db.get_all('Brands')
-    locations = db.get_all('Locations')
+    master = db.get_many(['Categories', 'Subcategories', 'Brands', 'Locations'])
+    categories = master['Categories']
+    subcategories = master['Subcategories']
+    brands = master['Brands']
+    locations = master['Locations']
     
     return render_template('edit_asset.html', asset=asset, categories=categories,
                          subcategories=subcategories, brands=brands, locations=locations)
@@ -654,21 +796,33 @@ def asset_movements():
     if not db:
         flash('Database not configured', 'danger')
         return redirect(url_for('login'))
-    movements = db.get_all('AssetMovements')
-    return render_template('asset_movements.html', movements=movements, role=session.get('role'))
+    page = listing_page('AssetMovements', MOVEMENT_SEARCH, MOVEMENT_SORT_FIELDS)
+    return render_template('asset_movements.html', page=page, movements=page.items,
+                         current_search=request.args.get('search', '').strip(), role=session.get('role'))
+
+@app.route('/api/asset_movements')
+@login_required
+def api_asset_movements():
+    if not db:
+        return jsonify({'error': 'Database not configured'}), 503
+    return page_json(listing_page('AssetMovements', MOVEMENT_SEARCH, MOVEMENT_SORT_FIELDS))
 
 @app.route('/asset_movements/add', methods=['GET', 'POST'])
 @login_required
 def add_asset_movement():
+    if not db:
+        flash('Database not configured', 'danger')
+        return redirect(url_for('asset_movements'))
+    
     if request.method == 'POST':
         asset_code = request.form.get('asset_code')
         from_location = request.form.get('from_location')
         to_location = request.form.get('to_location')
         notes = request.form.get('notes', '')
         
-        movement_id = db.get_next_id('AssetMovements')
+        # The ID is allocated by record_movement
         movement_data = {
-            'ID': movement_id,
+            'ID': '',
             'Asset Code': asset_code,
             'From Location': from_location,
             'To Location': to_location,
@@ -677,19 +831,55 @@ def add_asset_movement():
             'Notes': notes
         }
         
-        if db.insert('AssetMovements', movement_data):
-            # Update asset location
-            db.update('Assets', 'Asset Code', asset_code, {'Location': to_location})
-            log_activity('Move', 'Asset', asset_code, f"Asset moved from {from_location} to {to_location}", notes)
+        log_data = activity_entry('Move', 'Asset', asset_code,
+                                  f"Asset moved from {from_location} to {to_location}", notes)
+        # Movement row, asset location and log entry are written together
+        if db.record_movement(movement_data, log_data):
             flash('Asset movement recorded successfully', 'success')
             return redirect(url_for('asset_movements'))
         else:
             flash('Failed to record movement', 'danger')
     
-    assets = db.get_all('Assets')
-    locations = db.get_all('Locations')
+    master = db.get_many(['Assets', 'Locations'])
+    assets = master['Assets']
+    locations = master['Locations']
     return render_template('add_movement.html', assets=assets, locations=locations)
 
+@app.route('/asset_movements/bulk', methods=['GET', 'POST'])
+@login_required
+def bulk_asset_movement():
+    if not db:
+        flash('Database not configured', 'danger')
+        return redirect(url_for('asset_movements'))
+    
+    if request.method == 'POST':
+        asset_codes = parse_asset_codes(request.form.get('asset_codes', ''))
+        to_location = request.form.get('to_location')
+        notes = request.form.get('notes', '')
+
+        if not asset_codes or not to_location:
+            flash('Enter at least one asset code and a destination', 'danger')
+        else:
+            movements, unknown, unchanged = plan_moves(db, asset_codes, to_location,
+                                                       session.get('user_id'), notes)
+            if unknown:
+                flash(f"Unknown asset codes skipped: {', '.join(unknown)}", 'warning')
+            if unchanged:
+                flash(f"Already at {to_location}: {', '.join(unchanged)}", 'info')
+            if movements:
+                log_entries = [activity_entry('Move', 'Asset', m['Asset Code'],
+                                              f"Asset moved from {m['From Location']} to {to_location}", notes)
+                               for m in movements]
+                # All movement rows, locations and log rows are written together
+                if db.record_movements(movements, log_entries):
+                    flash(f'{len(movements)} assets moved to {to_location}', 'success')
+                    return redirect(url_for('asset_movements'))
+                flash('Failed to record movements', 'danger')
+
+    locations = db.get_all('Locations')
+    return render_template('bulk_movement.html', locations=locations,
+                           asset_codes=request.form.get('asset_codes', ''))
+
 # Barcode Printing Routes
 @app.route('/barcode/print', methods=['POST'])
 @login_required
@@ -760,52 +950,23 @@ def asset_report():
         flash('Database not configured', 'danger')
         return redirect(url_for('login'))
     
-    # Get filter parameters
-    category = request.args.get('category', '')
-    location = request.args.get('location', '')
-    department = request.args.get('department', '')
-    search = request.args.get('search', '').lower()
-    
-    # Get all assets
-    all_assets = db.get_all('Assets')
-    
-    # Apply filters
-    filtered_assets = []
-    for asset in all_assets:
-        # Category filter
-        if category and asset.get('Asset Category', '') != category:
-            continue
-        # Location filter
-        if location and asset.get('Location', '') != location:
-            continue
-        # Department filter
-        if department and asset.get('Department', '') != department:
-            continue
-        # Search filter
-        if search:
-            searchable_text = f"{asset.get('Asset Code', '')} {asset.get('Item Name', '')} {asset.get('Brand', '')}".lower()
-            if search not in searchable_text:
-                continue
-        filtered_assets.append(asset)
-    
-    # Get master data for filters
-    categories = db.get_all('Categories')
-    locations = db.get_all('Locations')
-    
-    # Get unique departments
-    departments = list(set([asset.get('Department', '') for asset in all_assets if asset.get('Department', '')]))
-    departments.sort()
+    result = run_report(db, 'assets', request.args, refresh=True)
+    page = report_page(result)
     
     return render_template('reports/asset_report.html', 
-                         assets=filtered_assets, 
-                         categories=categories,
-                         locations=locations,
-                         departments=departments,
+                         page=page,
+                         assets=page.items,
+                         total_value=sum(amount_value(a.get('Amount', '')) for a in result.rows),
+                         location_count=len({a.get('Location') for a in result.rows if a.get('Location')}),
+                         category_count=len({a.get('Asset Category') for a in result.rows if a.get('Asset Category')}),
+                         categories=result.data['Categories'],
+                         locations=result.data['Locations'],
+                         departments=result.distinct('Department'),
                          role=session.get('role'),
-                         current_category=category,
-                         current_location=location,
-                         current_department=department,
-                         current_search=search)
+                         current_category=result.params['category'],
+                         current_location=result.params['location'],
+                         current_department=result.params['department'],
+                         current_search=result.params['search'].lower())
 
 @app.route('/reports/movements')
 @login_required
@@ -814,63 +975,30 @@ def movement_report():
         flash('Database not configured', 'danger')
         return redirect(url_for('login'))
     
-    # Get filter parameters
-    asset_code = request.args.get('asset_code', '')
-    from_location = request.args.get('from_location', '')
-    to_location = request.args.get('to_location', '')
-    moved_by = request.args.get('moved_by', '')
-    date_from = request.args.get('date_from', '')
-    date_to = request.args.get('date_to', '')
-    
-    # Get all movements
-    all_movements = db.get_all('AssetMovements')
-    
-    # Apply filters
-    filtered_movements = []
-    for movement in all_movements:
-        # Asset code filter
-        if asset_code and movement.get('Asset Code', '') != asset_code:
-            continue
-        # From location filter
-        if from_location and movement.get('From Location', '') != from_location:
-            continue
-        # To location filter
-        if to_location and movement.get('To Location', '') != to_location:
-            continue
-        # Moved by filter
-        if moved_by and movement.get('Moved By', '') != moved_by:
-            continue
-        # Date filters
-        movement_date = movement.get('Movement Date', '')
-        if date_from and movement_date < date_from:
-            continue
-        if date_to and movement_date > date_to:
-            continue
-        filtered_movements.append(movement)
-    
-    # Sort by date (newest first)
-    filtered_movements.sort(key=lambda x: x.get('Movement Date', ''), reverse=True)
-    
-    # Get master data for filters
-    assets = db.get_all('Assets')
-    locations = db.get_all('Locations')
-    
-    # Get unique users
-    users = list(set([movement.get('Moved By', '') for movement in all_movements if movement.get('Moved By', '')]))
-    users.sort()
+    result = run_report(db, 'movements', request.args, refresh=True)
+    page = report_page(result)
     
     return render_template('reports/movement_report.html',
-                         movements=filtered_movements,
-                         assets=assets,
-                         locations=locations,
-                         users=users,
+                         page=page,
+                         movements=page.items,
+                         asset_count=len({m.get('Asset Code') for m in result.rows if m.get('Asset Code')}),
+                         user_count=len({m.get('Moved By') for m in result.rows if m.get('Moved By')}),
+                         assets=result.data['Assets'],
+                         locations=result.data['Locations'],
+                         users=result.distinct('Moved By'),
                          role=session.get('role'),
-                         current_asset_code=asset_code,
-                         current_from_location=from_location,
-                         current_to_location=to_location,
-                         current_moved_by=moved_by,
-                         current_date_from=date_from,
-                         current_date_to=date_to)
+                         current_asset_code=result.params['asset_code'],
+                         current_from_location=result.params['from_location'],
+                         current_to_location=result.params['to_location'],
+                         current_moved_by=result.params['moved_by'],
+                         current_date_from=result.params['date_from'],
+                         current_date_to=result.params['date_to'])
+
+@app.route('/admin/api_metrics')
+@admin_required
+def api_metrics():
+    """Google Sheets API call, throttle and retry counters"""
+    return jsonify(shared_limiter().metrics())
 
 @app.route('/logs')
 @login_required
@@ -879,294 +1007,96 @@ def logs():
         flash('Database not configured', 'danger')
         return redirect(url_for('login'))
     
-    # Get filter parameters
-    log_type = request.args.get('type', '')
-    user = request.args.get('user', '')
-    date_from = request.args.get('date_from', '')
-    date_to = request.args.get('date_to', '')
-    
-    # Get all logs (combining movements and other activities)
-    logs = []
-    
-    # Get activity logs from ActivityLogs sheet
-    try:
-        activity_logs = db.get_all('ActivityLogs')
-        for log_entry in activity_logs:
-            logs.append({
-                'type': log_entry.get('Type', 'Activity'),
-                'date': log_entry.get('Date & Time', ''),
-                'user': log_entry.get('User', ''),
-                'description': log_entry.get('Description', ''),
-                'details': log_entry.get('Details', ''),
-                'action': log_entry.get('Action', ''),
-                'entity_type': log_entry.get('Entity Type', ''),
-                'entity_id': log_entry.get('Entity ID', '')
-            })
-    except Exception as e:
-        print(f"Error loading activity logs: {e}")
-    
-    # Get movements as logs
-    movements = db.get_all('AssetMovements')
-    for movement in movements:
-        logs.append({
-            'type': 'Movement',
-            'date': movement.get('Movement Date', ''),
-            'user': movement.get('Moved By', ''),
-            'description': f"Asset {movement.get('Asset Code', '')} moved from {movement.get('From Location', '')} to {movement.get('To Location', '')}",
-            'details': movement.get('Notes', ''),
-            'action': 'Move',
-            'entity_type': 'Asset',
-            'entity_id': movement.get('Asset Code', '')
-        })
-    
-    # Sort by date (newest first)
-    logs.sort(key=lambda x: x.get('date', ''), reverse=True)
-    
-    # Apply filters
-    filtered_logs = []
-    for log in logs:
-        # Type filter
-        if log_type and log.get('type', '') != log_type:
-            continue
-        # User filter
-        if user and log.get('user', '') != user:
-            continue
-        # Date filters
-        log_date = log.get('date', '')
-        if date_from and log_date < date_from:
-            continue
-        if date_to and log_date > date_to:
-            continue
-        filtered_logs.append(log)
-    
-    # Get unique users and types
-    log_types = list(set([log.get('type', '') for log in logs]))
-    log_types.sort()
-    log_users = list(set([log.get('user', '') for log in logs if log.get('user', '')]))
-    log_users.sort()
+    # Activity log entries and movements, newest first
+    result = run_report(db, 'logs', request.args, refresh=True)
+    page = report_page(result)
     
     return render_template('logs.html',
-                         logs=filtered_logs,
-                         log_types=log_types,
-                         users=log_users,
+                         page=page,
+                         logs=page.items,
+                         user_count=len({log.get('user') for log in result.rows if log.get('user')}),
+                         movement_count=sum(1 for log in result.rows if log.get('type') == 'Movement'),
+                         log_types=result.distinct('type'),
+                         users=result.distinct('user'),
                          role=session.get('role'),
-                         current_type=log_type,
-                         current_user=user,
-                         current_date_from=date_from,
-                         current_date_to=date_to)
+                         current_type=result.params['type'],
+                         current_user=result.params['user'],
+                         current_date_from=result.params['date_from'],
+                         current_date_to=result.params['date_to'])
 
-# Excel Export Routes
-@app.route('/reports/assets/export')
+@app.route('/api/reports/<name>')
 @login_required
-def export_asset_report():
+def api_report(name):
+    """A page of a report's rows as JSON; later pages reuse the cached report result"""
+    if not db:
+        return jsonify({'error': 'Database not configured'}), 503
+    if name not in REPORTS:
+        return jsonify({'error': f"Unknown report '{name}'"}), 404
+    return page_json(report_page(run_report(db, name, request.args)))
+
+# Report Export Routes
+def send_report(name):
+    """Download a report in the format given by ?format= (xlsx, csv, pdf or parquet)"""
     if not db:
         flash('Database not configured', 'danger')
         return redirect(url_for('login'))
     
-    # Get filter parameters (same as report)
-    category = request.args.get('category', '')
-    location = request.args.get('location', '')
-    department = request.args.get('department', '')
-    search = request.args.get('search', '').lower()
-    
-    # Get all assets
-    all_assets = db.get_all('Assets')
-    
-    # Apply filters
-    filtered_assets = []
-    for asset in all_assets:
-        if category and asset.get('Asset Category', '') != category:
-            continue
-        if location and asset.get('Location', '') != location:
-            continue
-        if department and asset.get('Department', '') != department:
-            continue
-        if search:
-            searchable_text = f"{asset.get('Asset Code', '')} {asset.get('Item Name', '')} {asset.get('Brand', '')}".lower()
-            if search not in searchable_text:
-                continue
-        filtered_assets.append(asset)
-    
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Asset Report"
-    
-    # Header style
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Write headers
-    headers = ['Asset Code', 'Item Name', 'Category', 'Subcategory', 'Brand', 
-               'Description', 'Amount', 'Location', 'Date of Purchase', 
-               'Warranty', 'Department', 'Ownership']
-    ws.append(headers)
-    
-    # Style header row
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = border
-    
-    # Write data
-    for asset in filtered_assets:
-        row = [
-            asset.get('Asset Code', ''),
-            asset.get('Item Name', ''),
-            asset.get('Asset Category', ''),
-            asset.get('Asset SubCategory', ''),
-            asset.get('Brand', ''),
-            asset.get('Asset Description', ''),
-            asset.get('Amount', ''),
-            asset.get('Location', ''),
-            asset.get('Date of Purchase', ''),
-            asset.get('Warranty', ''),
-            asset.get('Department', ''),
-            asset.get('Ownership', '')
-        ]
-        ws.append(row)
-    
-    # Apply borders and alignment to data rows
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-        for cell in row:
-            cell.border = border
-            cell.alignment = Alignment(vertical='top')
-    
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-    
-    # Save to BytesIO
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    filename = f'asset_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-    return send_file(output, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                    as_attachment=True, download_name=filename)
+    fmt = request.args.get('format', 'xlsx')
+    if fmt not in REPORT_FORMATS:
+        flash(f'Unsupported export format: {fmt}', 'danger')
+        return redirect(request.referrer or url_for('dashboard'))
+    
+    # Reuses the result the report page just rendered when the filters match
+    result = run_report(db, name, request.args)
+    if fmt == 'csv':
+        # Streamed row by row rather than built in full before sending
+        return Response(iter_csv(result), mimetype='text/csv', headers={
+            'Content-Disposition': f'attachment; filename={export_filename(result, fmt)}'})
+    output, mimetype, filename = export_file(result, fmt)
+    return send_file(output, mimetype=mimetype, as_attachment=True, download_name=filename)
+
+@app.route('/exports/<report_name>', methods=['POST'])
+@login_required
+def submit_export_job(report_name):
+    """Queue a report export; filters and ?format= come from the query string"""
+    if not export_jobs:
+        return jsonify({'error': 'Database not configured'}), 503
+    try:
+        job_id = export_jobs.submit(report_name, request.args, request.args.get('format', 'xlsx'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    return jsonify({'job_id': job_id, 'status_url': url_for('export_job_status', job_id=job_id)}), 202
+
+@app.route('/exports/<job_id>/status')
+@login_required
+def export_job_status(job_id):
+    job = export_jobs.get(job_id) if export_jobs else None
+    if not job:
+        return jsonify({'error': 'Export not found or expired'}), 404
+    status = {k: job[k] for k in ('id', 'report', 'format', 'status', 'stage', 'rows', 'filename', 'error')}
+    if job['status'] == 'done':
+        status['download_url'] = url_for('download_export_job', job_id=job_id)
+    return jsonify(status)
+
+@app.route('/exports/<job_id>/download')
+@login_required
+def download_export_job(job_id):
+    job = export_jobs.get(job_id) if export_jobs else None
+    if not job or job['status'] != 'done':
+        flash('Export not found or expired', 'danger')
+        return redirect(request.referrer or url_for('dashboard'))
+    return send_file(os.path.abspath(job['path']), mimetype=REPORT_FORMATS[job['format']][1],
+                     as_attachment=True, download_name=job['filename'])
+
+@app.route('/reports/assets/export')
+@login_required
+def export_asset_report():
+    return send_report('assets')
 
 @app.route('/reports/movements/export')
 @login_required
 def export_movement_report():
-    if not db:
-        flash('Database not configured', 'danger')
-        return redirect(url_for('login'))
-    
-    # Get filter parameters
-    asset_code = request.args.get('asset_code', '')
-    from_location = request.args.get('from_location', '')
-    to_location = request.args.get('to_location', '')
-    moved_by = request.args.get('moved_by', '')
-    date_from = request.args.get('date_from', '')
-    date_to = request.args.get('date_to', '')
-    
-    # Get all movements
-    all_movements = db.get_all('AssetMovements')
-    
-    # Apply filters
-    filtered_movements = []
-    for movement in all_movements:
-        if asset_code and movement.get('Asset Code', '') != asset_code:
-            continue
-        if from_location and movement.get('From Location', '') != from_location:
-            continue
-        if to_location and movement.get('To Location', '') != to_location:
-            continue
-        if moved_by and movement.get('Moved By', '') != moved_by:
-            continue
-        movement_date = movement.get('Movement Date', '')
-        if date_from and movement_date < date_from:
-            continue
-        if date_to and movement_date > date_to:
-            continue
-        filtered_movements.append(movement)
-    
-    # Sort by date
-    filtered_movements.sort(key=lambda x: x.get('Movement Date', ''), reverse=True)
-    
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Movement Report"
-    
-    # Header style
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Write headers
-    headers = ['ID', 'Date & Time', 'Asset Code', 'From Location', 'To Location', 
-               'Moved By', 'Notes']
-    ws.append(headers)
-    
-    # Style header row
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = border
-    
-    # Write data
-    for movement in filtered_movements:
-        row = [
-            movement.get('ID', ''),
-            movement.get('Movement Date', ''),
-            movement.get('Asset Code', ''),
-            movement.get('From Location', ''),
-            movement.get('To Location', ''),
-            movement.get('Moved By', ''),
-            movement.get('Notes', '')
-        ]
-        ws.append(row)
-    
-    # Apply borders and alignment
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-        for cell in row:
-            cell.border = border
-            cell.alignment = Alignment(vertical='top')
-    
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-    
-    # Save to BytesIO
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    filename = f'movement_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-    return send_file(output, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                    as_attachment=True, download_name=filename)
+    return send_report('movements')
 
 @app.route('/depreciation')
 @login_required
@@ -1175,417 +1105,33 @@ def depreciation():
         flash('Database not configured', 'danger')
         return redirect(url_for('login'))
     
-    from datetime import datetime
-    
-    # Get filter parameters
-    category = request.args.get('category', '')
-    location = request.args.get('location', '')
-    status = request.args.get('status', '')
-    
-    # Get all assets and asset types
-    all_assets = db.get_all('Assets')
-    asset_types = db.get_all('AssetTypes')
-    categories = db.get_all('Categories')
-    locations = db.get_all('Locations')
-    
-    # Create a lookup dictionary for asset types by Asset Type name
-    asset_type_lookup = {}
-    for at in asset_types:
-        asset_type_name = at.get('Asset Type', '')
-        dep_value = at.get('Depreciation Value (%)', '')
-        try:
-            asset_type_lookup[asset_type_name] = float(dep_value) if dep_value else 0
-        except (ValueError, TypeError):
-            asset_type_lookup[asset_type_name] = 0
-    
-    # Calculate depreciation for each asset
-    today = datetime.now().date()
-    processed_assets = []
-    
-    total_purchase_value = 0
-    total_depreciation = 0
-    total_current_value = 0
-    
-    for asset in all_assets:
-        # Apply filters
-        if category and asset.get('Asset Category', '') != category:
-            continue
-        if location and asset.get('Location', '') != location:
-            continue
-        if status and asset.get('Asset Status', '') != status:
-            continue
-        
-        # Get purchase amount
-        purchase_amount_str = asset.get('Amount', '').strip()
-        purchase_amount = 0
-        try:
-            purchase_amount = float(purchase_amount_str) if purchase_amount_str else 0
-        except (ValueError, TypeError):
-            purchase_amount = 0
-        
-        # Get purchase date
-        purchase_date_str = asset.get('Date of Purchase', '').strip()
-        purchase_date = None
-        age_years = 0
-        
-        if purchase_date_str:
-            try:
-                # Try different date formats
-                for fmt in ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d', '%d-%m-%Y', '%m-%d-%Y']:
-                    try:
-                        purchase_date = datetime.strptime(purchase_date_str, fmt).date()
-                        break
-                    except ValueError:
-                        continue
-                
-                if purchase_date:
-                    # Calculate age in years
-                    delta = today - purchase_date
-                    age_years = delta.days / 365.25
-                    if age_years < 0:
-                        age_years = 0
-            except:
-                pass
-        
-        # Get depreciation percentage
-        # Try to match by Asset Type field in Assets (if it exists)
-        # Otherwise, try to match by category or use a default
-        asset_type_name = asset.get('Asset Type', '') or asset.get('Asset Category', '')
-        depreciation_percent = asset_type_lookup.get(asset_type_name, 0)
-        
-        # Calculate depreciation
-        annual_depreciation = 0
-        total_dep = 0
-        current_value = purchase_amount
-        
-        if purchase_amount > 0 and depreciation_percent > 0 and age_years > 0:
-            annual_depreciation = purchase_amount * (depreciation_percent / 100)
-            total_dep = annual_depreciation * age_years
-            current_value = max(0, purchase_amount - total_dep)  # Can't go below 0
-        
-        # Add calculated fields to asset
-        asset['purchase_amount'] = purchase_amount
-        asset['depreciation_percent'] = depreciation_percent
-        asset['age_years'] = age_years
-        asset['annual_depreciation'] = annual_depreciation
-        asset['total_depreciation'] = total_dep
-        asset['current_value'] = current_value
-        
-        processed_assets.append(asset)
-        
-        # Update totals
-        total_purchase_value += purchase_amount
-        total_depreciation += total_dep
-        total_current_value += current_value
-    
-    # Calculate filtered totals
-    filtered_purchase_value = sum(a.get('purchase_amount', 0) for a in processed_assets)
-    filtered_total_depreciation = sum(a.get('total_depreciation', 0) for a in processed_assets)
-    filtered_current_value = sum(a.get('current_value', 0) for a in processed_assets)
-    filtered_annual_depreciation = sum(a.get('annual_depreciation', 0) for a in processed_assets)
+    result = run_report(db, 'depreciation', request.args, refresh=True)
+    page = report_page(result)
     
     return render_template('depreciation.html',
-                         filtered_assets=processed_assets,
-                         total_assets=len(all_assets),
-                         total_purchase_value=total_purchase_value,
-                         total_depreciation=total_depreciation,
-                         total_current_value=total_current_value,
-                         filtered_purchase_value=filtered_purchase_value,
-                         filtered_total_depreciation=filtered_total_depreciation,
-                         filtered_current_value=filtered_current_value,
-                         filtered_annual_depreciation=filtered_annual_depreciation,
-                         categories=categories,
-                         locations=locations,
+                         page=page,
+                         filtered_assets=page.items,
+                         total_assets=len(result.source_rows),
+                         total_purchase_value=result.total('purchase_amount'),
+                         total_depreciation=result.total('total_depreciation'),
+                         total_current_value=result.total('current_value'),
+                         filtered_purchase_value=result.total('purchase_amount'),
+                         filtered_total_depreciation=result.total('total_depreciation'),
+                         filtered_current_value=result.total('current_value'),
+                         filtered_annual_depreciation=result.total('annual_depreciation'),
+                         categories=result.data['Categories'],
+                         locations=result.data['Locations'],
                          role=session.get('role'))
 
 @app.route('/depreciation/export')
 @login_required
 def export_depreciation():
-    if not db:
-        flash('Database not configured', 'danger')
-        return redirect(url_for('login'))
-    
-    from datetime import datetime
-    
-    # Get filter parameters
-    category = request.args.get('category', '')
-    location = request.args.get('location', '')
-    status = request.args.get('status', '')
-    
-    # Get all assets and asset types
-    all_assets = db.get_all('Assets')
-    asset_types = db.get_all('AssetTypes')
-    
-    # Create lookup dictionary
-    asset_type_lookup = {}
-    for at in asset_types:
-        asset_type_name = at.get('Asset Type', '')
-        dep_value = at.get('Depreciation Value (%)', '')
-        try:
-            asset_type_lookup[asset_type_name] = float(dep_value) if dep_value else 0
-        except (ValueError, TypeError):
-            asset_type_lookup[asset_type_name] = 0
-    
-    # Calculate depreciation for each asset
-    today = datetime.now().date()
-    processed_assets = []
-    
-    for asset in all_assets:
-        # Apply filters
-        if category and asset.get('Asset Category', '') != category:
-            continue
-        if location and asset.get('Location', '') != location:
-            continue
-        if status and asset.get('Asset Status', '') != status:
-            continue
-        
-        # Calculate values (same logic as main route)
-        purchase_amount_str = asset.get('Amount', '').strip()
-        purchase_amount = 0
-        try:
-            purchase_amount = float(purchase_amount_str) if purchase_amount_str else 0
-        except (ValueError, TypeError):
-            purchase_amount = 0
-        
-        purchase_date_str = asset.get('Date of Purchase', '').strip()
-        purchase_date = None
-        age_years = 0
-        
-        if purchase_date_str:
-            try:
-                for fmt in ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d', '%d-%m-%Y', '%m-%d-%Y']:
-                    try:
-                        purchase_date = datetime.strptime(purchase_date_str, fmt).date()
-                        break
-                    except ValueError:
-                        continue
-                
-                if purchase_date:
-                    delta = today - purchase_date
-                    age_years = delta.days / 365.25
-                    if age_years < 0:
-                        age_years = 0
-            except:
-                pass
-        
-        asset_type_name = asset.get('Asset Type', '') or asset.get('Asset Category', '')
-        depreciation_percent = asset_type_lookup.get(asset_type_name, 0)
-        
-        annual_depreciation = 0
-        total_dep = 0
-        current_value = purchase_amount
-        
-        if purchase_amount > 0 and depreciation_percent > 0 and age_years > 0:
-            annual_depreciation = purchase_amount * (depreciation_percent / 100)
-            total_dep = annual_depreciation * age_years
-            current_value = max(0, purchase_amount - total_dep)
-        
-        asset['purchase_amount'] = purchase_amount
-        asset['depreciation_percent'] = depreciation_percent
-        asset['age_years'] = age_years
-        asset['annual_depreciation'] = annual_depreciation
-        asset['total_depreciation'] = total_dep
-        asset['current_value'] = current_value
-        
-        processed_assets.append(asset)
-    
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Depreciation Report"
-    
-    # Header style
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Write headers
-    headers = ['Asset Code', 'Item Name', 'Category', 'Location', 'Purchase Date', 
-               'Age (Years)', 'Purchase Amount', 'Depreciation %', 'Annual Depreciation', 
-               'Total Depreciation', 'Current Book Value', 'Status']
-    ws.append(headers)
-    
-    # Style header row
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = border
-    
-    # Write data
-    for asset in processed_assets:
-        row = [
-            asset.get('Asset Code', ''),
-            asset.get('Item Name', ''),
-            asset.get('Asset Category', ''),
-            asset.get('Location', ''),
-            asset.get('Date of Purchase', ''),
-            round(asset.get('age_years', 0), 2) if asset.get('age_years') else '',
-            round(asset.get('purchase_amount', 0), 2) if asset.get('purchase_amount') else '',
-            f"{asset.get('depreciation_percent', 0)}%" if asset.get('depreciation_percent') else '',
-            round(asset.get('annual_depreciation', 0), 2) if asset.get('annual_depreciation') else '',
-            round(asset.get('total_depreciation', 0), 2) if asset.get('total_depreciation') else '',
-            round(asset.get('current_value', 0), 2) if asset.get('current_value') is not None else '',
-            asset.get('Asset Status', '')
-        ]
-        ws.append(row)
-    
-    # Add totals row
-    if processed_assets:
-        total_row = ['', '', '', '', '', 'TOTALS:',
-                    sum(a.get('purchase_amount', 0) for a in processed_assets),
-                    '',
-                    sum(a.get('annual_depreciation', 0) for a in processed_assets),
-                    sum(a.get('total_depreciation', 0) for a in processed_assets),
-                    sum(a.get('current_value', 0) for a in processed_assets),
-                    '']
-        ws.append(total_row)
-        
-        # Style totals row
-        for cell in ws[ws.max_row]:
-            if cell.value:
-                cell.font = Font(bold=True)
-                cell.border = border
-    
-    # Apply borders and alignment
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-        for cell in row:
-            cell.border = border
-            cell.alignment = Alignment(vertical='top', horizontal='left')
-    
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-    
-    # Save to BytesIO
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    filename = f'depreciation_report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-    return send_file(output, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                    as_attachment=True, download_name=filename)
+    return send_report('depreciation')
 
 @app.route('/logs/export')
 @login_required
 def export_logs():
-    if not db:
-        flash('Database not configured', 'danger')
-        return redirect(url_for('login'))
-    
-    # Get filter parameters
-    log_type = request.args.get('type', '')
-    user = request.args.get('user', '')
-    date_from = request.args.get('date_from', '')
-    date_to = request.args.get('date_to', '')
-    
-    # Get all logs
-    logs = []
-    movements = db.get_all('AssetMovements')
-    for movement in movements:
-        logs.append({
-            'type': 'Movement',
-            'date': movement.get('Movement Date', ''),
-            'user': movement.get('Moved By', ''),
-            'description': f"Asset {movement.get('Asset Code', '')} moved from {movement.get('From Location', '')} to {movement.get('To Location', '')}",
-            'details': movement.get('Notes', '')
-        })
-    
-    # Sort by date
-    logs.sort(key=lambda x: x.get('date', ''), reverse=True)
-    
-    # Apply filters
-    filtered_logs = []
-    for log in logs:
-        if log_type and log.get('type', '') != log_type:
-            continue
-        if user and log.get('user', '') != user:
-            continue
-        log_date = log.get('date', '')
-        if date_from and log_date < date_from:
-            continue
-        if date_to and log_date > date_to:
-            continue
-        filtered_logs.append(log)
-    
-    # Create Excel workbook
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Activity Logs"
-    
-    # Header style
-    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=12)
-    border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-    
-    # Write headers
-    headers = ['Date & Time', 'Type', 'User', 'Description', 'Details']
-    ws.append(headers)
-    
-    # Style header row
-    for cell in ws[1]:
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-        cell.border = border
-    
-    # Write data
-    for log in filtered_logs:
-        row = [
-            log.get('date', ''),
-            log.get('type', ''),
-            log.get('user', ''),
-            log.get('description', ''),
-            log.get('details', '')
-        ]
-        ws.append(row)
-    
-    # Apply borders and alignment
-    for row in ws.iter_rows(min_row=2, max_row=ws.max_row):
-        for cell in row:
-            cell.border = border
-            cell.alignment = Alignment(vertical='top')
-    
-    # Auto-adjust column widths
-    for column in ws.columns:
-        max_length = 0
-        column_letter = column[0].column_letter
-        for cell in column:
-            try:
-                if len(str(cell.value)) > max_length:
-                    max_length = len(str(cell.value))
-            except:
-                pass
-        adjusted_width = min(max_length + 2, 50)
-        ws.column_dimensions[column_letter].width = adjusted_width
-    
-    # Save to BytesIO
-    output = io.BytesIO()
-    wb.save(output)
-    output.seek(0)
-    
-    filename = f'activity_logs_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
-    return send_file(output, mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-                    as_attachment=True, download_name=filename)
+    return send_report('logs')
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
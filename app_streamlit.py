@@ -4,18 +4,18 @@ Converted from Flask application
 """
 
 import streamlit as st
-import gspread
 from google.oauth2.service_account import Credentials
 import json
 import os
 from datetime import datetime
-from typing import List, Dict, Optional
 import hashlib
 import pandas as pd
 from io import BytesIO
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 import io
+from config import Config
+from google_sheets_db import GoogleSheetsDB, SCOPES
 
 # Page configuration
 st.set_page_config(
@@ -665,227 +665,98 @@ if 'db' not in st.session_state:
 if 'show_add_asset' not in st.session_state:
     st.session_state.show_add_asset = False
 
+# Default spreadsheet when secrets don't name one
+DEFAULT_SHEET_ID = "1q9jfezVWpFYAmvjo81Lk788kf9DNwqvSx7yxHWRGkec"
+
 # Database connection class for Streamlit
-class GoogleSheetsDB:
+class StreamlitSheetsDB(GoogleSheetsDB):
+    """Shared GoogleSheetsDB reading credentials from Streamlit secrets"""
+    
     def __init__(self):
-        self.client = None
-        self.sheet = None
         self.connected = False
         self.error = None
-        self._connect()
+        super().__init__()
     
     def _connect(self):
         """Connect to Google Sheets using Streamlit secrets"""
         try:
-            # Get credentials from Streamlit secrets
-            # Use try-except to handle missing secrets gracefully
-            try:
-                secrets = st.secrets
-            except Exception:
-                secrets = {}
-            
-            if 'GOOGLE_SHEETS' in secrets:
-                try:
-                    creds_dict = {
-                        "type": secrets["GOOGLE_SHEETS"]["type"],
-                        "project_id": secrets["GOOGLE_SHEETS"]["project_id"],
-                        "private_key_id": secrets["GOOGLE_SHEETS"]["private_key_id"],
-                        "private_key": secrets["GOOGLE_SHEETS"]["private_key"],
-                        "client_email": secrets["GOOGLE_SHEETS"]["client_email"],
-                        "client_id": secrets["GOOGLE_SHEETS"]["client_id"],
-                        "auth_uri": secrets["GOOGLE_SHEETS"]["auth_uri"],
-                        "token_uri": secrets["GOOGLE_SHEETS"]["token_uri"],
-                        "auth_provider_x509_cert_url": secrets["GOOGLE_SHEETS"]["auth_provider_x509_cert_url"],
-                        "client_x509_cert_url": secrets["GOOGLE_SHEETS"]["client_x509_cert_url"]
-                    }
-                    
-                    credentials = Credentials.from_service_account_info(
-                        creds_dict,
-                        scopes=['https://www.googleapis.com/auth/spreadsheets',
-                               'https://www.googleapis.com/auth/drive']
-                    )
-                except Exception as e:
-                    st.warning(f"Error loading from secrets: {e}. Trying credentials.json file...")
-                    # Fallback to file
-                    if os.path.exists('credentials.json'):
-                        credentials = Credentials.from_service_account_file(
-                            'credentials.json',
-                            scopes=['https://www.googleapis.com/auth/spreadsheets',
-                                   'https://www.googleapis.com/auth/drive']
-                        )
-                    else:
-                        raise Exception("No credentials found in secrets or credentials.json file")
-            else:
-                # Fallback to credentials.json file
-                if os.path.exists('credentials.json'):
-                    credentials = Credentials.from_service_account_file(
-                        'credentials.json',
-                        scopes=['https://www.googleapis.com/auth/spreadsheets',
-                               'https://www.googleapis.com/auth/drive']
-                    )
-                else:
-                    raise Exception("No credentials found. Please add secrets.toml or credentials.json file")
-            
-            self.client = gspread.authorize(credentials)
-            # Get sheet ID from secrets or use default
-            try:
-                sheet_id = secrets.get("GOOGLE_SHEET_ID", "1q9jfezVWpFYAmvjo81Lk788kf9DNwqvSx7yxHWRGkec")
-            except:
-                sheet_id = "1q9jfezVWpFYAmvjo81Lk788kf9DNwqvSx7yxHWRGkec"
-            self.sheet = self.client.open_by_key(sheet_id)
-            self._initialize_sheets()
+            self.credentials, self.sheet_id = self._load_credentials()
+            super()._connect()
             self.connected = True
-            
         except Exception as e:
-            error_msg = str(e)
-            self.error = error_msg
+            self.error = str(e)
             self.connected = False
             # Don't call st.stop() here - let the app continue to show error message
     
-    def _initialize_sheets(self):
-        """Initialize all required sheets if they don't exist"""
-        sheet_names = ['Users', 'Locations', 'Categories', 'Subcategories', 
-                      'AssetTypes', 'Brands', 'Assets', 'AssetMovements', 'ActivityLogs']
+    def _load_credentials(self):
+        """Return service account credentials and sheet ID from secrets or credentials.json"""
+        # Use try-except to handle missing secrets gracefully
+        try:
+            secrets = st.secrets
+        except Exception:
+            secrets = {}
         
-        for sheet_name in sheet_names:
+        credentials = None
+        if 'GOOGLE_SHEETS' in secrets:
             try:
-                worksheet = self.sheet.worksheet(sheet_name)
-                self._ensure_headers(sheet_name)
-            except:
-                worksheet = self.sheet.add_worksheet(title=sheet_name, rows=1000, cols=20)
-                self._set_headers(sheet_name)
-    
-    def _set_headers(self, sheet_name: str):
-        """Set headers for each sheet"""
-        worksheet = self.sheet.worksheet(sheet_name)
+                creds_dict = {
+                    "type": secrets["GOOGLE_SHEETS"]["type"],
+                    "project_id": secrets["GOOGLE_SHEETS"]["project_id"],
+                    "private_key_id": secrets["GOOGLE_SHEETS"]["private_key_id"],
+                    "private_key": secrets["GOOGLE_SHEETS"]["private_key"],
+                    "client_email": secrets["GOOGLE_SHEETS"]["client_email"],
+                    "client_id": secrets["GOOGLE_SHEETS"]["client_id"],
+                    "auth_uri": secrets["GOOGLE_SHEETS"]["auth_uri"],
+                    "token_uri": secrets["GOOGLE_SHEETS"]["token_uri"],
+                    "auth_provider_x509_cert_url": secrets["GOOGLE_SHEETS"]["auth_provider_x509_cert_url"],
+                    "client_x509_cert_url": secrets["GOOGLE_SHEETS"]["client_x509_cert_url"]
+                }
+                credentials = Credentials.from_service_account_info(creds_dict, scopes=SCOPES)
+            except Exception as e:
+                st.warning(f"Error loading from secrets: {e}. Trying credentials.json file...")
         
-        headers = {
-            'Users': ['Username', 'Email', 'Password', 'Role'],
-            'Locations': ['ID', 'Location Name'],
-            'Categories': ['ID', 'Category Name'],
-            'Subcategories': ['ID', 'Subcategory Name', 'Category ID'],
-            'AssetTypes': ['Asset Code', 'Asset Type', 'Depreciation Value (%)'],
-            'Brands': ['ID', 'Brand Name'],
-            'Assets': ['Asset Code', 'Item Name', 'Asset Category', 'Asset SubCategory', 
-                      'Brand', 'Asset Description', 'Amount', 'Location', 
-                      'Date of Purchase', 'Warranty', 'Department', 'Ownership',
-                      'Asset Status', 'Image Attachment', 'Document Attachment'],
-            'AssetMovements': ['ID', 'Asset Code', 'From Location', 'To Location', 
-                              'Movement Date', 'Moved By', 'Notes'],
-            'ActivityLogs': ['ID', 'Date & Time', 'Type', 'User', 'Action', 'Entity Type', 
-                           'Entity ID', 'Description', 'Details']
-        }
+        if credentials is None:
+            # Fallback to credentials.json file
+            if os.path.exists('credentials.json'):
+                credentials = Credentials.from_service_account_file('credentials.json', scopes=SCOPES)
+            elif 'GOOGLE_SHEETS' in secrets:
+                raise Exception("No credentials found in secrets or credentials.json file")
+            else:
+                raise Exception("No credentials found. Please add secrets.toml or credentials.json file")
         
-        if sheet_name in headers:
-            worksheet.append_row(headers[sheet_name])
-    
-    def _ensure_headers(self, sheet_name: str):
-        """Ensure headers exist and are up-to-date"""
-        # Simplified version - same logic as Flask version
-        pass
-    
-    def get_all(self, sheet_name: str) -> List[Dict]:
-        """Get all records from a sheet"""
-        try:
-            worksheet = self.sheet.worksheet(sheet_name)
-            all_values = worksheet.get_all_values()
-            
-            if not all_values or len(all_values) < 2:
-                return []
-            
-            headers = [str(h).strip() for h in all_values[0]]
-            records = []
-            
-            for row in all_values[1:]:
-                if not any(row):
-                    continue
-                
-                record = {}
-                for i, header in enumerate(headers):
-                    value = row[i] if i < len(row) else ''
-                    record[header] = value.strip() if value else ''
-                
-                if any(record.values()):
-                    records.append(record)
-            
-            return records
-        except Exception as e:
-            st.error(f"Error getting records from {sheet_name}: {e}")
-            return []
-    
-    def get_by_id(self, sheet_name: str, id_field: str, id_value: str) -> Optional[Dict]:
-        """Get a record by ID"""
-        records = self.get_all(sheet_name)
-        for record in records:
-            if str(record.get(id_field)) == str(id_value):
-                return record
-        return None
-    
-    def get_next_id(self, sheet_name: str) -> int:
-        """Get next available ID"""
-        records = self.get_all(sheet_name)
-        if not records:
-            return 1
-        ids = []
-        for record in records:
-            try:
-                ids.append(int(record.get('ID', 0)))
-            except:
-                pass
-        return max(ids, default=0) + 1
-    
-    def insert(self, sheet_name: str, data: Dict) -> bool:
-        """Insert a new record"""
+        # Get sheet ID from secrets or use default
         try:
-            worksheet = self.sheet.worksheet(sheet_name)
-            headers = worksheet.row_values(1)
-            row = [data.get(header, '') for header in headers]
-            worksheet.append_row(row)
-            return True
-        except Exception as e:
-            st.error(f"Error inserting record: {e}")
-            return False
-    
-    def update(self, sheet_name: str, id_field: str, id_value: str, data: Dict) -> bool:
-        """Update a record"""
-        try:
-            worksheet = self.sheet.worksheet(sheet_name)
-            records = self.get_all(sheet_name)
-            headers = worksheet.row_values(1)
-            
-            for i, record in enumerate(records, start=2):
-                if str(record.get(id_field)) == str(id_value):
-                    row = [data.get(header, record.get(header, '')) for header in headers]
-                    worksheet.update(f"A{i}:{chr(64+len(headers))}{i}", [row])
-                    return True
-            return False
-        except Exception as e:
-            st.error(f"Error updating record: {e}")
-            return False
-    
-    def delete(self, sheet_name: str, id_field: str, id_value: str) -> bool:
-        """Delete a record"""
-        try:
-            worksheet = self.sheet.worksheet(sheet_name)
-            records = self.get_all(sheet_name)
-            
-            for i, record in enumerate(records, start=2):
-                if str(record.get(id_field)) == str(id_value):
-                    worksheet.delete_rows(i)
-                    return True
-            return False
-        except Exception as e:
-            st.error(f"Error deleting record: {e}")
-            return False
+            sheet_id = secrets.get("GOOGLE_SHEET_ID", DEFAULT_SHEET_ID)
+        except Exception:
+            sheet_id = DEFAULT_SHEET_ID
+        return credentials, sheet_id
+    
+    def _report_error(self, message: str):
+        """Show failed reads and writes in the page"""
+        st.error(message)
 
 # Initialize database connection
 @st.cache_resource
 def get_db():
     """Get database connection (cached)"""
     try:
-        db = GoogleSheetsDB()
+        try:
+            backend = st.secrets.get("STORAGE_BACKEND", Config.STORAGE_BACKEND)
+        except Exception:
+            backend = Config.STORAGE_BACKEND
+        if str(backend).lower() == 'sqlite':
+            from sqlite_db import SQLiteDB
+            return SQLiteDB(Config.SQLITE_DB_PATH)
+        db = StreamlitSheetsDB()
         if not db.connected:
             return None
+        try:
+            mirror_path = st.secrets.get("SHEETS_MIRROR_PATH", Config.SHEETS_MIRROR_PATH)
+        except Exception:
+            mirror_path = Config.SHEETS_MIRROR_PATH
+        if mirror_path:
+            from sheets_mirror import MirroredSheetsDB
+            return MirroredSheetsDB(db, mirror_path, Config.SHEETS_MIRROR_REFRESH)
         return db
     except Exception as e:
         return None
@@ -1273,7 +1144,7 @@ def main():
         
         # Try to get error details
         try:
-            db_temp = GoogleSheetsDB()
+            db_temp = StreamlitSheetsDB()
             if db_temp.error:
                 error_msg = db_temp.error
                 
@@ -0,0 +1,207 @@
+"""Bulk import of assets from CSV or XLSX files"""
+import csv
+import io
+import os
+from datetime import datetime, date
+from openpyxl import load_workbook
+from storage_backend import StorageBackend, SHEET_HEADERS
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+# Valid rows buffered before each insert_many call
+IMPORT_CHUNK_SIZE = 500
+# Per-row errors kept for the report; further errors are only counted
+MAX_REPORTED_ERRORS = 500
+
+ASSET_STATUSES = ['Active', 'Inactive', 'Under Maintenance', 'Disposed', 'Sold']
+IMPORT_EXTENSIONS = {'csv', 'xlsx'}
+
+
+def _cell_text(value) -> str:
+    """Text stored in the sheet for a CSV or XLSX cell value"""
+    if value is None:
+        return ''
+    if isinstance(value, (datetime, date)):
+        return value.strftime('%Y-%m-%d')
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
+
+
+def _normalize_headers(headers) -> List[Optional[str]]:
+    """Map file headers to Assets columns, matching case-insensitively"""
+    columns = {h.lower(): h for h in SHEET_HEADERS['Assets']}
+    return [columns.get(_cell_text(h).lower()) for h in headers]
+
+
+def iter_rows(stream, filename: str) -> Iterator[Tuple[int, Dict]]:
+    """Yield (file row number, record) for each data row, reading the file lazily"""
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    if extension == 'csv':
+        rows = csv.reader(io.TextIOWrapper(stream, encoding='utf-8-sig', newline=''))
+    elif extension == 'xlsx':
+        # Read-only mode streams rows instead of loading the whole workbook
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+        rows = workbook.active.iter_rows(values_only=True)
+    else:
+        raise ValueError(f"Unsupported file type '{extension}'. Use CSV or XLSX.")
+
+    try:
+        headers = None
+        for row_number, row in enumerate(rows, start=1):
+            if headers is None:
+                headers = _normalize_headers(row)
+                if 'Item Name' not in headers:
+                    raise ValueError("The first row must hold column headers, including 'Item Name'")
+                continue
+            record = {h: _cell_text(v) for h, v in zip(headers, row) if h}
+            if any(record.values()):
+                yield row_number, record
+    finally:
+        if extension == 'xlsx':
+            workbook.close()
+
+
+class AssetImporter:
+    """Validates asset rows against the master data and writes them in batches.
+
+    Categories, subcategories, brands and locations are read once per
+    import and matched case-insensitively; values are stored with the
+    master data's spelling. Rows without an Asset Code get one generated,
+    and codes already in use are rejected.
+    """
+
+    def __init__(self, db: StorageBackend, progress: Optional[Callable[[Dict], None]] = None,
+                 chunk_size: int = IMPORT_CHUNK_SIZE):
+        self.db = db
+        self.progress = progress
+        self.chunk_size = chunk_size
+        self.result = {'rows': 0, 'imported': 0, 'failed': 0, 'errors': []}
+        self._load_master_data()
+        self._code_prefix = f"AST-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+        self._code_counter = 0
+
+    def _load_master_data(self):
+        master = self.db.get_many(['Categories', 'Subcategories', 'Brands', 'Locations'])
+        self.categories = {r.get('Category Name', '').lower(): r for r in master['Categories']
+                           if r.get('Category Name')}
+        category_ids = {str(r.get('ID', '')): r.get('Category Name', '') for r in master['Categories']}
+        # Subcategory names per lower-case category name
+        self.subcategories: Dict[str, Dict[str, str]] = {}
+        for r in master['Subcategories']:
+            category = category_ids.get(str(r.get('Category ID', '')), '').lower()
+            name = r.get('Subcategory Name', '')
+            if name:
+                self.subcategories.setdefault(category, {})[name.lower()] = name
+        self.brands = {r.get('Brand Name', '').lower(): r.get('Brand Name', '')
+                       for r in master['Brands'] if r.get('Brand Name')}
+        self.locations = {r.get('Location Name', '').lower(): r.get('Location Name', '')
+                          for r in master['Locations'] if r.get('Location Name')}
+        self.statuses = {s.lower(): s for s in ASSET_STATUSES}
+        self.codes = {r.get('Asset Code', '') for r in self.db.get_all('Assets', columns=[])}
+
+    def _next_code(self) -> str:
+        """A generated asset code not used by any existing or imported asset"""
+        while True:
+            self._code_counter += 1
+            code = f"{self._code_prefix}-{self._code_counter:05d}"
+            if code not in self.codes:
+                return code
+
+    def validate(self, record: Dict) -> List[str]:
+        """Check a row against the master data, normalizing it in place; returns its errors"""
+        errors = []
+        if not record.get('Item Name'):
+            errors.append('Item Name is required')
+
+        category = record.get('Asset Category', '')
+        if not category:
+            errors.append('Asset Category is required')
+        elif category.lower() not in self.categories:
+            errors.append(f"Unknown category '{category}'")
+        else:
+            record['Asset Category'] = self.categories[category.lower()].get('Category Name', '')
+
+        subcategory = record.get('Asset SubCategory', '')
+        if subcategory:
+            names = self.subcategories.get(category.lower(), {})
+            if subcategory.lower() in names:
+                record['Asset SubCategory'] = names[subcategory.lower()]
+            else:
+                errors.append(f"Unknown subcategory '{subcategory}' for category '{category}'")
+
+        for field, lookup, label in (('Brand', self.brands, 'brand'),
+                                     ('Location', self.locations, 'location'),
+                                     ('Asset Status', self.statuses, 'asset status')):
+            value = record.get(field, '')
+            if not value:
+                continue
+            if value.lower() in lookup:
+                record[field] = lookup[value.lower()]
+            else:
+                errors.append(f"Unknown {label} '{value}'")
+
+        amount = record.get('Amount', '').replace(',', '')
+        if amount:
+            try:
+                float(amount)
+                record['Amount'] = amount
+            except ValueError:
+                errors.append(f"Amount '{record['Amount']}' is not a number")
+
+        purchase_date = record.get('Date of Purchase', '')
+        if purchase_date:
+            try:
+                datetime.strptime(purchase_date, '%Y-%m-%d')
+            except ValueError:
+                errors.append(f"Date of Purchase '{purchase_date}' is not a YYYY-MM-DD date")
+
+        code = record.get('Asset Code', '')
+        if code and code in self.codes:
+            errors.append(f"Asset Code '{code}' already exists")
+        return errors
+
+    def _error(self, row_number: int, message: str):
+        self.result['failed'] += 1
+        if len(self.result['errors']) < MAX_REPORTED_ERRORS:
+            self.result['errors'].append({'row': row_number, 'error': message})
+
+    def _report_progress(self):
+        if self.progress:
+            self.progress(dict(self.result, errors=list(self.result['errors'])))
+
+    def _write(self, chunk: List[Tuple[int, Dict]]):
+        """Write buffered rows with one insert_many call"""
+        if self.db.insert_many('Assets', [record for _, record in chunk]):
+            self.result['imported'] += len(chunk)
+        else:
+            for row_number, record in chunk:
+                self.codes.discard(record['Asset Code'])
+                self._error(row_number, 'Could not be written to the database')
+        self._report_progress()
+
+    def run(self, stream, filename: str) -> Dict:
+        """Import every row of a CSV or XLSX file; returns counts and per-row errors"""
+        chunk = []
+        for row_number, record in iter_rows(stream, filename):
+            self.result['rows'] += 1
+            errors = self.validate(record)
+            if errors:
+                self._error(row_number, '; '.join(errors))
+                continue
+            record['Asset Code'] = record.get('Asset Code') or self._next_code()
+            self.codes.add(record['Asset Code'])
+            chunk.append((row_number, record))
+            if len(chunk) >= self.chunk_size:
+                self._write(chunk)
+                chunk = []
+        if chunk:
+            self._write(chunk)
+        self._report_progress()
+        return self.result
+
+
+def import_assets(db: StorageBackend, path: str, filename: Optional[str] = None,
+                  progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Import assets from a CSV or XLSX file on disk"""
+    with open(path, 'rb') as stream:
+        return AssetImporter(db, progress).run(stream, filename or os.path.basename(path))
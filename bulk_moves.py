@@ -0,0 +1,45 @@
+"""Helpers for moving many assets to one location at once"""
+import re
+from datetime import datetime
+from storage_backend import StorageBackend
+from typing import List, Dict, Tuple
+
+
+def parse_asset_codes(text: str) -> List[str]:
+    """Asset codes from pasted or scanned text, in order and without duplicates.
+
+    Codes may be separated by newlines (one scan per line), commas,
+    semicolons or spaces.
+    """
+    codes = [code for code in re.split(r'[\s,;]+', text or '') if code]
+    return list(dict.fromkeys(codes))
+
+
+def plan_moves(db: StorageBackend, asset_codes: List[str], to_location: str,
+               moved_by: str, notes: str = '') -> Tuple[List[Dict], List[str], List[str]]:
+    """Build movement rows for moving assets to to_location.
+
+    Returns (movements, unknown, unchanged): unknown codes match no asset
+    and unchanged assets are already at the destination; neither gets a
+    movement row. Movement IDs are left for record_movements to allocate.
+    """
+    locations = {r.get('Asset Code', ''): r.get('Location', '')
+                 for r in db.get_all('Assets', columns=['Location'])}
+    moved_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    movements, unknown, unchanged = [], [], []
+    for code in asset_codes:
+        if code not in locations:
+            unknown.append(code)
+        elif locations[code] == to_location:
+            unchanged.append(code)
+        else:
+            movements.append({
+                'ID': '',
+                'Asset Code': code,
+                'From Location': locations[code],
+                'To Location': to_location,
+                'Movement Date': moved_at,
+                'Moved By': moved_by,
+                'Notes': notes
+            })
+    return movements, unknown, unchanged
@@ -9,3 +9,41 @@ class Config:
     # Default to Teddybuddies Asset Database Sheet ID
     GOOGLE_SHEET_ID = os.environ.get('GOOGLE_SHEET_ID') or '1q9jfezVWpFYAmvjo81Lk788kf9DNwqvSx7yxHWRGkec'
 
+    # Storage engine: 'sheets' (Google Sheets) or 'sqlite' (local database file)
+    STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND') or 'sheets'
+    SQLITE_DB_PATH = os.environ.get('SQLITE_DB_PATH') or 'trackz.db'
+
+    # Seconds GoogleSheetsDB serves a sheet from its in-process cache (0 disables)
+    SHEETS_CACHE_TTL = float(os.environ.get('SHEETS_CACHE_TTL') or 60)
+    # Seconds between full reloads of append-only sheets (ActivityLogs, AssetMovements);
+    # in between, only rows added since the last read are fetched
+    SHEETS_FULL_SYNC_INTERVAL = float(os.environ.get('SHEETS_FULL_SYNC_INTERVAL') or 900)
+
+    # Optional local SQLite mirror of the spreadsheet that serves all reads (empty disables)
+    SHEETS_MIRROR_PATH = os.environ.get('SHEETS_MIRROR_PATH') or ''
+    # Seconds between background refreshes of the mirror
+    SHEETS_MIRROR_REFRESH = float(os.environ.get('SHEETS_MIRROR_REFRESH') or 60)
+
+    # Sheets API requests per minute allowed by the rate limiter (the default per-user quota is 60)
+    SHEETS_REQUESTS_PER_MINUTE = float(os.environ.get('SHEETS_REQUESTS_PER_MINUTE') or 60)
+    # Retries for rate-limited or transient Sheets API failures
+    SHEETS_MAX_RETRIES = int(os.environ.get('SHEETS_MAX_RETRIES') or 5)
+
+    # Local journal of activity log entries waiting to be written to the ActivityLogs sheet
+    ACTIVITY_LOG_JOURNAL = os.environ.get('ACTIVITY_LOG_JOURNAL') or 'activity_log_journal.jsonl'
+    # Seconds between background flushes of queued activity log entries
+    ACTIVITY_LOG_FLUSH_INTERVAL = float(os.environ.get('ACTIVITY_LOG_FLUSH_INTERVAL') or 5)
+
+    # Seconds a report result is kept so its exports reuse the data the page showed
+    REPORT_CACHE_TTL = float(os.environ.get('REPORT_CACHE_TTL') or 120)
+
+    # Directory where background exports are written
+    EXPORT_DIR = os.environ.get('EXPORT_DIR') or 'exports'
+    # Worker threads building background exports
+    EXPORT_WORKERS = int(os.environ.get('EXPORT_WORKERS') or 2)
+    # Seconds a finished export is handed out again for an identical request
+    EXPORT_REUSE_SECONDS = float(os.environ.get('EXPORT_REUSE_SECONDS') or 300)
+    # Seconds a finished export stays available for download
+    EXPORT_KEEP_SECONDS = float(os.environ.get('EXPORT_KEEP_SECONDS') or 3600)
+    # Seconds a finished asset import's status stays available
+    IMPORT_KEEP_SECONDS = float(os.environ.get('IMPORT_KEEP_SECONDS') or 3600)
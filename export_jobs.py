@@ -0,0 +1,122 @@
+"""Background report exports written to a local artifacts directory.
+
+An export is submitted as a job and built by a small worker pool, so the
+request that asks for it returns at once. Finished files are kept in the
+artifacts directory for a while; an identical export (same report,
+filters and format) submitted while a job for it is running, or shortly
+after it finished, is given that job instead of building the file again.
+"""
+import os
+import shutil
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from reports import REPORTS, REPORT_FORMATS, run_report, export_file, export_filename
+from storage_backend import StorageBackend
+from typing import Dict, Optional
+
+# Artifact files are named export-<job id>.<format>
+ARTIFACT_PREFIX = 'export-'
+
+
+class ExportJobs:
+    """Export jobs by ID, with the worker pool that runs them"""
+
+    def __init__(self, db: StorageBackend, directory: str, max_workers: int = 2,
+                 reuse_seconds: float = 300, keep_seconds: float = 3600):
+        self.db = db
+        self.directory = directory
+        self.reuse_seconds = reuse_seconds
+        self.keep_seconds = keep_seconds
+        self._jobs: Dict[str, Dict] = {}
+        # Latest job ID per (report, filters, format)
+        self._by_query: Dict[tuple, str] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='export')
+        os.makedirs(directory, exist_ok=True)
+        self._remove_leftovers()
+
+    def _remove_leftovers(self):
+        """Delete artifacts of a previous run; their jobs are gone with the old process"""
+        for name in os.listdir(self.directory):
+            if name.startswith(ARTIFACT_PREFIX):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError as e:
+                    print(f"Error removing old export {name}: {e}")
+
+    def _expire(self):
+        """Forget finished jobs older than keep_seconds and delete their files (lock held)"""
+        now = time.time()
+        for job_id, job in list(self._jobs.items()):
+            if job['status'] in ('queued', 'running') or now - job['finished_at'] <= self.keep_seconds:
+                continue
+            del self._jobs[job_id]
+            if job['path'] and os.path.exists(job['path']):
+                try:
+                    os.remove(job['path'])
+                except OSError as e:
+                    print(f"Error removing export {job['path']}: {e}")
+        self._by_query = {query: job_id for query, job_id in self._by_query.items() if job_id in self._jobs}
+
+    def _reusable(self, job: Dict) -> bool:
+        if job['status'] in ('queued', 'running'):
+            return True
+        return job['status'] == 'done' and time.time() - job['finished_at'] <= self.reuse_seconds
+
+    def submit(self, name: str, args, fmt: str) -> str:
+        """Queue an export of a report with the filters in args; returns the job ID"""
+        if name not in REPORTS:
+            raise ValueError(f"Unknown report '{name}'")
+        if fmt not in REPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{fmt}'")
+        params = REPORTS[name].params(args)
+        query = (name, params, fmt)
+
+        with self._lock:
+            self._expire()
+            job_id = self._by_query.get(query)
+            if job_id and self._reusable(self._jobs[job_id]):
+                return job_id
+
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'id': job_id, 'report': name, 'format': fmt,
+                'status': 'queued', 'stage': 'Waiting for a worker', 'rows': None,
+                'filename': '', 'path': '', 'error': '',
+                'submitted_at': time.time(), 'finished_at': 0,
+            }
+            self._by_query[query] = job_id
+        self._executor.submit(self._run, job_id, name, dict(params), fmt)
+        return job_id
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _run(self, job_id: str, name: str, params: Dict, fmt: str):
+        """Build one export file in a worker thread"""
+        try:
+            self._update(job_id, status='running', stage='Reading data')
+            result = run_report(self.db, name, params)
+            self._update(job_id, stage='Writing file', rows=len(result.rows))
+
+            path = os.path.join(self.directory, f"{ARTIFACT_PREFIX}{job_id}.{fmt}")
+            output, _, _ = export_file(result, fmt)
+            with output, open(path, 'wb') as artifact:
+                shutil.copyfileobj(output, artifact)
+            self._update(job_id, status='done', stage='Ready', path=path,
+                         filename=export_filename(result, fmt), finished_at=time.time())
+        except Exception as e:
+            print(f"Error exporting {name} report as {fmt}: {e}")
+            self._update(job_id, status='failed', stage='Failed', error=str(e), finished_at=time.time())
+
+    def get(self, job_id: str) -> Optional[Dict]:
+        """A copy of a job's state, or None if it is unknown or expired"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job else None
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
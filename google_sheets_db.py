@@ -1,277 +1,684 @@
 import gspread
+import pandas as pd
+from gspread.utils import rowcol_to_a1, absolute_range_name
 from google.oauth2.service_account import Credentials
 from config import Config
-from typing import List, Dict, Optional
+from storage_backend import (StorageBackend, SHEET_HEADERS, SHEET_NAMES, APPEND_ONLY_SHEETS,
+                             INSERT_CHUNK_SIZE, primary_key)
+from sheet_cache import (SheetCache, SheetTable, build_record, cell_text, parse_table, parse_columns,
+                         column_records, appended_row)
+from id_allocator import IdAllocator, max_id
+from rate_limiter import shared_limiter, is_rate_limited
+from typing import Callable, List, Dict, Optional, Tuple
 import json
+import threading
+from contextlib import ExitStack
 
-class GoogleSheetsDB:
-    def __init__(self):
+# OAuth scopes requested for the service account
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+def cell_data(value) -> Dict:
+    """CellData for a batchUpdate request, storing a value as a RAW write would"""
+    if isinstance(value, bool):
+        return {'userEnteredValue': {'boolValue': value}}
+    if isinstance(value, (int, float)):
+        return {'userEnteredValue': {'numberValue': value}}
+    return {'userEnteredValue': {'stringValue': '' if value is None else str(value)}}
+
+class GoogleSheetsDB(StorageBackend):
+    """Google Sheets storage engine shared by the Flask and Streamlit apps"""
+
+    def __init__(self, credentials: Optional[Credentials] = None, sheet_id: Optional[str] = None):
         self.config = Config()
+        # Credentials default to the service account file named in Config
+        self.credentials = credentials
+        self.sheet_id = sheet_id or self.config.GOOGLE_SHEET_ID
         self.client = None
         self.sheet = None
+        self._cache = SheetCache(self.config.SHEETS_CACHE_TTL, retain=APPEND_ONLY_SHEETS,
+                                 full_sync_interval=self.config.SHEETS_FULL_SYNC_INTERVAL)
+        # Header row and header -> column number map per sheet
+        self._headers: Dict[str, List[str]] = {}
+        self._header_index: Dict[str, Dict[str, int]] = {}
+        # Worksheet handles by title, resolved once at connect time
+        self._worksheets: Dict[str, gspread.Worksheet] = {}
+        self._ids = IdAllocator()
+        # Per-sheet locks serializing this process's writes (see _write_lock)
+        self._write_locks: Dict[str, threading.Lock] = {}
+        self._write_locks_guard = threading.Lock()
+        self._limiter = shared_limiter()
         self._connect()
     
     def _connect(self):
         """Connect to Google Sheets"""
-        import time
-        max_retries = 3
-        retry_delay = 10  # seconds
-        
-        for attempt in range(max_retries):
-            try:
-                scope = [
-                    'https://www.googleapis.com/auth/spreadsheets',
-                    'https://www.googleapis.com/auth/drive'
-                ]
-                creds = Credentials.from_service_account_file(
-                    self.config.GOOGLE_SHEETS_CREDENTIALS,
-                    scopes=scope
-                )
-                self.client = gspread.authorize(creds)
-                if self.config.GOOGLE_SHEET_ID:
-                    self.sheet = self.client.open_by_key(self.config.GOOGLE_SHEET_ID)
-                else:
-                    # Create a new sheet if no ID provided
-                    self.sheet = self.client.create('Teddybuddies Asset Database')
-                    self.config.GOOGLE_SHEET_ID = self.sheet.id
-                self._initialize_sheets()
-                return  # Success, exit the retry loop
-            except Exception as e:
-                error_str = str(e)
-                # Check if it's a rate limit error
-                if '429' in error_str or 'RATE_LIMIT_EXCEEDED' in error_str or 'Quota exceeded' in error_str:
-                    if attempt < max_retries - 1:
-                        print(f"Rate limit exceeded. Waiting {retry_delay} seconds before retry {attempt + 1}/{max_retries}...")
-                        time.sleep(retry_delay)
-                        retry_delay *= 2  # Exponential backoff
-                        continue
-                    else:
-                        print(f"Rate limit exceeded after {max_retries} attempts. Please wait a minute and restart the server.")
-                        raise
-                else:
-                    # Not a rate limit error, raise immediately
-                    print(f"Error connecting to Google Sheets: {e}")
-                    raise
+        try:
+            creds = self.credentials or Credentials.from_service_account_file(
+                self.config.GOOGLE_SHEETS_CREDENTIALS,
+                scopes=SCOPES
+            )
+            self.client = gspread.authorize(creds)
+            if self.sheet_id:
+                self.sheet = self._api(self.client.open_by_key, self.sheet_id)
+            else:
+                # Create a new sheet if no ID provided
+                self.sheet = self._api(self.client.create, 'Teddybuddies Asset Database')
+                self.sheet_id = self.config.GOOGLE_SHEET_ID = self.sheet.id
+            self._initialize_sheets()
+        except Exception as e:
+            if is_rate_limited(e):
+                print("Rate limit exceeded after retries. Please wait a minute and restart the server.")
+            else:
+                print(f"Error connecting to Google Sheets: {e}")
+            raise
+    
+    def _api(self, func, *args, **kwargs):
+        """Make one Sheets API call through the shared rate limiter, with retries"""
+        return self._limiter.call(func, *args, **kwargs)
+    
+    def api_metrics(self) -> Dict:
+        """Call, throttle and retry counters of the shared rate limiter"""
+        return self._limiter.metrics()
     
     def _initialize_sheets(self):
-        """Initialize all required sheets if they don't exist"""
-        sheet_names = ['Users', 'Locations', 'Categories', 'Subcategories', 
-                      'AssetTypes', 'Brands', 'Assets', 'AssetMovements', 'ActivityLogs']
+        """Create missing sheets and headers with one read and at most two writes"""
+        self._resolve_worksheets()
+        missing_sheets = [name for name in SHEET_NAMES if name not in self._worksheets]
+        if missing_sheets:
+            self._add_worksheets(missing_sheets)
         
-        for sheet_name in sheet_names:
-            try:
-                worksheet = self.sheet.worksheet(sheet_name)
-                # Ensure headers are up-to-date for existing sheets
-                self._ensure_headers(sheet_name)
-            except gspread.WorksheetNotFound:
-                worksheet = self.sheet.add_worksheet(title=sheet_name, rows=1000, cols=20)
-                self._set_headers(sheet_name)
-    
-    def _set_headers(self, sheet_name: str):
-        """Set headers for each sheet"""
-        worksheet = self.sheet.worksheet(sheet_name)
+        # Read every header row in a single request
+        ranges = [absolute_range_name(name, 'A1:Z1') for name in SHEET_NAMES]
+        response = self._api(self.sheet.values_batch_get, ranges)
+        header_rows = [(value_range.get('values') or [[]])[0]
+                       for value_range in response.get('valueRanges', [])]
         
-        headers = {
-            'Users': ['Username', 'Email', 'Password', 'Role'],
-            'Locations': ['ID', 'Location Name'],
-            'Categories': ['ID', 'Category Name'],
-            'Subcategories': ['ID', 'Subcategory Name', 'Category ID'],
-            'AssetTypes': ['Asset Code', 'Asset Type', 'Depreciation Value (%)'],
-            'Brands': ['ID', 'Brand Name'],
-            'Assets': ['Asset Code', 'Item Name', 'Asset Category', 'Asset SubCategory', 
-                      'Brand', 'Asset Description', 'Amount', 'Location', 
-                      'Date of Purchase', 'Warranty', 'Department', 'Ownership',
-                      'Asset Status', 'Image Attachment', 'Document Attachment'],
-            'AssetMovements': ['ID', 'Asset Code', 'From Location', 'To Location', 
-                              'Movement Date', 'Moved By', 'Notes'],
-            'ActivityLogs': ['ID', 'Date & Time', 'Type', 'User', 'Action', 'Entity Type', 
-                           'Entity ID', 'Description', 'Details']
-        }
+        header_writes = []
+        for sheet_name, current_headers in zip(SHEET_NAMES, header_rows):
+            expected_headers = SHEET_HEADERS[sheet_name]
+            # Add missing headers after the last existing column
+            missing_headers = [h for h in expected_headers if h not in current_headers]
+            if missing_headers:
+                start_cell = rowcol_to_a1(1, len(current_headers) + 1)
+                header_writes.append({
+                    'range': absolute_range_name(sheet_name, start_cell),
+                    'values': [missing_headers]
+                })
+            self._cache_headers(sheet_name, current_headers + missing_headers)
         
-        if sheet_name in headers:
-            worksheet.append_row(headers[sheet_name])
+        if header_writes:
+            self._api(self.sheet.values_batch_update, {
+                'valueInputOption': 'RAW',
+                'data': header_writes
+            })
     
-    def _ensure_headers(self, sheet_name: str):
-        """Ensure headers exist and are up-to-date for existing sheets"""
-        worksheet = self.sheet.worksheet(sheet_name)
-        
-        expected_headers = {
-            'Users': ['Username', 'Email', 'Password', 'Role'],
-            'Locations': ['ID', 'Location Name'],
-            'Categories': ['ID', 'Category Name'],
-            'Subcategories': ['ID', 'Subcategory Name', 'Category ID'],
-            'AssetTypes': ['Asset Code', 'Asset Type', 'Depreciation Value (%)'],
-            'Brands': ['ID', 'Brand Name'],
-            'Assets': ['Asset Code', 'Item Name', 'Asset Category', 'Asset SubCategory', 
-                      'Brand', 'Asset Description', 'Amount', 'Location', 
-                      'Date of Purchase', 'Warranty', 'Department', 'Ownership',
-                      'Asset Status', 'Image Attachment', 'Document Attachment'],
-            'AssetMovements': ['ID', 'Asset Code', 'From Location', 'To Location', 
-                              'Movement Date', 'Moved By', 'Notes'],
-            'ActivityLogs': ['ID', 'Date & Time', 'Type', 'User', 'Action', 'Entity Type', 
-                           'Entity ID', 'Description', 'Details']
-        }
-        
-        if sheet_name not in expected_headers:
-            return
-        
-        # Get current headers
-        try:
-            current_headers = worksheet.row_values(1)
-        except:
-            current_headers = []
-        
-        # If no headers exist, set them
-        if not current_headers:
-            worksheet.append_row(expected_headers[sheet_name])
-            return
-        
-        # Check if we need to add missing headers
-        missing_headers = []
-        for header in expected_headers[sheet_name]:
-            if header not in current_headers:
-                missing_headers.append(header)
-        
-        # Add missing headers
-        if missing_headers:
-            # Get the last column index
-            last_col = len(current_headers)
-            # Add new headers starting from the next column
-            start_col = last_col + 1
-            for i, header in enumerate(missing_headers):
-                col_idx = start_col + i
-                worksheet.update_cell(1, col_idx, header)
-    
-    def get_all(self, sheet_name: str) -> List[Dict]:
-        """Get all records from a sheet"""
+    def _add_worksheets(self, sheet_names: List[str]):
+        """Create several worksheets in one batch_update request"""
+        self._api(self.sheet.batch_update, {
+            'requests': [
+                {'addSheet': {'properties': {
+                    'title': name,
+                    'gridProperties': {'rowCount': 1000, 'columnCount': 20}
+                }}}
+                for name in sheet_names
+            ]
+        }, retry_if=is_rate_limited)
+        self._resolve_worksheets()
+    
+    def _report_error(self, message: str):
+        """Surface a failed read or write; front ends override this"""
+        print(message)
+    
+    def _resolve_worksheets(self):
+        """Fetch every worksheet handle with one spreadsheet metadata request"""
+        self._worksheets = {ws.title: ws for ws in self._api(self.sheet.worksheets)}
+    
+    def _worksheet(self, sheet_name: str) -> gspread.Worksheet:
+        """Return the cached handle for a worksheet, re-resolving if unknown"""
+        worksheet = self._worksheets.get(sheet_name)
+        if worksheet is None:
+            self._resolve_worksheets()
+            worksheet = self._worksheets.get(sheet_name)
+            if worksheet is None:
+                raise gspread.WorksheetNotFound(sheet_name)
+        return worksheet
+    
+    def _forget_stale_worksheet(self, sheet_name: str, error: Exception):
+        """Drop a handle whose title or sheet ID no longer matches the spreadsheet"""
+        message = str(error)
+        if (isinstance(error, gspread.WorksheetNotFound)
+                or 'Unable to parse range' in message
+                or 'No grid with id' in message):
+            self._worksheets.pop(sheet_name, None)
+    
+    def _cache_headers(self, sheet_name: str, headers: List[str]):
+        """Remember a sheet's header row and its header -> column number map"""
+        self._headers[sheet_name] = list(headers)
+        header_index = {}
+        for col_idx, header in enumerate(headers, start=1):
+            header_index.setdefault(header, col_idx)
+        self._header_index[sheet_name] = header_index
+    
+    def _get_headers(self, sheet_name: str) -> List[str]:
+        """Return the cached header row, reading it only if never seen"""
+        if sheet_name not in self._headers:
+            self._cache_headers(sheet_name, self._api(self._worksheet(sheet_name).row_values, 1))
+        return self._headers[sheet_name]
+    
+    def _load_table(self, sheet_name: str) -> SheetTable:
+        """Download and parse a whole sheet, refreshing its cache entry"""
+        worksheet = self._worksheet(sheet_name)
+        # Get all values including empty rows
+        return self._store_table(sheet_name, self._api(worksheet.get_all_values))
+    
+    def _store_table(self, sheet_name: str, all_values: List[List[str]]) -> SheetTable:
+        """Parse downloaded sheet values and cache the resulting table"""
+        table = parse_table(all_values, primary_key(sheet_name))
+        self._cache.put(sheet_name, table)
+        # Catch up with rows added outside this process
+        self._ids.observe(sheet_name, table.records())
+        return table
+    
+    def _table(self, sheet_name: str) -> SheetTable:
+        """Return the cached table for a sheet, loading it if needed"""
+        # Checked against None: an empty table is falsy but still a cache hit
+        table = self._cache.get(sheet_name)
+        if table is None:
+            table = self._sync_new_rows(sheet_name)
+        if table is None:
+            table = self._load_table(sheet_name)
+        return table
+    
+    def _sync_new_rows(self, sheet_name: str) -> Optional[SheetTable]:
+        """Top up a kept append-only table with only the rows added since it was read"""
+        pending = self._new_rows_range(sheet_name)
+        if pending is None:
+            return None
+        table, last_row, range_name = pending
+        values = self._api(self._worksheet(sheet_name).get_values, range_name)
+        return self._add_new_rows(sheet_name, table, last_row, values)
+    
+    def _new_rows_range(self, sheet_name: str):
+        """(table, last_row, range) to read for a kept table, or None if it must be reloaded"""
+        table = self._cache.get_retained(sheet_name)
+        if table is None:
+            return None
+        last_row = table.last_row
+        last_col = rowcol_to_a1(1, max(len(table.headers), 1))[:-1]
+        return table, last_row, f"A{last_row + 1}:{last_col}"
+    
+    def _add_new_rows(self, sheet_name: str, table: SheetTable, last_row: int,
+                      values: List[List[str]]) -> Optional[SheetTable]:
+        """Merge rows read below last_row into a kept table"""
+        with self._cache.lock:
+            if self._cache.get_retained(sheet_name) is not table or table.last_row != last_row:
+                # Changed while the rows were being read; reload the whole sheet instead
+                return None
+            new_records = table.extend(values)
+            self._cache.touch(sheet_name)
+        self._ids.observe(sheet_name, new_records)
+        return table
+    
+    def get_all(self, sheet_name: str, columns: Optional[List[str]] = None) -> List[Dict]:
+        """Get all records from a sheet (served from the cache while fresh)
+
+        With columns, records hold only those fields plus the primary key, and
+        rows blank in all of them are skipped.
+        """
         try:
-            worksheet = self.sheet.worksheet(sheet_name)
-            # Get all values including empty rows
-            all_values = worksheet.get_all_values()
-            
-            if not all_values or len(all_values) < 2:
-                # No headers or no data rows
-                return []
-            
-            # Get headers from first row
-            headers = [str(h).strip() for h in all_values[0]]
-            
-            # Process data rows
-            records = []
-            for row in all_values[1:]:
-                # Skip completely empty rows
-                if not any(row):
-                    continue
-                
-                # Create a dictionary for this row
-                record = {}
-                for i, header in enumerate(headers):
-                    # Get value from row, or empty string if index is out of range
-                    value = row[i] if i < len(row) else ''
-                    record[header] = value.strip() if value else ''
-                
-                # Only add records that have at least one non-empty value
-                if any(record.values()):
-                    records.append(record)
-            
-            return records
+            if columns is None:
+                return self._table(sheet_name).records()
+            return column_records(self._read_columns(sheet_name, columns))
         except Exception as e:
-            print(f"Error getting records from {sheet_name}: {e}")
+            self._report_error(f"Error getting records from {sheet_name}: {e}")
+            self._forget_stale_worksheet(sheet_name, e)
             import traceback
             traceback.print_exc()
             return []
     
+    def get_many(self, sheet_names: List[str]) -> Dict[str, List[Dict]]:
+        """Get all records of several sheets, downloading uncached ones in one request"""
+        try:
+            return self.fetch_many(sheet_names)
+        except Exception as e:
+            self._report_error(f"Error getting records from {', '.join(sheet_names)}: {e}")
+            for sheet_name in sheet_names:
+                self._forget_stale_worksheet(sheet_name, e)
+            return {sheet_name: [] for sheet_name in sheet_names}
+    
+    def fetch_many(self, sheet_names: List[str]) -> Dict[str, List[Dict]]:
+        """Like get_many, but raises on API errors instead of returning empty lists"""
+        tables = self._tables(sheet_names)
+        return {sheet_name: tables[sheet_name].records() for sheet_name in sheet_names}
+    
+    def _tables(self, sheet_names: List[str]) -> Dict[str, SheetTable]:
+        """Tables for several sheets, downloading uncached ones in one request"""
+        tables = {}
+        ranges = {}
+        pending = {}
+        for sheet_name in sheet_names:
+            table = self._cache.get(sheet_name)
+            if table is not None:
+                tables[sheet_name] = table
+                continue
+            # Surface unknown sheets before building the request
+            self._worksheet(sheet_name)
+            pending[sheet_name] = self._new_rows_range(sheet_name)
+            if pending[sheet_name] is None:
+                ranges[sheet_name] = absolute_range_name(sheet_name)
+            else:
+                ranges[sheet_name] = absolute_range_name(sheet_name, pending[sheet_name][2])
+        if ranges:
+            response = self._api(self.sheet.values_batch_get, list(ranges.values()))
+            for sheet_name, value_range in zip(ranges, response.get('valueRanges', [])):
+                values = value_range.get('values', [])
+                if pending[sheet_name] is None:
+                    tables[sheet_name] = self._store_table(sheet_name, values)
+                else:
+                    table, last_row, _ = pending[sheet_name]
+                    table = self._add_new_rows(sheet_name, table, last_row, values)
+                    tables[sheet_name] = table if table is not None else self._load_table(sheet_name)
+        return tables
+    
+    def get_columns(self, sheet_name: str, columns: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Get all records of a sheet as column lists, without building row dicts"""
+        try:
+            if columns is None:
+                return self._table(sheet_name).data()
+            return self._read_columns(sheet_name, columns)
+        except Exception as e:
+            self._report_error(f"Error getting records from {sheet_name}: {e}")
+            self._forget_stale_worksheet(sheet_name, e)
+            return {}
+    
+    def get_frame(self, sheet_name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get all records of a sheet as a DataFrame"""
+        try:
+            if columns is None:
+                return self._table(sheet_name).frame()
+            data = self._read_columns(sheet_name, columns)
+            return pd.DataFrame(data, columns=list(data))
+        except Exception as e:
+            self._report_error(f"Error getting records from {sheet_name}: {e}")
+            self._forget_stale_worksheet(sheet_name, e)
+            return pd.DataFrame()
+    
+    def _read_columns(self, sheet_name: str, columns: List[str]) -> Dict[str, List[str]]:
+        """Read selected columns (plus the primary key), downloading only their ranges"""
+        fields = list(dict.fromkeys([primary_key(sheet_name)] + list(columns)))
+        
+        # A fresh full table already holds every column
+        table = self._cache.get(sheet_name)
+        if table is not None:
+            return parse_columns({field: table.column(field)
+                                  for field in fields if field in table.fields()})
+        
+        # Field -> column number, later duplicate headers winning as in get_all
+        positions = {}
+        for col_idx, header in enumerate(self._get_headers(sheet_name), start=1):
+            positions[str(header).strip()] = col_idx
+        fields = [field for field in fields if field in positions]
+        if not fields:
+            return {}
+        data = self._cache.get_projection(sheet_name, fields)
+        if data is not None:
+            return data
+        
+        ranges = []
+        for field in fields:
+            letter = rowcol_to_a1(1, positions[field])[:-1]
+            ranges.append(absolute_range_name(sheet_name, f"{letter}2:{letter}"))
+        response = self._api(self.sheet.values_batch_get, ranges, params={'majorDimension': 'COLUMNS'})
+        values = [(value_range.get('values') or [[]])[0]
+                  for value_range in response.get('valueRanges', [])]
+        data = parse_columns(dict(zip(fields, values)))
+        self._cache.put_projection(sheet_name, fields, data)
+        return data
+    
     def get_by_id(self, sheet_name: str, id_field: str, id_value: str) -> Optional[Dict]:
         """Get a record by ID"""
-        records = self.get_all(sheet_name)
-        for record in records:
-            if str(record.get(id_field)) == str(id_value):
-                return record
-        return None
+        try:
+            table = self._table(sheet_name)
+        except Exception as e:
+            self._report_error(f"Error getting record from {sheet_name}: {e}")
+            self._forget_stale_worksheet(sheet_name, e)
+            return None
+        pos = table.find(id_field, id_value)
+        return table.record(pos) if pos is not None else None
     
     def insert(self, sheet_name: str, data: Dict) -> bool:
         """Insert a new record"""
+        return self.insert_many(sheet_name, [data])
+    
+    def insert_many(self, sheet_name: str, records: List[Dict]) -> bool:
+        """Insert several records with one append_rows call per chunk"""
+        if not records:
+            return True
         try:
-            worksheet = self.sheet.worksheet(sheet_name)
-            headers = worksheet.row_values(1)
-            row = [data.get(header, '') for header in headers]
-            worksheet.append_row(row)
+            worksheet = self._worksheet(sheet_name)
+            headers = self._get_headers(sheet_name)
+            rows = [[data.get(header, '') for header in headers] for data in records]
+            
+            with self._write_lock(sheet_name):
+                for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+                    chunk = slice(start, start + INSERT_CHUNK_SIZE)
+                    table = self._cache.peek(sheet_name)
+                    response = self._api(worksheet.append_rows, rows[chunk], retry_if=is_rate_limited)
+                    self._add_appended(sheet_name, table, appended_row(response),
+                                       [build_record(headers, data) for data in records[chunk]])
+                    self._ids.observe(sheet_name, records[chunk])
             return True
         except Exception as e:
-            print(f"Error inserting record into {sheet_name}: {e}")
+            self._report_error(f"Error inserting records into {sheet_name}: {e}")
+            self._forget_stale_worksheet(sheet_name, e)
+            # Some chunks may have been written before the failure
+            self._cache.invalidate(sheet_name)
+            return False
+    
+    def _write_lock(self, sheet_name: str) -> threading.Lock:
+        """Lock held around each write to a sheet, so row positions planned from
+        the cache are not moved by another write of this process before use.
+        
+        The cache lock is only taken to apply a finished write, never around
+        API calls, so reads are not held up by writes and their retries.
+        """
+        with self._write_locks_guard:
+            return self._write_locks.setdefault(sheet_name, threading.Lock())
+    
+    def _patch_table(self, sheet_name: str, table: SheetTable, apply: Callable[[], None]):
+        """Apply a finished write to the cached table it was planned on.
+        
+        If the cache has loaded another copy of the sheet in the meantime,
+        that copy may predate the write, so it is dropped instead.
+        """
+        with self._cache.lock:
+            if self._cache.peek(sheet_name) is table:
+                apply()
+            else:
+                self._cache.invalidate(sheet_name)
+            self._cache.drop_projections(sheet_name)
+    
+    def _add_appended(self, sheet_name: str, table: Optional[SheetTable], first_row: Optional[int],
+                      records: List[Dict]):
+        """Add appended records to the cached table if they directly follow its last row.
+        
+        Otherwise another process appended in between (or the position is
+        unknown): a kept append-only table is topped up from the sheet on its
+        next read, any other table is dropped.
+        """
+        with self._cache.lock:
+            current = self._cache.peek(sheet_name)
+            if current is not None:
+                if current is table and first_row == table.last_row + 1:
+                    for offset, record in enumerate(records):
+                        table.append(record, first_row + offset)
+                elif current is table and sheet_name in self._cache.retain:
+                    self._cache.expire(sheet_name)
+                else:
+                    self._cache.invalidate(sheet_name)
+            self._cache.drop_projections(sheet_name)
+    
+    def _locate(self, sheet_name: str, id_field: str, id_values: List) -> Tuple[SheetTable, Dict]:
+        """The sheet's table and the positions of the records with these IDs, checked
+        against the sheet as it is now; IDs not found are left out.
+        
+        Row numbers in a cached table go stale when another process or a manual
+        edit inserts or deletes rows. Before a write by row number, the ID cell
+        of each target row is read back in one request; if any differs, or an
+        ID is not in the cached table, the sheet is reloaded and searched again.
+        Callers hold the sheet's write lock.
+        """
+        id_values = list(dict.fromkeys(id_values))
+        table = self._cache.get(sheet_name)
+        if table is not None and id_field in table.columns:
+            positions = self._positions(table, id_field, id_values)
+            if len(positions) == len(id_values) and self._rows_match(sheet_name, table, id_field, positions):
+                return table, positions
+        table = self._load_table(sheet_name)
+        if id_field not in table.columns:
+            return table, {}
+        return table, self._positions(table, id_field, id_values)
+    
+    def _positions(self, table: SheetTable, id_field: str, id_values: List) -> Dict:
+        """ID value -> table position, for the IDs the table holds"""
+        positions = {}
+        for id_value in id_values:
+            pos = table.find(id_field, id_value)
+            if pos is not None:
+                positions[id_value] = pos
+        return positions
+    
+    def _rows_match(self, sheet_name: str, table: SheetTable, id_field: str, positions: Dict) -> bool:
+        """Whether the sheet still holds each record's ID in the row the table has for it"""
+        if not positions:
+            return True
+        col_idx = table.columns[id_field]
+        ranges = [absolute_range_name(sheet_name, rowcol_to_a1(table.row_number(pos), col_idx))
+                  for pos in positions.values()]
+        response = self._api(self.sheet.values_batch_get, ranges)
+        value_ranges = response.get('valueRanges', [])
+        if len(value_ranges) != len(ranges):
             return False
+        for pos, value_range in zip(positions.values(), value_ranges):
+            cell = ((value_range.get('values') or [[]])[0] or [''])[0]
+            if cell_text(cell) != table.record(pos).get(id_field):
+                return False
+        return True
+    
+    def _row_ranges(self, columns: Dict[str, int], row_idx: int, data: Dict) -> List[Dict]:
+        """Group the changed cells of one row into contiguous column ranges"""
+        cells = sorted((columns[h], v) for h, v in data.items() if h in columns)
+        ranges = []
+        for col_idx, value in cells:
+            if ranges and ranges[-1]['end'] == col_idx - 1:
+                ranges[-1]['end'] = col_idx
+                ranges[-1]['values'][0].append(value)
+            else:
+                ranges.append({'start': col_idx, 'end': col_idx, 'values': [[value]]})
+        return [{
+            'range': f"{rowcol_to_a1(row_idx, r['start'])}:{rowcol_to_a1(row_idx, r['end'])}",
+            'values': r['values']
+        } for r in ranges]
+    
+    def _write_ranges(self, worksheet, ranges: List[Dict]):
+        """Write cell ranges in a single API request"""
+        if not ranges:
+            return
+        if len(ranges) == 1:
+            self._api(worksheet.update, range_name=ranges[0]['range'], values=ranges[0]['values'],
+                      value_input_option='USER_ENTERED')
+        else:
+            self._api(worksheet.batch_update, ranges, value_input_option='USER_ENTERED')
     
     def update(self, sheet_name: str, id_field: str, id_value: str, data: Dict) -> bool:
         """Update a record"""
         try:
-            worksheet = self.sheet.worksheet(sheet_name)
-            records = worksheet.get_all_values()
-            headers = records[0] if records else []
-            
-            # Find the row index
-            row_idx = None
-            id_col_idx = headers.index(id_field) if id_field in headers else None
-            
-            if id_col_idx is None:
-                return False
-            
-            for i, row in enumerate(records[1:], start=2):
-                if len(row) > id_col_idx and str(row[id_col_idx]) == str(id_value):
-                    row_idx = i
-                    break
-            
-            if row_idx is None:
-                return False
-            
-            # Update the row
-            for header, value in data.items():
-                if header in headers:
-                    col_idx = headers.index(header) + 1
-                    worksheet.update_cell(row_idx, col_idx, value)
-            
+            worksheet = self._worksheet(sheet_name)
+            with self._write_lock(sheet_name):
+                table, positions = self._locate(sheet_name, id_field, [id_value])
+                if id_value not in positions:
+                    return False
+                pos = positions[id_value]
+                
+                # Update the changed cells of the row in one request
+                self._write_ranges(worksheet, self._row_ranges(table.columns, table.row_number(pos), data))
+                self._patch_table(sheet_name, table, lambda: table.patch(pos, data))
             return True
         except Exception as e:
-            print(f"Error updating record in {sheet_name}: {e}")
+            self._report_error(f"Error updating record in {sheet_name}: {e}")
+            self._forget_stale_worksheet(sheet_name, e)
+            # A failed write leaves the cached copy unreliable
+            self._cache.invalidate(sheet_name)
             return False
     
+    def update_many(self, sheet_name: str, id_field: str, updates: Dict[str, Dict]) -> int:
+        """Update several records, keyed by ID value, in a single request.
+        
+        Returns the number of records found and updated.
+        """
+        try:
+            worksheet = self._worksheet(sheet_name)
+            with self._write_lock(sheet_name):
+                table, positions = self._locate(sheet_name, id_field, list(updates))
+                
+                ranges = []
+                found = []
+                for id_value, data in updates.items():
+                    pos = positions.get(id_value)
+                    if pos is None:
+                        continue
+                    ranges.extend(self._row_ranges(table.columns, table.row_number(pos), data))
+                    found.append((pos, data))
+                
+                self._write_ranges(worksheet, ranges)
+                
+                def apply():
+                    for pos, data in found:
+                        table.patch(pos, data)
+                self._patch_table(sheet_name, table, apply)
+            return len(found)
+        except Exception as e:
+            self._report_error(f"Error updating records in {sheet_name}: {e}")
+            self._forget_stale_worksheet(sheet_name, e)
+            self._cache.invalidate(sheet_name)
+            return 0
+    
     def delete(self, sheet_name: str, id_field: str, id_value: str) -> bool:
         """Delete a record"""
         try:
-            worksheet = self.sheet.worksheet(sheet_name)
-            records = worksheet.get_all_values()
-            headers = records[0] if records else []
-            
-            id_col_idx = headers.index(id_field) if id_field in headers else None
-            if id_col_idx is None:
-                return False
-            
-            row_idx = None
-            for i, row in enumerate(records[1:], start=2):
-                if len(row) > id_col_idx and str(row[id_col_idx]) == str(id_value):
-                    row_idx = i
-                    break
-            
-            if row_idx:
-                worksheet.delete_rows(row_idx)
-                return True
+            worksheet = self._worksheet(sheet_name)
+            with self._write_lock(sheet_name):
+                table, positions = self._locate(sheet_name, id_field, [id_value])
+                if id_value not in positions:
+                    return False
+                pos = positions[id_value]
+                
+                self._api(worksheet.delete_rows, table.row_number(pos), retry_if=is_rate_limited)
+                # Rows below the deleted one shift up; the table adjusts its index
+                self._patch_table(sheet_name, table, lambda: table.remove(pos))
+            return True
+        except Exception as e:
+            self._report_error(f"Error deleting record from {sheet_name}: {e}")
+            self._forget_stale_worksheet(sheet_name, e)
+            self._cache.invalidate(sheet_name)
             return False
+    
+    def record_movements(self, movements: List[Dict], log_entries: Optional[List[Dict]] = None) -> bool:
+        """Record movements, move the assets and log them in a single request.
+        
+        The movement and log rows are appended by the server (appendCells)
+        below whatever the sheets hold at that moment, so rows written by
+        other processes are never overwritten; each asset's Location cell is
+        set with updateCells in the same batchUpdate, so a move is applied
+        entirely or not at all. Movements and log entries without an ID are
+        given one. Nothing is written if any movement names an unknown asset
+        or the IDs cannot be allocated.
+        """
+        if not movements:
+            return True
+        try:
+            # Before the write locks below: allocation takes them itself
+            movements = self.with_new_ids('AssetMovements', movements)
+            entries = self.with_new_ids('ActivityLogs', log_entries or [])
         except Exception as e:
-            print(f"Error deleting record from {sheet_name}: {e}")
+            self._report_error(f"Error allocating movement IDs: {e}")
+            return False
+        appends = [('AssetMovements', movements)]
+        if entries:
+            appends.append(('ActivityLogs', entries))
+        sheet_names = ['Assets'] + [sheet_name for sheet_name, _ in appends]
+        try:
+            with ExitStack() as stack:
+                for sheet_name in sorted(sheet_names):
+                    stack.enter_context(self._write_lock(sheet_name))
+                assets, positions = self._locate('Assets', 'Asset Code',
+                                                 [m.get('Asset Code') for m in movements])
+                if 'Location' not in assets.columns:
+                    return False
+                
+                requests = []
+                moved = []
+                assets_id = self._worksheet('Assets').id
+                col_idx = assets.columns['Location']
+                for movement in movements:
+                    pos = positions.get(movement.get('Asset Code'))
+                    if pos is None:
+                        return False
+                    location = movement.get('To Location', '')
+                    row_idx = assets.row_number(pos)
+                    requests.append({'updateCells': {
+                        'range': {'sheetId': assets_id,
+                                  'startRowIndex': row_idx - 1, 'endRowIndex': row_idx,
+                                  'startColumnIndex': col_idx - 1, 'endColumnIndex': col_idx},
+                        'rows': [{'values': [cell_data(location)]}],
+                        'fields': 'userEnteredValue'
+                    }})
+                    moved.append((pos, location))
+                
+                for sheet_name, records in appends:
+                    headers = self._get_headers(sheet_name)
+                    requests.append({'appendCells': {
+                        'sheetId': self._worksheet(sheet_name).id,
+                        'rows': [{'values': [cell_data(record.get(header, '')) for header in headers]}
+                                 for record in records],
+                        'fields': 'userEnteredValue'
+                    }})
+                
+                # Not repeated on failure: the appends are not idempotent
+                self._api(self.sheet.batch_update, {'requests': requests}, retry_if=is_rate_limited)
+                
+                def apply():
+                    for pos, location in moved:
+                        assets.patch(pos, {'Location': location})
+                self._patch_table('Assets', assets, apply)
+                for sheet_name, records in appends:
+                    # The rows' positions are not reported back; the next read
+                    # tops the table up with them from the sheet
+                    with self._cache.lock:
+                        self._cache.expire(sheet_name)
+                        self._cache.drop_projections(sheet_name)
+                    self._ids.observe(sheet_name, records)
+            return True
+        except Exception as e:
+            self._report_error(f"Error recording asset movements: {e}")
+            for sheet_name in sheet_names:
+                self._forget_stale_worksheet(sheet_name, e)
+                self._cache.invalidate(sheet_name)
             return False
     
     def get_next_id(self, sheet_name: str, id_field: str = 'ID') -> int:
-        """Get the next available ID"""
-        records = self.get_all(sheet_name)
-        if not records:
+        """Allocate the next available ID without scanning the sheet"""
+        try:
+            return self.allocate_id(sheet_name, id_field)
+        except Exception as e:
+            self._report_error(f"Error getting next ID for {sheet_name}: {e}")
+            self._forget_stale_worksheet(sheet_name, e)
             return 1
-        ids = [int(record.get(id_field, 0)) for record in records if record.get(id_field)]
-        return max(ids) + 1 if ids else 1
-    
-    def generate_asset_code(self, asset_type: str) -> str:
-        """Generate asset code based on asset type"""
-        records = self.get_all('Assets')
-        # Count existing assets of this type
-        type_count = sum(1 for r in records if r.get('Asset Type', '') == asset_type)
-        # Format: TYPE-001, TYPE-002, etc.
-        return f"{asset_type.upper().replace(' ', '')[:4]}-{str(type_count + 1).zfill(4)}"
-
+    
+    def allocate_id(self, sheet_name: str, id_field: str = 'ID') -> int:
+        """Allocate the next available ID, raising if the sheet cannot be read"""
+        return self.allocate_ids(sheet_name, 1, id_field)[0]
+    
+    def allocate_ids(self, sheet_name: str, count: int, id_field: str = 'ID') -> List[int]:
+        """Allocate count consecutive IDs with one read of the ID column.
+        
+        The column is read from the sheet, not the cache, so IDs stored by
+        other processes are seen; the sheet's write lock keeps this
+        process's own appends from landing mid-read.
+        """
+        if count <= 0:
+            return []
+        with self._write_lock(sheet_name):
+            first = self._ids.allocate(sheet_name, id_field,
+                                       lambda: self._max_id(sheet_name, id_field), count)
+        return list(range(first, first + count))
+    
+    def _max_id(self, sheet_name: str, id_field: str) -> int:
+        """Highest ID stored in a sheet, reading only the ID column"""
+        self._get_headers(sheet_name)
+        col_idx = self._header_index[sheet_name].get(id_field)
+        if not col_idx:
+            return 0
+        return max_id(self._api(self._worksheet(sheet_name).col_values, col_idx)[1:])
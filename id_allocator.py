@@ -0,0 +1,54 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+def max_id(values: Iterable) -> int:
+    """Highest integer among ID values, ignoring blanks and non-numeric IDs"""
+    highest = 0
+    for value in values:
+        text = str(value).strip() if value is not None else ''
+        if text.isdigit():
+            highest = max(highest, int(text))
+    return highest
+
+
+class IdAllocator:
+    """Hands out increasing integer IDs per sheet above the highest stored ID.
+
+    The storage engine's highest ID is read again for every allocation, so
+    IDs written by other processes (Flask and Streamlit share one
+    spreadsheet) are never handed out again. The in-memory high-water mark
+    covers IDs this process has allocated but not yet written, and the lock
+    makes concurrent requests in one process receive different IDs. Two
+    processes can still collide if both allocate before either has written
+    its row, since an ID only counts as taken once it is stored.
+    """
+
+    def __init__(self):
+        self._high: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, sheet_name: str, id_field: str, load_max: Callable[[], int],
+                 count: int = 1) -> int:
+        """Reserve count consecutive IDs and return the first; load_max reads the stored maximum"""
+        key = (sheet_name, id_field)
+        stored = load_max()
+        with self._lock:
+            first = max(self._high.get(key, 0), stored) + 1
+            self._high[key] = first + count - 1
+            return first
+
+    def observe(self, sheet_name: str, records: List[Dict]):
+        """Raise the marks of a sheet past IDs seen in written or reloaded records"""
+        with self._lock:
+            for (name, id_field), high in self._high.items():
+                if name == sheet_name:
+                    seen = max_id(record.get(id_field) for record in records)
+                    self._high[(name, id_field)] = max(high, seen)
+
+    def forget(self, sheet_name: Optional[str] = None):
+        """Drop the marks of one sheet, or of every sheet, leaving only the stored maximum"""
+        with self._lock:
+            for key in list(self._high):
+                if sheet_name is None or key[0] == sheet_name:
+                    del self._high[key]
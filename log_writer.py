@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+from config import Config
+from storage_backend import StorageBackend, INSERT_CHUNK_SIZE
+from typing import List, Dict, Optional
+
+
+class ActivityLogWriter:
+    """Writes ActivityLogs entries in the background, in batches.
+
+    log() appends the entry to a local journal file and returns at once; a
+    daemon thread gives queued entries their IDs and flushes them every
+    flush_interval seconds. Entries stay in the journal until they are
+    written, so a Sheets outage or a restart does not lose them.
+    """
+
+    def __init__(self, db: StorageBackend, journal_path: Optional[str] = None,
+                 flush_interval: Optional[float] = None, sheet_name: str = 'ActivityLogs'):
+        config = Config()
+        self.db = db
+        self.sheet_name = sheet_name
+        self.journal_path = journal_path or config.ACTIVITY_LOG_JOURNAL
+        self.flush_interval = flush_interval or config.ACTIVITY_LOG_FLUSH_INTERVAL
+        self._lock = threading.Lock()
+        # Serializes flushes so an entry is never written twice
+        self._flush_lock = threading.Lock()
+        self._pending: List[Dict] = self._read_journal()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='activity-log-writer', daemon=True)
+        self._thread.start()
+
+    def _read_journal(self) -> List[Dict]:
+        """Entries left unflushed by a previous run"""
+        if not os.path.exists(self.journal_path):
+            return []
+        entries = []
+        with open(self.journal_path, encoding='utf-8') as journal:
+            for line in journal:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    # A line cut short by a crash mid-write
+                    print(f"Skipping unreadable activity log journal line: {line[:80]}")
+        return entries
+
+    def _write_journal(self, entries: List[Dict]):
+        """Replace the journal with the entries still waiting to be flushed"""
+        temp_path = self.journal_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as journal:
+            for entry in entries:
+                journal.write(json.dumps(entry) + '\n')
+        os.replace(temp_path, self.journal_path)
+
+    def log(self, entry: Dict):
+        """Queue an entry and record it in the journal"""
+        with self._lock:
+            self._pending.append(entry)
+            with open(self.journal_path, 'a', encoding='utf-8') as journal:
+                journal.write(json.dumps(entry) + '\n')
+
+    def pending(self) -> int:
+        """Number of entries not yet written to the sheet"""
+        with self._lock:
+            return len(self._pending)
+
+    def flush(self) -> bool:
+        """Write all queued entries, one insert_many call per INSERT_CHUNK_SIZE entries.
+
+        Each chunk leaves the queue and the journal as soon as it is written,
+        so a failure part way through never writes the earlier chunks twice.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._pending)
+            for start in range(0, len(batch), INSERT_CHUNK_SIZE):
+                chunk = batch[start:start + INSERT_CHUNK_SIZE]
+                # IDs are allocated at write time, on copies: a failed write leaves
+                # the queued entries without IDs, to be allocated afresh next time
+                try:
+                    rows = self.db.with_new_ids(self.sheet_name, chunk)
+                except Exception as e:
+                    print(f"Could not allocate activity log IDs ({e}); will retry")
+                    return False
+                if not self.db.insert_many(self.sheet_name, rows):
+                    print(f"Could not write {len(batch) - start} activity log entries; will retry")
+                    return False
+                with self._lock:
+                    # Entries logged during the write stay queued
+                    self._pending = self._pending[len(chunk):]
+                    self._write_journal(self._pending)
+            return True
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing activity logs: {e}")
+
+    def close(self):
+        """Stop the writer thread and flush what is left"""
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=self.flush_interval + 5)
+        self.flush()
@@ -1,7 +1,7 @@
 """Asset Movements page for Streamlit"""
 import streamlit as st
-import pandas as pd
 from datetime import datetime
+from bulk_moves import parse_asset_codes, plan_moves
 
 def show(db, role):
     """Display asset movements page"""
@@ -11,9 +11,10 @@ def show(db, role):
     # Add movement form
     with st.expander("➕ Record Asset Movement", expanded=False):
         with st.form("add_movement_form"):
-            assets = db.get_all('Assets')
+            master = db.get_many(['Assets', 'Locations'])
+            assets = master['Assets']
             asset_options = {a.get('Asset Code', ''): a.get('Item Name', '') for a in assets}
-            locations = db.get_all('Locations')
+            locations = master['Locations']
             location_names = [l.get('Location Name', '') for l in locations]
             
             col1, col2, col3 = st.columns(3)
@@ -30,9 +31,9 @@ def show(db, role):
             
             if submitted:
                 if asset_code and from_location and to_location:
-                    movement_id = db.get_next_id('AssetMovements')
+                    # The ID is allocated by record_movement
                     movement_data = {
-                        'ID': movement_id,
+                        'ID': '',
                         'Asset Code': asset_code,
                         'From Location': from_location,
                         'To Location': to_location,
@@ -41,9 +42,8 @@ def show(db, role):
                         'Notes': notes or ''
                     }
                     
-                    if db.insert('AssetMovements', movement_data):
-                        # Update asset location
-                        db.update('Assets', 'Asset Code', asset_code, {'Location': to_location})
+                    # Records the movement and updates the asset location together
+                    if db.record_movement(movement_data):
                         st.success("Asset movement recorded successfully!")
                         st.rerun()
                     else:
@@ -51,11 +51,41 @@ def show(db, role):
                 else:
                     st.error("Please fill in all required fields")
     
+    # Bulk movement form
+    with st.expander("📦 Bulk Move Assets", expanded=False):
+        with st.form("bulk_movement_form"):
+            locations = db.get_all('Locations')
+            location_names = [l.get('Location Name', '') for l in locations]
+            
+            codes_text = st.text_area("Asset Codes *", height=200,
+                                      placeholder="Scan barcodes or paste asset codes, one per line or separated by commas")
+            to_location = st.selectbox("To Location *", [""] + location_names, key="bulk_movement_to_location")
+            notes = st.text_area("Notes", key="bulk_movement_notes")
+            
+            submitted = st.form_submit_button("📦 Move Assets", use_container_width=True)
+            
+            if submitted:
+                asset_codes = parse_asset_codes(codes_text)
+                if asset_codes and to_location:
+                    movements, unknown, unchanged = plan_moves(db, asset_codes, to_location,
+                                                               st.session_state.user_id, notes or '')
+                    if unknown:
+                        st.warning(f"Unknown asset codes skipped: {', '.join(unknown)}")
+                    if unchanged:
+                        st.info(f"Already at {to_location}: {', '.join(unchanged)}")
+                    if movements:
+                        # All movement rows and locations are written together
+                        if db.record_movements(movements):
+                            st.success(f"{len(movements)} assets moved to {to_location}")
+                        else:
+                            st.error("Failed to record movements")
+                else:
+                    st.error("Please enter asset codes and a destination")
+    
     # Display movements
-    movements = db.get_all('AssetMovements')
+    df = db.get_frame('AssetMovements')
     
-    if movements:
-        df = pd.DataFrame(movements)
+    if not df.empty:
         st.dataframe(df, use_container_width=True, hide_index=True)
     else:
         st.info("No asset movements recorded yet.")
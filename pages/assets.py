@@ -4,6 +4,7 @@ import pandas as pd
 from datetime import datetime
 import os
 from io import BytesIO
+from asset_import import AssetImporter
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.units import inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
@@ -29,6 +30,10 @@ def show(db, role):
         if st.button("➕ Add Asset", use_container_width=True):
             st.session_state.show_add_asset = True
     
+    # Bulk import, before the asset list is read so imported rows show up
+    with st.expander("📥 Import Assets from CSV/XLSX", expanded=False):
+        import_assets_form(db)
+    
     # Get assets
     assets = db.get_all('Assets')
     
@@ -133,26 +138,29 @@ def add_asset_form(db):
         if document_file:
             st.session_state.asset_document_file = document_file
     
+    # Master data for the dropdowns, loaded in one request
+    master = db.get_many(['Categories', 'Subcategories', 'Brands', 'Locations'])
+    
     # Form with all input fields
     with st.form("add_asset_form", clear_on_submit=True):
         col1, col2 = st.columns(2)
         
         with col1:
             item_name = st.text_input("Item Name *", key="asset_item_name")
-            categories = db.get_all('Categories')
+            categories = master['Categories']
             category_names = [c.get('Category Name', '') for c in categories]
             asset_category = st.selectbox("Asset Category *", [""] + category_names, key="asset_category_select")
-            subcategories = db.get_all('Subcategories')
+            subcategories = master['Subcategories']
             subcategory_names = [s.get('Subcategory Name', '') for s in subcategories]
             asset_subcategory = st.selectbox("Asset Subcategory", [""] + subcategory_names, key="asset_subcategory_select")
-            brands = db.get_all('Brands')
+            brands = master['Brands']
             brand_names = [b.get('Brand Name', '') for b in brands]
             brand = st.selectbox("Brand", [""] + brand_names, key="asset_brand_select")
             asset_description = st.text_area("Asset Description", key="asset_description_text")
         
         with col2:
             amount = st.number_input("Amount", min_value=0.0, step=0.01, key="asset_amount_input")
-            locations = db.get_all('Locations')
+            locations = master['Locations']
             location_names = [l.get('Location Name', '') for l in locations]
             location = st.selectbox("Location", [""] + location_names, key="asset_location_select")
             date_of_purchase = st.date_input("Date of Purchase", key="asset_date_input")
@@ -207,6 +215,36 @@ def add_asset_form(db):
             else:
                 st.error("Please fill in required fields (Item Name and Category)")
 
+def import_assets_form(db):
+    """Upload a CSV or XLSX file and import its rows with a progress bar"""
+    uploaded = st.file_uploader("CSV or XLSX file", type=['csv', 'xlsx'], key="asset_import_file")
+    st.caption("The first row must hold column headers matching the Assets sheet. Item Name and "
+               "Asset Category are required; rows without an Asset Code get one generated.")
+    
+    if uploaded and st.button("📥 Import", use_container_width=True):
+        progress_bar = st.progress(0.0, text="Starting import...")
+        
+        def progress(result):
+            # The total row count isn't known while streaming, so show rows read so far
+            done = result['imported'] + result['failed']
+            progress_bar.progress(done / max(result['rows'], 1),
+                                  text=f"{result['rows']} rows read, {result['imported']} imported, "
+                                       f"{result['failed']} rejected")
+        
+        try:
+            result = AssetImporter(db, progress).run(uploaded, uploaded.name)
+        except Exception as e:
+            st.error(f"Import stopped: {e}")
+            return
+        
+        progress_bar.progress(1.0, text=f"{result['rows']} rows read, {result['imported']} imported, "
+                                        f"{result['failed']} rejected")
+        if result['imported']:
+            st.success(f"Imported {result['imported']} assets")
+        if result['errors']:
+            st.warning(f"{result['failed']} rows were rejected")
+            st.dataframe(pd.DataFrame(result['errors']), use_container_width=True, hide_index=True)
+
 def generate_barcode_pdf(assets):
     """Generate PDF with barcodes for selected assets"""
     if not BARCODE_AVAILABLE:
@@ -8,8 +8,8 @@ def show(db, role):
     st.markdown('<h1 class="main-header">Dashboard</h1>', unsafe_allow_html=True)
     st.markdown('<p class="sub-header">Overview of your asset management system</p>', unsafe_allow_html=True)
     
-    # Get assets
-    assets = db.get_all('Assets')
+    # Get assets (only the columns the metrics and charts use)
+    assets = db.get_all('Assets', columns=['Asset Category', 'Location', 'Asset Status', 'Brand', 'Amount'])
     
     # Summary metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -22,10 +22,10 @@ def show(db, role):
         st.metric("Total Asset Value", f"${total_value:,.2f}")
     
     with col3:
-        st.metric("Categories", len(db.get_all('Categories')))
+        st.metric("Categories", len(db.get_all('Categories', columns=['ID'])))
     
     with col4:
-        st.metric("Locations", len(db.get_all('Locations')))
+        st.metric("Locations", len(db.get_all('Locations', columns=['ID'])))
     
     st.markdown("---")
     
@@ -1,9 +1,6 @@
 """Movement Report page for Streamlit"""
 import streamlit as st
-import pandas as pd
-from io import BytesIO
-from openpyxl import Workbook
-from datetime import datetime
+from streamlit_reports import load_report, show_report
 
 def show(db, role):
     """Display movement report page"""
@@ -14,60 +11,20 @@ def show(db, role):
     with st.expander("🔍 Filters", expanded=False):
         col1, col2 = st.columns(2)
         with col1:
-            date_from = st.date_input("Date From")
+            date_from = st.date_input("Date From", value=None)
         with col2:
-            date_to = st.date_input("Date To")
+            date_to = st.date_input("Date To", value=None)
         
         user_filter = st.text_input("User", placeholder="Filter by user...")
     
-    # Get movements
-    movements = db.get_all('AssetMovements')
-    
-    # Filter
-    if date_from:
-        movements = [m for m in movements if m.get('Movement Date', '') >= date_from.strftime('%Y-%m-%d')]
-    if date_to:
-        movements = [m for m in movements if m.get('Movement Date', '') <= date_to.strftime('%Y-%m-%d')]
-    if user_filter:
-        movements = [m for m in movements if user_filter.lower() in m.get('Moved By', '').lower()]
+    params = {
+        'date_from': date_from.strftime('%Y-%m-%d') if date_from else '',
+        'date_to': date_to.strftime('%Y-%m-%d') if date_to else '',
+        'user': user_filter
+    }
+    result = load_report(db, 'movements', params, key="movement_report")
     
     # Summary
-    st.metric("Total Movements", len(movements))
-    
-    # Display table
-    if movements:
-        df = pd.DataFrame(movements)
-        st.dataframe(df, use_container_width=True, hide_index=True)
-        
-        # Export button
-        if st.button("📥 Export to Excel"):
-            excel_buffer = create_excel_export(movements)
-            st.download_button(
-                label="Download Excel File",
-                data=excel_buffer,
-                file_name=f"movement_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
-    else:
-        st.info("No movements found matching the filters.")
-
-def create_excel_export(movements):
-    """Create Excel export"""
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Movement Report"
+    st.metric("Total Movements", len(result.rows))
     
-    if movements:
-        headers = list(movements[0].keys())
-        ws.append(headers)
-        
-        for movement in movements:
-            row = [movement.get(header, '') for header in headers]
-            ws.append(row)
-    
-    output = BytesIO()
-    wb.save(output)
-    output.seek(0)
-    return output
-
-
+    show_report(result, key="movement_report")
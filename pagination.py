@@ -0,0 +1,94 @@
+"""Server-side sorting and offset/limit pagination of record lists"""
+from typing import Dict, List, Optional
+
+PER_PAGE_CHOICES = [25, 50, 100, 250]
+DEFAULT_PER_PAGE = 50
+
+
+def _int_arg(args, name: str, default: int) -> int:
+    try:
+        return int(args.get(name) or default)
+    except (TypeError, ValueError):
+        return default
+
+
+def sort_key(field: str):
+    """Sort key for a field: numbers in numeric order before text, text case-insensitively"""
+    def key(row: Dict):
+        value = row.get(field, '')
+        if isinstance(value, (int, float)):
+            return (0, value, '')
+        text = str(value).strip()
+        try:
+            return (0, float(text.replace(',', '')), '')
+        except ValueError:
+            return (1, 0, text.lower())
+    return key
+
+
+class Page:
+    """One page of a sorted record list, with what the templates need to link to others"""
+
+    def __init__(self, items: List[Dict], page: int, per_page: int, total: int,
+                 sort: str, order: str):
+        self.items = items
+        self.page = page
+        self.per_page = per_page
+        self.total = total
+        self.sort = sort
+        self.order = order
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.per_page))
+
+    @property
+    def offset(self) -> int:
+        return (self.page - 1) * self.per_page
+
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self.page < self.pages
+
+    def window(self, size: int = 2) -> List[Optional[int]]:
+        """Page numbers to link, with None where a run of pages is left out"""
+        shown = sorted({1, self.pages} | set(range(max(1, self.page - size), min(self.pages, self.page + size) + 1)))
+        numbers = []
+        for number in shown:
+            if numbers and number - numbers[-1] > 1:
+                numbers.append(None)
+            numbers.append(number)
+        return numbers
+
+    def to_dict(self) -> Dict:
+        return {'items': self.items, 'page': self.page, 'per_page': self.per_page,
+                'total': self.total, 'pages': self.pages, 'sort': self.sort, 'order': self.order}
+
+
+def paginate(rows: List[Dict], args, sortable: List[str], default_sort: str = '',
+             default_order: str = 'asc') -> Page:
+    """Sort rows by ?sort= (one of sortable) and ?order=, then cut out ?page= of ?per_page= rows.
+
+    rows is not modified. Without a sort the rows keep their given order.
+    """
+    sort = args.get('sort', '')
+    if sort not in sortable:
+        sort = default_sort
+    order = args.get('order', '')
+    if order not in ('asc', 'desc'):
+        order = default_order
+    per_page = _int_arg(args, 'per_page', DEFAULT_PER_PAGE)
+    if per_page not in PER_PAGE_CHOICES:
+        per_page = DEFAULT_PER_PAGE
+
+    if sort:
+        rows = sorted(rows, key=sort_key(sort), reverse=order == 'desc')
+    total = len(rows)
+    pages = max(1, -(-total // per_page))
+    page = min(max(1, _int_arg(args, 'page', 1)), pages)
+    start = (page - 1) * per_page
+    return Page(rows[start:start + per_page], page, per_page, total, sort, order)
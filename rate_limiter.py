@@ -0,0 +1,124 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Optional
+import requests
+from config import Config
+
+# HTTP statuses worth retrying: quota exhausted and transient server errors
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+
+
+def is_rate_limited(error: Exception) -> bool:
+    """True if an API error reports an exhausted quota"""
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    message = str(error)
+    return status == 429 or 'RATE_LIMIT_EXCEEDED' in message or 'Quota exceeded' in message
+
+
+def is_retryable(error: Exception) -> bool:
+    """True if a failed API call may succeed when repeated"""
+    if is_rate_limited(error):
+        return True
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    status = getattr(getattr(error, 'response', None), 'status_code', None)
+    return status in RETRYABLE_STATUSES
+
+
+class RateLimiter:
+    """Token bucket sized to the per-minute Sheets quota, with retrying calls.
+
+    Each call takes a token; tokens refill evenly across the minute, so a
+    burst of page loads is spread out instead of tripping the quota. When
+    the API still answers 429 the bucket is emptied, so every caller drops
+    to the sustained quota rate, and the call is retried with jittered
+    exponential backoff.
+    """
+
+    def __init__(self, requests_per_minute: float, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 32.0):
+        self.capacity = max(requests_per_minute, 1)
+        self.rate = self.capacity / 60.0
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._metrics = {'calls': 0, 'throttled': 0, 'retries': 0, 'failures': 0,
+                         'waits': 0, 'wait_seconds': 0.0}
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        """Block until a request token is available"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    if waited:
+                        self._metrics['waits'] += 1
+                        self._metrics['wait_seconds'] += waited
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def _throttled(self):
+        """Empty the bucket after a 429 so all callers slow down together"""
+        with self._lock:
+            self._metrics['throttled'] += 1
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0)
+
+    def call(self, func: Callable, *args, retry_if: Callable = is_retryable, **kwargs):
+        """Run one API call under the limiter, retrying failures that retry_if accepts
+
+        Calls that are not safe to repeat (appends, row deletes) should pass
+        retry_if=is_rate_limited: a rejected 429 request was never applied.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            with self._lock:
+                self._metrics['calls'] += 1
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                if is_rate_limited(e):
+                    self._throttled()
+                if not retry_if(e) or attempt == self.max_retries:
+                    with self._lock:
+                        self._metrics['failures'] += 1
+                    raise
+                delay = min(self.max_delay, self.base_delay * 2 ** attempt)
+                delay += random.uniform(0, delay)
+                with self._lock:
+                    self._metrics['retries'] += 1
+                print(f"Sheets API call failed ({e}); retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    def metrics(self) -> Dict:
+        """Counters for calls, throttles, retries, failures and token waits"""
+        with self._lock:
+            self._refill(time.monotonic())
+            return dict(self._metrics, tokens=round(self._tokens, 2),
+                        requests_per_minute=self.capacity)
+
+
+_shared: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+
+
+def shared_limiter() -> RateLimiter:
+    """The process-wide limiter; the Sheets quota is shared by every connection"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            config = Config()
+            _shared = RateLimiter(config.SHEETS_REQUESTS_PER_MINUTE, config.SHEETS_MAX_RETRIES)
+        return _shared
@@ -0,0 +1,462 @@
+"""Declarative report definitions and the engine that runs and renders them.
+
+Each report is defined once: the sheets it reads, the filters it accepts
+as request parameters, the fields it computes and the columns it outputs.
+run_report produces a ReportResult that the Flask templates, the
+Streamlit pages and the file renderers all work from, and keeps it for a
+short while so an export reuses the result the page just showed.
+"""
+import csv
+import io
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+import pandas as pd
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter, landscape
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+from config import Config
+from storage_backend import StorageBackend
+from xlsx_export import write_xlsx, XLSX_MIMETYPE, SPOOL_MAX_SIZE
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    PARQUET_AVAILABLE = False
+
+# Results kept for reuse by exports
+REPORT_CACHE_SIZE = 32
+# Rows encoded per chunk of a streamed CSV download
+CSV_STREAM_ROWS = 1000
+
+
+class Filter:
+    """A report filter read from one request parameter.
+
+    match is 'equals', 'search' (case-insensitive substring of any of
+    fields), 'from' (field >= value) or 'to' (field <= value).
+    """
+
+    def __init__(self, param: str, field: str = '', match: str = 'equals',
+                 fields: Optional[List[str]] = None):
+        self.param = param
+        self.field = field
+        self.match = match
+        self.fields = fields or [field]
+
+    def accepts(self, row: Dict, value: str) -> bool:
+        if self.match == 'search':
+            text = ' '.join(str(row.get(f, '')) for f in self.fields).lower()
+            return value.lower() in text
+        field_value = row.get(self.field, '')
+        if self.match == 'from':
+            return field_value >= value
+        if self.match == 'to':
+            return field_value <= value
+        return field_value == value
+
+
+class Column:
+    """An output column: a row field, optionally formatted, optionally totalled"""
+
+    def __init__(self, label: str, field: str, format: Optional[Callable[[Any], Any]] = None,
+                 total: bool = False):
+        self.label = label
+        self.field = field
+        self.format = format
+        self.total = total
+
+    def value(self, row: Dict):
+        value = row.get(self.field, '')
+        return self.format(value) if self.format else value
+
+
+class Report:
+    """Definition of one report"""
+
+    def __init__(self, name: str, title: str, filename: str, sheets: List[str],
+                 columns: List[Column], filters: List[Filter],
+                 rows: Optional[Callable[[Dict[str, List[Dict]]], List[Dict]]] = None,
+                 sheet_columns: Optional[Dict[str, List[str]]] = None,
+                 prepare: Optional[Callable[[Dict[str, List[Dict]]], Any]] = None,
+                 compute: Optional[Callable[[Dict, Any], None]] = None,
+                 sort_by: Optional[str] = None, descending: bool = False):
+        self.name = name
+        self.title = title
+        self.filename = filename
+        # All sheets read in one go; the first is the row source unless rows is given
+        self.sheets = sheets
+        self.columns = columns
+        self.filters = filters
+        self.rows = rows or (lambda data: data[sheets[0]])
+        # Sheets read with column projection instead of in full
+        self.sheet_columns = sheet_columns or {}
+        # prepare builds lookups once per run; compute adds fields to each kept row
+        self.prepare = prepare
+        self.compute = compute
+        self.sort_by = sort_by
+        self.descending = descending
+
+    def params(self, args) -> Tuple[Tuple[str, str], ...]:
+        """The filter values this report uses from a request's parameters"""
+        return tuple((f.param, (args.get(f.param) or '').strip()) for f in self.filters)
+
+
+class ReportResult:
+    """The rows of one report run, with the data it was built from"""
+
+    def __init__(self, report: Report, params: Tuple[Tuple[str, str], ...], rows: List[Dict],
+                 source_rows: List[Dict], data: Dict[str, List[Dict]]):
+        self.report = report
+        self.params = dict(params)
+        self.rows = rows
+        self.source_rows = source_rows
+        self.data = data
+        self.created_at = time.monotonic()
+
+    def headers(self) -> List[str]:
+        return [c.label for c in self.report.columns]
+
+    def values(self) -> Iterator[List]:
+        """Output rows, formatted per column"""
+        columns = self.report.columns
+        for row in self.rows:
+            yield [c.value(row) for c in columns]
+
+    def total(self, field: str) -> float:
+        return sum(row.get(field, 0) or 0 for row in self.rows)
+
+    def totals(self) -> Optional[List]:
+        """A totals row for the totalled columns, labelled in the column before the first"""
+        columns = self.report.columns
+        if not self.rows or not any(c.total for c in columns):
+            return None
+        totals = [c.value({c.field: self.total(c.field)}) if c.total else '' for c in columns]
+        first = next(i for i, c in enumerate(columns) if c.total)
+        if first:
+            totals[first - 1] = 'TOTALS:'
+        return totals
+
+    def distinct(self, field: str) -> List[str]:
+        """Sorted non-empty values of a field across the unfiltered rows"""
+        return sorted({row.get(field, '') for row in self.source_rows if row.get(field, '')})
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(list(self.values()), columns=self.headers())
+
+
+def _fetch(db: StorageBackend, report: Report) -> Dict[str, List[Dict]]:
+    """Read a report's sheets, fully or projected"""
+    full = [s for s in report.sheets if s not in report.sheet_columns]
+    data = db.get_many(full) if full else {}
+    for sheet_name, columns in report.sheet_columns.items():
+        data[sheet_name] = db.get_all(sheet_name, columns=columns)
+    return data
+
+
+def _build(db: StorageBackend, report: Report, params: Tuple[Tuple[str, str], ...]) -> ReportResult:
+    data = _fetch(db, report)
+    source_rows = report.rows(data)
+    active = [(f, value) for f, (_, value) in zip(report.filters, params) if value]
+    rows = [row for row in source_rows if all(f.accepts(row, value) for f, value in active)]
+    if report.compute:
+        context = report.prepare(data) if report.prepare else None
+        # Copies, so the cached source records are never modified
+        rows = [dict(row) for row in rows]
+        for row in rows:
+            report.compute(row, context)
+    if report.sort_by:
+        rows.sort(key=lambda r: r.get(report.sort_by, ''), reverse=report.descending)
+    return ReportResult(report, params, rows, source_rows, data)
+
+
+_results: 'OrderedDict[tuple, ReportResult]' = OrderedDict()
+_results_lock = threading.Lock()
+
+
+def run_report(db: StorageBackend, name: str, args, refresh: bool = False) -> ReportResult:
+    """Run a report with the filters in args (a dict or request.args).
+
+    A result from the last REPORT_CACHE_TTL seconds with the same filters
+    is reused unless refresh is set; pages refresh, exports reuse.
+    """
+    report = REPORTS[name]
+    params = report.params(args)
+    key = (id(db), name, params)
+    if not refresh:
+        with _results_lock:
+            result = _results.get(key)
+        if result is not None and time.monotonic() - result.created_at <= Config.REPORT_CACHE_TTL:
+            return result
+    result = _build(db, report, params)
+    with _results_lock:
+        _results[key] = result
+        _results.move_to_end(key)
+        while len(_results) > REPORT_CACHE_SIZE:
+            _results.popitem(last=False)
+    return result
+
+
+# Renderers
+
+def render_xlsx(result: ReportResult):
+    return write_xlsx(result.report.title, result.headers(), result.values(), result.totals())
+
+
+def iter_csv(result: ReportResult) -> Iterator[bytes]:
+    """CSV output in chunks of CSV_STREAM_ROWS rows, for streaming responses"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def take() -> bytes:
+        text = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return text.encode('utf-8')
+
+    # Byte order mark so Excel opens non-ASCII text correctly
+    yield '\ufeff'.encode('utf-8')
+    writer.writerow(result.headers())
+    for i, row in enumerate(result.values(), start=1):
+        writer.writerow(row)
+        if i % CSV_STREAM_ROWS == 0:
+            yield take()
+    totals = result.totals()
+    if totals:
+        writer.writerow(totals)
+    yield take()
+
+
+def render_csv(result: ReportResult):
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    for chunk in iter_csv(result):
+        output.write(chunk)
+    output.seek(0)
+    return output
+
+
+def _parquet_column(values: List) -> 'pa.Array':
+    """A typed column where the values allow it, text otherwise.
+
+    Blank cells in otherwise numeric columns become nulls.
+    """
+    for candidate in (values, [None if v == '' else v for v in values]):
+        try:
+            column = pa.array(candidate)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            continue
+        if not pa.types.is_null(column.type):
+            return column
+    return pa.array(['' if v is None else str(v) for v in values], type=pa.string())
+
+
+def render_parquet(result: ReportResult):
+    """Columnar, compressed output of the rows only, without a totals row"""
+    columns = list(zip(*result.values())) or [()] * len(result.headers())
+    table = pa.table([_parquet_column(list(values)) for values in columns], names=result.headers())
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    pq.write_table(table, output, compression='snappy')
+    output.seek(0)
+    return output
+
+
+def render_pdf(result: ReportResult):
+    output = io.BytesIO()
+    doc = SimpleDocTemplate(output, pagesize=landscape(letter), title=result.report.title,
+                            leftMargin=24, rightMargin=24, topMargin=24, bottomMargin=24)
+    styles = getSampleStyleSheet()
+    filters = ', '.join(f"{k}: {v}" for k, v in result.params.items() if v)
+    story = [Paragraph(result.report.title, styles['Title']),
+             Paragraph(f"Generated {datetime.now().strftime('%Y-%m-%d %H:%M')} - {len(result.rows)} rows"
+                       + (f" - {filters}" if filters else ''), styles['Normal']),
+             Spacer(1, 12)]
+    table_rows = [result.headers()] + [[str(v) for v in row] for row in result.values()]
+    totals = result.totals()
+    if totals:
+        table_rows.append([str(v) for v in totals])
+    table = Table(table_rows, repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#366092')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+    ] + ([('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold')] if totals else [])))
+    story.append(table)
+    doc.build(story)
+    output.seek(0)
+    return output
+
+
+# Export format -> (renderer, mimetype)
+REPORT_FORMATS = {
+    'xlsx': (render_xlsx, XLSX_MIMETYPE),
+    'csv': (render_csv, 'text/csv'),
+    'pdf': (render_pdf, 'application/pdf'),
+}
+if PARQUET_AVAILABLE:
+    REPORT_FORMATS['parquet'] = (render_parquet, 'application/vnd.apache.parquet')
+
+
+def export_file(result: ReportResult, fmt: str):
+    """Render a result in an export format; returns (file, mimetype, download filename)"""
+    renderer, mimetype = REPORT_FORMATS[fmt]
+    return renderer(result), mimetype, export_filename(result, fmt)
+
+
+def export_filename(result: ReportResult, fmt: str) -> str:
+    return f"{result.report.filename}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{fmt}"
+
+
+# Report definitions
+
+def _parse_date(text: str):
+    for fmt in ['%Y-%m-%d', '%d/%m/%Y', '%m/%d/%Y', '%Y/%m/%d', '%d-%m-%Y', '%m-%d-%Y']:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _depreciation_rates(data: Dict[str, List[Dict]]) -> Dict[str, float]:
+    """Depreciation percentage per Asset Type name"""
+    rates = {}
+    for asset_type in data['AssetTypes']:
+        try:
+            rates[asset_type.get('Asset Type', '')] = float(asset_type.get('Depreciation Value (%)', '') or 0)
+        except (ValueError, TypeError):
+            rates[asset_type.get('Asset Type', '')] = 0
+    return rates
+
+
+def _compute_depreciation(asset: Dict, rates: Dict[str, float]):
+    """Add straight-line depreciation fields to an asset row"""
+    try:
+        purchase_amount = float(asset.get('Amount', '').strip() or 0)
+    except (ValueError, TypeError):
+        purchase_amount = 0
+
+    age_years = 0
+    purchase_date = _parse_date(asset.get('Date of Purchase', '').strip())
+    if purchase_date:
+        age_years = max(0, (datetime.now().date() - purchase_date).days / 365.25)
+
+    # Match by Asset Type if the asset has one, otherwise by category
+    depreciation_percent = rates.get(asset.get('Asset Type', '') or asset.get('Asset Category', ''), 0)
+
+    annual_depreciation = 0
+    total_depreciation = 0
+    current_value = purchase_amount
+    if purchase_amount > 0 and depreciation_percent > 0 and age_years > 0:
+        annual_depreciation = purchase_amount * (depreciation_percent / 100)
+        total_depreciation = annual_depreciation * age_years
+        current_value = max(0, purchase_amount - total_depreciation)
+
+    asset['purchase_amount'] = purchase_amount
+    asset['depreciation_percent'] = depreciation_percent
+    asset['age_years'] = age_years
+    asset['annual_depreciation'] = annual_depreciation
+    asset['total_depreciation'] = total_depreciation
+    asset['current_value'] = current_value
+
+
+def _log_rows(data: Dict[str, List[Dict]]) -> List[Dict]:
+    """Activity log entries and asset movements as one list of log rows"""
+    logs = []
+    for entry in data['ActivityLogs']:
+        logs.append({
+            'type': entry.get('Type', 'Activity'),
+            'date': entry.get('Date & Time', ''),
+            'user': entry.get('User', ''),
+            'description': entry.get('Description', ''),
+            'details': entry.get('Details', ''),
+            'action': entry.get('Action', ''),
+            'entity_type': entry.get('Entity Type', ''),
+            'entity_id': entry.get('Entity ID', '')
+        })
+    for movement in data['AssetMovements']:
+        logs.append({
+            'type': 'Movement',
+            'date': movement.get('Movement Date', ''),
+            'user': movement.get('Moved By', ''),
+            'description': f"Asset {movement.get('Asset Code', '')} moved from {movement.get('From Location', '')} to {movement.get('To Location', '')}",
+            'details': movement.get('Notes', ''),
+            'action': 'Move',
+            'entity_type': 'Asset',
+            'entity_id': movement.get('Asset Code', '')
+        })
+    return logs
+
+
+def _rounded(value):
+    return round(value, 2) if value else ''
+
+
+# Asset columns read by the depreciation report (Asset Code is always included)
+DEPRECIATION_ASSET_COLUMNS = ['Item Name', 'Asset Category', 'Asset Type', 'Location',
+                              'Asset Status', 'Amount', 'Date of Purchase']
+
+REPORTS = {report.name: report for report in [
+    Report(
+        'assets', 'Asset Report', 'asset_report',
+        sheets=['Assets', 'Categories', 'Locations'],
+        filters=[Filter('category', 'Asset Category'), Filter('location', 'Location'),
+                 Filter('department', 'Department'), Filter('status', 'Asset Status'),
+                 Filter('search', match='search', fields=['Asset Code', 'Item Name', 'Brand'])],
+        columns=[Column('Asset Code', 'Asset Code'), Column('Item Name', 'Item Name'),
+                 Column('Category', 'Asset Category'), Column('Subcategory', 'Asset SubCategory'),
+                 Column('Brand', 'Brand'), Column('Description', 'Asset Description'),
+                 Column('Amount', 'Amount'), Column('Location', 'Location'),
+                 Column('Date of Purchase', 'Date of Purchase'), Column('Warranty', 'Warranty'),
+                 Column('Department', 'Department'), Column('Ownership', 'Ownership'),
+                 Column('Status', 'Asset Status')]
+    ),
+    Report(
+        'movements', 'Movement Report', 'movement_report',
+        sheets=['AssetMovements', 'Assets', 'Locations'],
+        filters=[Filter('asset_code', 'Asset Code'), Filter('from_location', 'From Location'),
+                 Filter('to_location', 'To Location'), Filter('moved_by', 'Moved By'),
+                 Filter('date_from', 'Movement Date', 'from'), Filter('date_to', 'Movement Date', 'to'),
+                 Filter('user', match='search', fields=['Moved By'])],
+        sort_by='Movement Date', descending=True,
+        columns=[Column('ID', 'ID'), Column('Date & Time', 'Movement Date'),
+                 Column('Asset Code', 'Asset Code'), Column('From Location', 'From Location'),
+                 Column('To Location', 'To Location'), Column('Moved By', 'Moved By'),
+                 Column('Notes', 'Notes')]
+    ),
+    Report(
+        'depreciation', 'Depreciation Report', 'depreciation_report',
+        sheets=['Assets', 'AssetTypes', 'Categories', 'Locations'],
+        sheet_columns={'Assets': DEPRECIATION_ASSET_COLUMNS},
+        filters=[Filter('category', 'Asset Category'), Filter('location', 'Location'),
+                 Filter('status', 'Asset Status')],
+        prepare=_depreciation_rates, compute=_compute_depreciation,
+        columns=[Column('Asset Code', 'Asset Code'), Column('Item Name', 'Item Name'),
+                 Column('Category', 'Asset Category'), Column('Location', 'Location'),
+                 Column('Purchase Date', 'Date of Purchase'),
+                 Column('Age (Years)', 'age_years', _rounded),
+                 Column('Purchase Amount', 'purchase_amount', _rounded, total=True),
+                 Column('Depreciation %', 'depreciation_percent', lambda v: f"{v}%" if v else ''),
+                 Column('Annual Depreciation', 'annual_depreciation', _rounded, total=True),
+                 Column('Total Depreciation', 'total_depreciation', _rounded, total=True),
+                 Column('Current Book Value', 'current_value', lambda v: round(v, 2), total=True),
+                 Column('Status', 'Asset Status')]
+    ),
+    Report(
+        'logs', 'Activity Logs', 'activity_logs',
+        sheets=['ActivityLogs', 'AssetMovements'], rows=_log_rows,
+        filters=[Filter('type', 'type'), Filter('user', 'user'),
+                 Filter('date_from', 'date', 'from'), Filter('date_to', 'date', 'to')],
+        sort_by='date', descending=True,
+        columns=[Column('Date & Time', 'date'), Column('Type', 'type'), Column('User', 'user'),
+                 Column('Action', 'action'), Column('Description', 'description'),
+                 Column('Details', 'details')]
+    ),
+]}
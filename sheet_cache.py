@@ -0,0 +1,298 @@
+import re
+import threading
+import time
+import pandas as pd
+from typing import List, Dict, Optional, Tuple
+
+
+class SheetTable:
+    """Parsed records of one worksheet plus the sheet row each came from.
+
+    Values are stored column by column rather than as one dict per row;
+    dict records are only built when asked for. Keeps an index from
+    primary-key value to record position so lookups, updates and deletes
+    find their row without scanning the sheet.
+    """
+
+    def __init__(self, headers: List[str], data: Dict[str, List[str]], rows: List[int],
+                 key_field: str, last_row: int):
+        self.headers = headers
+        # Header -> 1-based column number (first occurrence wins)
+        self.columns: Dict[str, int] = {}
+        for col_idx, header in enumerate(headers, start=1):
+            self.columns.setdefault(header, col_idx)
+        self.key_field = key_field
+        self.last_row = last_row
+        # Record field -> column values, one entry per record
+        self._data = data
+        self._rows = rows
+        self._index: Dict[str, int] = {}
+        self._rebuild_index()
+
+    def _rebuild_index(self):
+        self._index = {}
+        keys = self._data.get(self.key_field, [None] * len(self._rows))
+        for pos, key in enumerate(keys):
+            self._index.setdefault(str(key), pos)
+
+    def __len__(self):
+        return len(self._rows)
+
+    def records(self) -> List[Dict]:
+        """All records as dicts, in sheet order"""
+        return column_records(self._data)
+
+    def record(self, pos: int) -> Dict:
+        """The record at a position, as a dict"""
+        return {field: values[pos] for field, values in self._data.items()}
+
+    def fields(self) -> List[str]:
+        """Record field names, in column order"""
+        return list(self._data)
+
+    def column(self, header: str) -> List[str]:
+        """Values of one column, in sheet order"""
+        if header not in self._data:
+            return [''] * len(self._rows)
+        return list(self._data[header])
+
+    def data(self) -> Dict[str, List[str]]:
+        """Copies of all columns, keyed by field"""
+        return {field: list(values) for field, values in self._data.items()}
+
+    def frame(self) -> pd.DataFrame:
+        """All records as a DataFrame, one column per field"""
+        return pd.DataFrame(self.data(), columns=list(self._data))
+
+    def row_number(self, pos: int) -> int:
+        """Sheet row number (1-based, header is row 1) of a record"""
+        return self._rows[pos]
+
+    def find(self, id_field: str, id_value) -> Optional[int]:
+        """Position of the first record whose id_field equals id_value"""
+        if id_field == self.key_field:
+            return self._index.get(str(id_value))
+        for pos, value in enumerate(self._data.get(id_field, [])):
+            if str(value) == str(id_value):
+                return pos
+        return None
+
+    def append(self, record: Dict, row_number: Optional[int] = None):
+        """Add a record written to the end of the sheet"""
+        row_number = row_number or self.last_row + 1
+        self.last_row = max(self.last_row, row_number)
+        if not any(record.values()):
+            return
+        for field, values in self._data.items():
+            values.append(record.get(field, ''))
+        self._rows.append(row_number)
+        self._index.setdefault(str(record.get(self.key_field)), len(self._rows) - 1)
+
+    def extend(self, values: List[List[str]]) -> List[Dict]:
+        """Add rows read from directly below the last known row; returns the new records"""
+        # Trailing blank rows are not data the sheet returned
+        while values and not any(values[-1]):
+            values = values[:-1]
+        first_row = self.last_row + 1
+        new_rows = parse_table([self.headers] + values, self.key_field)
+        for pos in range(len(new_rows)):
+            self.append(new_rows.record(pos), first_row + new_rows.row_number(pos) - 2)
+        self.last_row = max(self.last_row, first_row + len(values) - 1)
+        return new_rows.records()
+
+    def patch(self, pos: int, data: Dict):
+        """Apply updated values to the record at a position"""
+        key_values = self._data.get(self.key_field)
+        old_key = str(key_values[pos]) if key_values is not None else None
+        for header, value in data.items():
+            if header in self._data:
+                self._data[header][pos] = cell_text(value)
+        if key_values is not None and str(key_values[pos]) != old_key:
+            self._rebuild_index()
+
+    def remove(self, pos: int):
+        """Drop the record at a position; rows below it move up by one"""
+        deleted_row = self._rows[pos]
+        for values in self._data.values():
+            del values[pos]
+        del self._rows[pos]
+        self._rows = [row - 1 if row > deleted_row else row for row in self._rows]
+        self.last_row -= 1
+        self._rebuild_index()
+
+
+class SheetCache:
+    """In-process cache of SheetTables per sheet, with a time-to-live.
+
+    Writes made through the app patch the cached table so it stays
+    current; the TTL bounds how long changes made directly in the
+    spreadsheet can go unnoticed. A TTL of 0 disables caching.
+
+    Expired tables of the sheets in retain are kept rather than dropped,
+    so append-only sheets can be topped up with their new rows instead of
+    being downloaded again; full_sync_interval bounds how long such a
+    table goes without a full reload.
+
+    Column projections read without the full table are cached too, per
+    (sheet, fields), with the same TTL; any write to the sheet drops them.
+    """
+
+    def __init__(self, ttl: float, retain=(), full_sync_interval: float = 0):
+        self.ttl = ttl
+        self.retain = set(retain)
+        self.full_sync_interval = full_sync_interval
+        self._entries: Dict[str, Dict] = {}
+        # (sheet name, fields) -> {'loaded_at', 'data'}
+        self._projections: Dict[Tuple[str, Tuple[str, ...]], Dict] = {}
+        self.lock = threading.RLock()
+
+    def get(self, sheet_name: str) -> Optional[SheetTable]:
+        """Return the cached table, or None if missing or expired"""
+        with self.lock:
+            entry = self._entries.get(sheet_name)
+            if entry is None:
+                return None
+            if time.monotonic() - entry['loaded_at'] > self.ttl:
+                if sheet_name not in self.retain:
+                    del self._entries[sheet_name]
+                return None
+            return entry['table']
+
+    def get_retained(self, sheet_name: str) -> Optional[SheetTable]:
+        """Return a kept table that may be expired, or None if a full reload is due"""
+        with self.lock:
+            entry = self._entries.get(sheet_name)
+            if entry is None or sheet_name not in self.retain:
+                return None
+            if time.monotonic() - entry['full_at'] > self.full_sync_interval:
+                del self._entries[sheet_name]
+                return None
+            return entry['table']
+
+    def peek(self, sheet_name: str) -> Optional[SheetTable]:
+        """Return the table held for a sheet, expired or not"""
+        with self.lock:
+            entry = self._entries.get(sheet_name)
+            return entry['table'] if entry is not None else None
+
+    def put(self, sheet_name: str, table: SheetTable):
+        """Store a freshly loaded table"""
+        if self.ttl <= 0:
+            return
+        with self.lock:
+            now = time.monotonic()
+            self._entries[sheet_name] = {'loaded_at': now, 'full_at': now, 'table': table}
+
+    def expire(self, sheet_name: str):
+        """Treat a table as expired, so a kept one is topped up on its next read"""
+        with self.lock:
+            entry = self._entries.get(sheet_name)
+            if entry is not None:
+                entry['loaded_at'] = float('-inf')
+
+    def touch(self, sheet_name: str):
+        """Mark a kept table as current after topping it up"""
+        with self.lock:
+            entry = self._entries.get(sheet_name)
+            if entry is not None:
+                entry['loaded_at'] = time.monotonic()
+
+    def get_projection(self, sheet_name: str, fields: List[str]) -> Optional[Dict[str, List[str]]]:
+        """Return copies of cached column lists, or None if missing or expired"""
+        with self.lock:
+            entry = self._projections.get((sheet_name, tuple(fields)))
+            if entry is None:
+                return None
+            if time.monotonic() - entry['loaded_at'] > self.ttl:
+                del self._projections[(sheet_name, tuple(fields))]
+                return None
+            return {field: list(values) for field, values in entry['data'].items()}
+
+    def put_projection(self, sheet_name: str, fields: List[str], data: Dict[str, List[str]]):
+        """Store column lists read for some fields of a sheet"""
+        if self.ttl <= 0:
+            return
+        with self.lock:
+            self._projections[(sheet_name, tuple(fields))] = {
+                'loaded_at': time.monotonic(),
+                'data': {field: list(values) for field, values in data.items()},
+            }
+
+    def drop_projections(self, sheet_name: str):
+        """Forget cached projections of a sheet after a write to it"""
+        with self.lock:
+            for key in [key for key in self._projections if key[0] == sheet_name]:
+                del self._projections[key]
+
+    def invalidate(self, sheet_name: Optional[str] = None):
+        """Forget one sheet, or every sheet when no name is given"""
+        with self.lock:
+            if sheet_name is None:
+                self._entries.clear()
+                self._projections.clear()
+            else:
+                self._entries.pop(sheet_name, None)
+                self.drop_projections(sheet_name)
+
+
+def cell_text(value) -> str:
+    """Text a value reads back as from the sheet"""
+    return str(value).strip() if value is not None else ''
+
+
+def build_record(headers: List[str], data: Dict) -> Dict:
+    """Build the record get_all would return for a row written from data"""
+    return {str(h).strip(): cell_text(data.get(h, '')) for h in headers}
+
+
+def parse_table(all_values: List[List[str]], key_field: str) -> SheetTable:
+    """Parse get_all_values() output into a SheetTable"""
+    if not all_values:
+        return SheetTable([], {}, [], key_field, 0)
+
+    headers = list(all_values[0])
+
+    # Later duplicate headers win, as they did for per-row dicts
+    field_columns = {}
+    for col_idx, header in enumerate(headers):
+        field_columns[str(header).strip()] = col_idx
+    col_indexes = list(field_columns.values())
+
+    data: Dict[str, List[str]] = {field: [] for field in field_columns}
+    columns = list(data.values())
+    rows = []
+    for row_number, row in enumerate(all_values[1:], start=2):
+        cells = [str(row[i]).strip() if i < len(row) else '' for i in col_indexes]
+        # Skip rows with no value in any field
+        if not any(cells):
+            continue
+        for values, cell in zip(columns, cells):
+            values.append(cell)
+        rows.append(row_number)
+
+    return SheetTable(headers, data, rows, key_field, len(all_values))
+
+
+def parse_columns(data: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Pad and strip column lists read from a sheet, dropping rows empty in every column"""
+    length = max((len(values) for values in data.values()), default=0)
+    stripped = [[str(v).strip() for v in values] + [''] * (length - len(values))
+                for values in data.values()]
+    keep = [i for i, cells in enumerate(zip(*stripped)) if any(cells)]
+    return {field: [values[i] for i in keep] for field, values in zip(data, stripped)}
+
+
+def column_records(data: Dict[str, List[str]]) -> List[Dict]:
+    """Build one dict per row from column lists"""
+    fields = list(data)
+    return [dict(zip(fields, values)) for values in zip(*data.values())]
+
+
+def appended_row(response) -> Optional[int]:
+    """First row number written by an append call, from its API response"""
+    try:
+        updated_range = response['updates']['updatedRange']
+    except (TypeError, KeyError):
+        return None
+    match = re.search(r'![A-Z]+(\d+)', updated_range)
+    return int(match.group(1)) if match else None
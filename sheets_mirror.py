@@ -0,0 +1,162 @@
+import threading
+from config import Config
+from storage_backend import StorageBackend, SHEET_NAMES
+from sqlite_db import SQLiteDB
+from google_sheets_db import GoogleSheetsDB
+from typing import List, Dict, Optional
+import pandas as pd
+
+
+class MirroredSheetsDB(StorageBackend):
+    """Google Sheets storage served from a local SQLite mirror.
+
+    Reads come from the mirror file, so page loads don't wait on the
+    Google API and a restart starts warm. Writes go to the spreadsheet
+    first and are applied to the mirror when they succeed. A background
+    thread copies all sheets into the mirror every refresh_interval
+    seconds to pick up changes made directly in the spreadsheet. Columns
+    a sheet has beyond SHEET_HEADERS are copied too, so reads return the
+    same fields as GoogleSheetsDB.
+    """
+
+    def __init__(self, source: GoogleSheetsDB, path: Optional[str] = None,
+                 refresh_interval: Optional[float] = None):
+        config = Config()
+        self.source = source
+        self.path = path or config.SHEETS_MIRROR_PATH
+        self.refresh_interval = refresh_interval or config.SHEETS_MIRROR_REFRESH
+        self.mirror = SQLiteDB(self.path)
+        self._lock = threading.RLock()
+        # Writes per sheet, so a refresh never overwrites a newer local write
+        self._writes: Dict[str, int] = {}
+        self._stop = threading.Event()
+        self._thread = None
+        # A mirror left by a previous run is served straight away
+        if not any(self.mirror.get_all(sheet_name, columns=[]) for sheet_name in SHEET_NAMES):
+            self.refresh()
+        self.start()
+
+    @property
+    def connected(self):
+        return self.source.connected
+
+    @property
+    def error(self):
+        return self.source.error
+
+    def start(self):
+        """Start the background refresher thread"""
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._refresh_loop, name='sheets-mirror', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background refresher thread"""
+        self._stop.set()
+
+    def _refresh_loop(self):
+        while not self._stop.wait(self.refresh_interval):
+            self.refresh()
+
+    def refresh(self) -> bool:
+        """Copy every sheet from the spreadsheet into the mirror"""
+        try:
+            with self._lock:
+                writes = dict(self._writes)
+            data = self.source.fetch_many(SHEET_NAMES)
+            with self._lock:
+                # Skip sheets written while the copy was being read; the next refresh catches up
+                fresh = {sheet_name: records for sheet_name, records in data.items()
+                         if self._writes.get(sheet_name, 0) == writes.get(sheet_name, 0)}
+                self.mirror.replace_all(fresh)
+            return True
+        except Exception as e:
+            print(f"Error refreshing sheets mirror: {e}")
+            return False
+
+    def _written(self, sheet_name: str):
+        self._writes[sheet_name] = self._writes.get(sheet_name, 0) + 1
+
+    def get_all(self, sheet_name: str, columns: Optional[List[str]] = None) -> List[Dict]:
+        """Get all records from the mirror"""
+        return self.mirror.get_all(sheet_name, columns)
+
+    def get_columns(self, sheet_name: str, columns: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Get all records of a sheet from the mirror as column lists"""
+        return self.mirror.get_columns(sheet_name, columns)
+
+    def get_frame(self, sheet_name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get all records of a sheet from the mirror as a DataFrame"""
+        return self.mirror.get_frame(sheet_name, columns)
+
+    def get_by_id(self, sheet_name: str, id_field: str, id_value: str) -> Optional[Dict]:
+        """Get a record by ID from the mirror"""
+        return self.mirror.get_by_id(sheet_name, id_field, id_value)
+
+    def insert(self, sheet_name: str, data: Dict) -> bool:
+        """Insert a new record"""
+        return self.insert_many(sheet_name, [data])
+
+    def insert_many(self, sheet_name: str, records: List[Dict]) -> bool:
+        """Insert records into the spreadsheet, then into the mirror"""
+        with self._lock:
+            if not self.source.insert_many(sheet_name, records):
+                return False
+            self._written(sheet_name)
+            self.mirror.insert_many(sheet_name, records)
+            return True
+
+    def update(self, sheet_name: str, id_field: str, id_value: str, data: Dict) -> bool:
+        """Update a record in the spreadsheet, then in the mirror"""
+        with self._lock:
+            if not self.source.update(sheet_name, id_field, id_value, data):
+                return False
+            self._written(sheet_name)
+            self.mirror.update(sheet_name, id_field, id_value, data)
+            return True
+
+    def update_many(self, sheet_name: str, id_field: str, updates: Dict[str, Dict]) -> int:
+        """Update several records in the spreadsheet, then in the mirror"""
+        with self._lock:
+            updated = self.source.update_many(sheet_name, id_field, updates)
+            if updated:
+                self._written(sheet_name)
+                self.mirror.update_many(sheet_name, id_field, updates)
+            return updated
+
+    def delete(self, sheet_name: str, id_field: str, id_value: str) -> bool:
+        """Delete a record from the spreadsheet, then from the mirror"""
+        with self._lock:
+            if not self.source.delete(sheet_name, id_field, id_value):
+                return False
+            self._written(sheet_name)
+            self.mirror.delete(sheet_name, id_field, id_value)
+            return True
+
+    def record_movements(self, movements: List[Dict], log_entries: Optional[List[Dict]] = None) -> bool:
+        """Record movements in the spreadsheet, then in the mirror"""
+        # Allocated here so the mirror stores the same IDs as the spreadsheet
+        try:
+            movements = self.with_new_ids('AssetMovements', movements)
+            entries = self.with_new_ids('ActivityLogs', log_entries or [])
+        except Exception as e:
+            print(f"Error allocating movement IDs: {e}")
+            return False
+        with self._lock:
+            if not self.source.record_movements(movements, entries):
+                return False
+            for sheet_name in ('Assets', 'AssetMovements', 'ActivityLogs'):
+                self._written(sheet_name)
+            self.mirror.record_movements(movements, entries)
+            return True
+
+    def get_next_id(self, sheet_name: str, id_field: str = 'ID') -> int:
+        """Allocate the next ID from the spreadsheet engine's allocator"""
+        return self.source.get_next_id(sheet_name, id_field)
+
+    def allocate_id(self, sheet_name: str, id_field: str = 'ID') -> int:
+        return self.source.allocate_id(sheet_name, id_field)
+
+    def allocate_ids(self, sheet_name: str, count: int, id_field: str = 'ID') -> List[int]:
+        return self.source.allocate_ids(sheet_name, count, id_field)
@@ -0,0 +1,262 @@
+import sqlite3
+import threading
+from config import Config
+from storage_backend import StorageBackend, SHEET_HEADERS, primary_key
+from id_allocator import IdAllocator
+from typing import List, Dict, Optional
+
+# Columns that get a secondary index, per table (ID columns first)
+INDEXED_COLUMNS = {
+    'Users': ['Username', 'Email'],
+    'Locations': ['ID'],
+    'Categories': ['ID'],
+    'Subcategories': ['ID', 'Category ID'],
+    'AssetTypes': ['Asset Code', 'Asset Type'],
+    'Brands': ['ID'],
+    'Assets': ['Asset Code', 'Asset Category', 'Location', 'Department', 'Asset Status'],
+    'AssetMovements': ['ID', 'Asset Code', 'Movement Date', 'Moved By'],
+    'ActivityLogs': ['ID', 'Date & Time', 'User']
+}
+
+
+def _quote(identifier: str) -> str:
+    """Quote a table or column name for use in SQL"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+class SQLiteDB(StorageBackend):
+    """Local SQLite storage engine with the same method surface as GoogleSheetsDB"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.config = Config()
+        self.path = path or self.config.SQLITE_DB_PATH
+        # One shared connection; Flask and Streamlit call in from several threads
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._columns: Dict[str, List[str]] = {}
+        self._ids = IdAllocator()
+        self._initialize_tables()
+
+    def _initialize_tables(self):
+        """Create tables and indexes if they don't exist"""
+        with self._lock, self.conn:
+            for table, headers in SHEET_HEADERS.items():
+                column_defs = ', '.join(f"{_quote(h)} TEXT NOT NULL DEFAULT ''" for h in headers)
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {_quote(table)} ({column_defs})")
+                self._ensure_columns(table)
+                for column in INDEXED_COLUMNS.get(table, []):
+                    index_name = f"idx_{table}_{column}".replace(' ', '_')
+                    self.conn.execute(
+                        f"CREATE INDEX IF NOT EXISTS {_quote(index_name)} "
+                        f"ON {_quote(table)} ({_quote(column)})"
+                    )
+
+    def _ensure_columns(self, table: str):
+        """Add any expected columns missing from an existing table"""
+        self._columns[table] = [row[1] for row in self.conn.execute(f"PRAGMA table_info({_quote(table)})")]
+        self._add_columns(table, SHEET_HEADERS[table])
+
+    def _add_columns(self, table: str, fields: List[str]):
+        """Add columns for fields the table lacks; caller holds the lock and transaction"""
+        for field in fields:
+            if field and field not in self._columns[table]:
+                self.conn.execute(
+                    f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(field)} TEXT NOT NULL DEFAULT ''"
+                )
+                # A new list, so readers holding the old one are unaffected
+                self._columns[table] = self._columns[table] + [field]
+
+    def _first_rowid(self, table: str, id_field: str, id_value: str) -> Optional[int]:
+        """Return the rowid of the first record matching the ID"""
+        row = self.conn.execute(
+            f"SELECT rowid FROM {_quote(table)} WHERE {_quote(id_field)} = ? ORDER BY rowid LIMIT 1",
+            (str(id_value),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _select_columns(self, sheet_name: str, columns: Optional[List[str]]) -> List[str]:
+        """Table columns to read: all of them, or the requested ones plus the primary key"""
+        if columns is None:
+            return self._columns[sheet_name]
+        wanted = dict.fromkeys([primary_key(sheet_name)] + list(columns))
+        return [c for c in wanted if c in self._columns[sheet_name]]
+
+    def _select_rows(self, sheet_name: str, columns: List[str]) -> List[tuple]:
+        """Non-empty rows of the given columns, in insertion order"""
+        if not columns:
+            return []
+        select = ', '.join(_quote(c) for c in columns)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT {select} FROM {_quote(sheet_name)} ORDER BY rowid"
+            ).fetchall()
+        return [row for row in rows if any(row)]
+
+    def get_all(self, sheet_name: str, columns: Optional[List[str]] = None) -> List[Dict]:
+        """Get all records from a table"""
+        try:
+            selected = self._select_columns(sheet_name, columns)
+            return [dict(zip(selected, row)) for row in self._select_rows(sheet_name, selected)]
+        except Exception as e:
+            print(f"Error getting records from {sheet_name}: {e}")
+            return []
+
+    def get_columns(self, sheet_name: str, columns: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Get all records of a table as column lists"""
+        try:
+            selected = self._select_columns(sheet_name, columns)
+            values = list(zip(*self._select_rows(sheet_name, selected))) or [()] * len(selected)
+            return {column: list(column_values) for column, column_values in zip(selected, values)}
+        except Exception as e:
+            print(f"Error getting records from {sheet_name}: {e}")
+            return {}
+
+    def get_by_id(self, sheet_name: str, id_field: str, id_value: str) -> Optional[Dict]:
+        """Get a record by ID"""
+        columns = self._columns.get(sheet_name, [])
+        if id_field not in columns:
+            return None
+        select = ', '.join(_quote(c) for c in columns)
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {select} FROM {_quote(sheet_name)} WHERE {_quote(id_field)} = ? "
+                f"ORDER BY rowid LIMIT 1",
+                (str(id_value),)
+            ).fetchone()
+        return dict(zip(columns, row)) if row else None
+
+    def insert(self, sheet_name: str, data: Dict) -> bool:
+        """Insert a new record"""
+        return self.insert_many(sheet_name, [data])
+
+    def _insert_rows(self, sheet_name: str, records: List[Dict]):
+        """Insert records; caller holds the lock and transaction"""
+        columns = self._columns[sheet_name]
+        rows = [[str(data.get(c, '') or '').strip() for c in columns] for data in records]
+        placeholders = ', '.join('?' for _ in columns)
+        self.conn.executemany(
+            f"INSERT INTO {_quote(sheet_name)} ({', '.join(_quote(c) for c in columns)}) "
+            f"VALUES ({placeholders})",
+            rows
+        )
+
+    def insert_many(self, sheet_name: str, records: List[Dict]) -> bool:
+        """Insert several records in one transaction"""
+        try:
+            with self._lock, self.conn:
+                self._insert_rows(sheet_name, records)
+            self._ids.observe(sheet_name, records)
+            return True
+        except Exception as e:
+            print(f"Error inserting records into {sheet_name}: {e}")
+            return False
+
+    def replace_all(self, data: Dict[str, List[Dict]]):
+        """Replace the contents of several tables in one transaction.
+
+        Fields of the records that a table has no column for, such as extra
+        columns added to a spreadsheet by hand, get a column of their own.
+        """
+        with self._lock, self.conn:
+            for sheet_name, records in data.items():
+                self._add_columns(sheet_name, list(dict.fromkeys(f for r in records for f in r)))
+                self.conn.execute(f"DELETE FROM {_quote(sheet_name)}")
+                self._insert_rows(sheet_name, records)
+        for sheet_name, records in data.items():
+            self._ids.observe(sheet_name, records)
+
+    def _update_row(self, sheet_name: str, id_field: str, id_value: str, data: Dict) -> bool:
+        """Update the first matching row; caller holds the lock and transaction"""
+        columns = self._columns[sheet_name]
+        changes = {k: v for k, v in data.items() if k in columns}
+        rowid = self._first_rowid(sheet_name, id_field, id_value)
+        if rowid is None:
+            return False
+        if changes:
+            assignments = ', '.join(f"{_quote(c)} = ?" for c in changes)
+            values = [str(v or '').strip() for v in changes.values()]
+            self.conn.execute(
+                f"UPDATE {_quote(sheet_name)} SET {assignments} WHERE rowid = ?",
+                values + [rowid]
+            )
+        return True
+
+    def update(self, sheet_name: str, id_field: str, id_value: str, data: Dict) -> bool:
+        """Update a record"""
+        try:
+            if id_field not in self._columns[sheet_name]:
+                return False
+            with self._lock, self.conn:
+                return self._update_row(sheet_name, id_field, id_value, data)
+        except Exception as e:
+            print(f"Error updating record in {sheet_name}: {e}")
+            return False
+
+    def update_many(self, sheet_name: str, id_field: str, updates: Dict[str, Dict]) -> int:
+        """Update several records in one transaction; returns how many were updated"""
+        try:
+            if id_field not in self._columns[sheet_name]:
+                return 0
+            with self._lock, self.conn:
+                return sum(1 for id_value, data in updates.items()
+                           if self._update_row(sheet_name, id_field, id_value, data))
+        except Exception as e:
+            print(f"Error updating records in {sheet_name}: {e}")
+            return 0
+
+    def delete(self, sheet_name: str, id_field: str, id_value: str) -> bool:
+        """Delete a record"""
+        try:
+            if id_field not in self._columns[sheet_name]:
+                return False
+            with self._lock, self.conn:
+                rowid = self._first_rowid(sheet_name, id_field, id_value)
+                if rowid is None:
+                    return False
+                self.conn.execute(f"DELETE FROM {_quote(sheet_name)} WHERE rowid = ?", (rowid,))
+            return True
+        except Exception as e:
+            print(f"Error deleting record from {sheet_name}: {e}")
+            return False
+
+    def record_movements(self, movements: List[Dict], log_entries: Optional[List[Dict]] = None) -> bool:
+        """Record movements, move the assets and log them in one transaction"""
+        try:
+            movements = self.with_new_ids('AssetMovements', movements)
+            entries = self.with_new_ids('ActivityLogs', log_entries or [])
+            with self._lock, self.conn:
+                for movement in movements:
+                    if not self._update_row('Assets', 'Asset Code', movement.get('Asset Code'),
+                                            {'Location': movement.get('To Location', '')}):
+                        # Leaving the block with an exception rolls the transaction back
+                        raise ValueError(f"Unknown asset {movement.get('Asset Code')}")
+                self._insert_rows('AssetMovements', movements)
+                self._insert_rows('ActivityLogs', entries)
+            self._ids.observe('AssetMovements', movements)
+            self._ids.observe('ActivityLogs', entries)
+            return True
+        except Exception as e:
+            print(f"Error recording movements: {e}")
+            return False
+
+    def get_next_id(self, sheet_name: str, id_field: str = 'ID') -> int:
+        """Allocate the next available ID"""
+        return self._ids.allocate(sheet_name, id_field,
+                                  lambda: self._max_id(sheet_name, id_field))
+
+    def allocate_ids(self, sheet_name: str, count: int, id_field: str = 'ID') -> List[int]:
+        """Allocate count consecutive IDs with one MAX query"""
+        if count <= 0:
+            return []
+        first = self._ids.allocate(sheet_name, id_field,
+                                   lambda: self._max_id(sheet_name, id_field), count)
+        return list(range(first, first + count))
+
+    def _max_id(self, sheet_name: str, id_field: str) -> int:
+        """Highest integer ID stored in a table"""
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT MAX(CAST({_quote(id_field)} AS INTEGER)) FROM {_quote(sheet_name)} "
+                f"WHERE {_quote(id_field)} != ''"
+            ).fetchone()
+        return row[0] or 0
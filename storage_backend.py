@@ -0,0 +1,165 @@
+"""Storage backend interface shared by all database engines"""
+from abc import ABC, abstractmethod
+import pandas as pd
+from config import Config
+from typing import List, Dict, Optional
+
+# Column layout of every sheet/table, in display order
+SHEET_HEADERS = {
+    'Users': ['Username', 'Email', 'Password', 'Role'],
+    'Locations': ['ID', 'Location Name'],
+    'Categories': ['ID', 'Category Name'],
+    'Subcategories': ['ID', 'Subcategory Name', 'Category ID'],
+    'AssetTypes': ['Asset Code', 'Asset Type', 'Depreciation Value (%)'],
+    'Brands': ['ID', 'Brand Name'],
+    'Assets': ['Asset Code', 'Item Name', 'Asset Category', 'Asset SubCategory',
+              'Brand', 'Asset Description', 'Amount', 'Location',
+              'Date of Purchase', 'Warranty', 'Department', 'Ownership',
+              'Asset Status', 'Image Attachment', 'Document Attachment'],
+    'AssetMovements': ['ID', 'Asset Code', 'From Location', 'To Location',
+                      'Movement Date', 'Moved By', 'Notes'],
+    'ActivityLogs': ['ID', 'Date & Time', 'Type', 'User', 'Action', 'Entity Type',
+                   'Entity ID', 'Description', 'Details']
+}
+
+SHEET_NAMES = list(SHEET_HEADERS.keys())
+
+# Column that identifies a record in each sheet
+PRIMARY_KEYS = {
+    'Users': 'Username',
+    'AssetTypes': 'Asset Code',
+    'Assets': 'Asset Code'
+}
+
+# Sheets the app only ever appends to
+APPEND_ONLY_SHEETS = ['AssetMovements', 'ActivityLogs']
+
+# Most records written by one insert request, to stay well under the Sheets
+# API payload limit; an insert_many of up to this many records is all or nothing
+INSERT_CHUNK_SIZE = 500
+
+
+def primary_key(sheet_name: str) -> str:
+    """Return the ID column of a sheet"""
+    return PRIMARY_KEYS.get(sheet_name, 'ID')
+
+
+class StorageBackend(ABC):
+    """Base class defining the method surface every storage engine provides"""
+    connected = True
+    error = None
+
+    @abstractmethod
+    def get_all(self, sheet_name: str, columns: Optional[List[str]] = None) -> List[Dict]:
+        """Get all records from a sheet, optionally only some columns plus the primary key"""
+
+    def get_many(self, sheet_names: List[str]) -> Dict[str, List[Dict]]:
+        """Get all records of several sheets, keyed by sheet name"""
+        return {sheet_name: self.get_all(sheet_name) for sheet_name in sheet_names}
+
+    def get_columns(self, sheet_name: str, columns: Optional[List[str]] = None) -> Dict[str, List[str]]:
+        """Get all records of a sheet as column lists keyed by header"""
+        records = self.get_all(sheet_name, columns)
+        fields = list(records[0]) if records else []
+        return {field: [record.get(field, '') for record in records] for field in fields}
+
+    def get_frame(self, sheet_name: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Get all records of a sheet as a DataFrame"""
+        data = self.get_columns(sheet_name, columns)
+        return pd.DataFrame(data, columns=list(data))
+
+    @abstractmethod
+    def get_by_id(self, sheet_name: str, id_field: str, id_value: str) -> Optional[Dict]:
+        """Get a record by ID"""
+
+    @abstractmethod
+    def insert(self, sheet_name: str, data: Dict) -> bool:
+        """Insert a new record"""
+
+    def insert_many(self, sheet_name: str, records: List[Dict]) -> bool:
+        """Insert several records"""
+        return all([self.insert(sheet_name, data) for data in records])
+
+    @abstractmethod
+    def update(self, sheet_name: str, id_field: str, id_value: str, data: Dict) -> bool:
+        """Update a record"""
+
+    def update_many(self, sheet_name: str, id_field: str, updates: Dict[str, Dict]) -> int:
+        """Update several records keyed by ID value; returns how many were updated"""
+        return sum(1 for id_value, data in updates.items()
+                   if self.update(sheet_name, id_field, id_value, data))
+
+    @abstractmethod
+    def delete(self, sheet_name: str, id_field: str, id_value: str) -> bool:
+        """Delete a record"""
+
+    def with_new_ids(self, sheet_name: str, records: List[Dict], id_field: str = 'ID') -> List[Dict]:
+        """Copies of records, with IDs allocated for those without one; raises if allocation fails"""
+        ids = iter(self.allocate_ids(sheet_name, sum(1 for r in records if not r.get(id_field)), id_field))
+        return [r if r.get(id_field) else dict(r, **{id_field: next(ids)}) for r in records]
+
+    def record_movement(self, movement: Dict, log_entry: Optional[Dict] = None) -> bool:
+        """Record an asset movement, set the asset's Location and log the move"""
+        return self.record_movements([movement], [log_entry] if log_entry is not None else None)
+
+    def record_movements(self, movements: List[Dict], log_entries: Optional[List[Dict]] = None) -> bool:
+        """Record several movements, set each asset's Location and add the log entries.
+
+        Movements and log entries without an ID are given one. Nothing is
+        written if any movement names an unknown asset or the IDs cannot be
+        allocated.
+        """
+        known = {r.get('Asset Code') for r in self.get_all('Assets', columns=[])}
+        if any(m.get('Asset Code') not in known for m in movements):
+            return False
+        try:
+            movements = self.with_new_ids('AssetMovements', movements)
+            entries = self.with_new_ids('ActivityLogs', log_entries or [])
+        except Exception as e:
+            print(f"Error allocating movement IDs: {e}")
+            return False
+        if not self.insert_many('AssetMovements', movements):
+            return False
+        self.update_many('Assets', 'Asset Code',
+                         {m.get('Asset Code'): {'Location': m.get('To Location', '')} for m in movements})
+        if entries:
+            self.insert_many('ActivityLogs', entries)
+        return True
+
+    @abstractmethod
+    def get_next_id(self, sheet_name: str, id_field: str = 'ID') -> int:
+        """Get the next available ID"""
+
+    def allocate_id(self, sheet_name: str, id_field: str = 'ID') -> int:
+        """Like get_next_id, but raises rather than falling back to a default ID"""
+        return self.get_next_id(sheet_name, id_field)
+
+    def allocate_ids(self, sheet_name: str, count: int, id_field: str = 'ID') -> List[int]:
+        """Allocate count IDs at once; raises if they cannot be allocated"""
+        return [self.allocate_id(sheet_name, id_field) for _ in range(count)]
+
+    def generate_asset_code(self, asset_type: str) -> str:
+        """Generate asset code based on asset type"""
+        records = self.get_all('Assets')
+        # Count existing assets of this type
+        type_count = sum(1 for r in records if r.get('Asset Type', '') == asset_type)
+        # Format: TYPE-001, TYPE-002, etc.
+        return f"{asset_type.upper().replace(' ', '')[:4]}-{str(type_count + 1).zfill(4)}"
+
+
+def create_db(config: Optional[Config] = None) -> StorageBackend:
+    """Create the storage backend selected by Config.STORAGE_BACKEND"""
+    config = config or Config()
+    backend = (config.STORAGE_BACKEND or 'sheets').lower()
+
+    if backend == 'sqlite':
+        from sqlite_db import SQLiteDB
+        return SQLiteDB(config.SQLITE_DB_PATH)
+    if backend == 'sheets':
+        from google_sheets_db import GoogleSheetsDB
+        if config.SHEETS_MIRROR_PATH:
+            from sheets_mirror import MirroredSheetsDB
+            return MirroredSheetsDB(GoogleSheetsDB(), config.SHEETS_MIRROR_PATH,
+                                    config.SHEETS_MIRROR_REFRESH)
+        return GoogleSheetsDB()
+    raise ValueError(f"Unknown storage backend '{config.STORAGE_BACKEND}'. Use 'sheets' or 'sqlite'.")
@@ -0,0 +1,35 @@
+"""Streamlit rendering of report engine results"""
+import streamlit as st
+from reports import ReportResult, run_report, export_file, REPORT_FORMATS
+from storage_backend import StorageBackend
+from typing import Dict
+
+
+def load_report(db: StorageBackend, name: str, params: Dict, key: str) -> ReportResult:
+    """Run a report for a page; reruns caused by its Export button reuse the shown result"""
+    refresh = not st.session_state.get(f"{key}_export")
+    return run_report(db, name, params, refresh=refresh)
+
+
+def show_report(result: ReportResult, key: str):
+    """Show the report table with export controls"""
+    if not result.rows:
+        st.info("No rows match the filters.")
+        return
+
+    st.dataframe(result.frame(), use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        fmt = st.selectbox("Export format", list(REPORT_FORMATS), format_func=str.upper,
+                           key=f"{key}_format", label_visibility="collapsed")
+    with col2:
+        if st.button("📥 Export", key=f"{key}_export"):
+            output, mimetype, filename = export_file(result, fmt)
+            st.download_button(
+                label=f"Download {fmt.upper()} File",
+                data=output.read(),
+                file_name=filename,
+                mime=mimetype,
+                key=f"{key}_download"
+            )
@@ -0,0 +1,175 @@
+"""In-memory stand-in for the gspread spreadsheet calls GoogleSheetsDB makes"""
+import re
+
+import gspread
+from gspread.utils import a1_to_rowcol, rowcol_to_a1
+
+from google_sheets_db import GoogleSheetsDB
+from storage_backend import SHEET_HEADERS
+
+
+def _parse_cell(text: str):
+    """(row, col) of an A1 reference; either may be None, as in 'A' or '5'"""
+    match = re.fullmatch(r'([A-Z]*)(\d*)', text)
+    letters, digits = match.groups()
+    col = a1_to_rowcol(f"{letters}1")[1] if letters else None
+    return (int(digits) if digits else None), col
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title: str, sheet_id: int):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.rows = []
+
+    def _bounds(self, cells):
+        width = max([len(row) for row in self.rows] + [1])
+        if not cells:
+            return 1, 1, len(self.rows), width
+        start, _, end = cells.partition(':')
+        row1, col1 = _parse_cell(start)
+        row2, col2 = _parse_cell(end or start)
+        return row1 or 1, col1 or 1, row2 or len(self.rows), col2 or width
+
+    def _read(self, cells):
+        row1, col1, row2, col2 = self._bounds(cells)
+        values = []
+        for row in self.rows[row1 - 1:row2]:
+            row = row[col1 - 1:col2]
+            while row and row[-1] == '':
+                row = row[:-1]
+            values.append(row)
+        while values and not values[-1]:
+            values.pop()
+        return values
+
+    def _set(self, row_idx: int, col_idx: int, value):
+        while len(self.rows) < row_idx:
+            self.rows.append([])
+        row = self.rows[row_idx - 1]
+        while len(row) < col_idx:
+            row.append('')
+        row[col_idx - 1] = '' if value is None else str(value)
+
+    def _write(self, cells, values):
+        row1, col1, _, _ = self._bounds(cells)
+        for i, row in enumerate(values):
+            for j, value in enumerate(row):
+                self._set(row1 + i, col1 + j, value)
+
+    def append(self, rows):
+        while self.rows and not any(self.rows[-1]):
+            self.rows.pop()
+        first_row = len(self.rows) + 1
+        self.rows.extend([['' if v is None else str(v) for v in row] for row in rows])
+        return first_row
+
+    def get_all_values(self):
+        return [list(row) for row in self.rows]
+
+    def get_values(self, range_name=None):
+        return self._read(range_name)
+
+    def row_values(self, row_idx: int):
+        values = self._read(f"A{row_idx}:{row_idx}")
+        return values[0] if values else []
+
+    def col_values(self, col_idx: int):
+        values = [row[col_idx - 1] if len(row) >= col_idx else '' for row in self.rows]
+        while values and values[-1] == '':
+            values.pop()
+        return values
+
+    def append_rows(self, rows, **kwargs):
+        first_row = self.append(rows)
+        last_col = rowcol_to_a1(1, max(len(row) for row in rows))[:-1]
+        return {'updates': {'updatedRange': f"{self.title}!A{first_row}:{last_col}{first_row + len(rows) - 1}"}}
+
+    def update(self, range_name=None, values=None, **kwargs):
+        self._write(range_name, values)
+
+    def batch_update(self, data, **kwargs):
+        for item in data:
+            self._write(item['range'], item['values'])
+
+    def delete_rows(self, start_index: int, end_index=None):
+        del self.rows[start_index - 1:end_index or start_index]
+
+
+class FakeSpreadsheet:
+    """Holds worksheets by title; several FakeSheetsDB instances may share one"""
+
+    def __init__(self):
+        self.sheets = {}
+        for title, headers in SHEET_HEADERS.items():
+            self.add_worksheet(title).rows.append(list(headers))
+
+    def add_worksheet(self, title: str) -> FakeWorksheet:
+        worksheet = FakeWorksheet(self, title, len(self.sheets) + 1)
+        self.sheets[title] = worksheet
+        return worksheet
+
+    def worksheets(self):
+        return list(self.sheets.values())
+
+    def _by_id(self, sheet_id: int) -> FakeWorksheet:
+        return next(ws for ws in self.sheets.values() if ws.id == sheet_id)
+
+    def _range(self, range_name: str):
+        title, _, cells = range_name.partition('!')
+        title = title.strip("'")
+        if title not in self.sheets:
+            raise gspread.WorksheetNotFound(title)
+        return self.sheets[title], cells
+
+    def values_batch_get(self, ranges, params=None):
+        by_columns = (params or {}).get('majorDimension') == 'COLUMNS'
+        value_ranges = []
+        for range_name in ranges:
+            worksheet, cells = self._range(range_name)
+            values = worksheet._read(cells)
+            if by_columns and values:
+                width = max(len(row) for row in values)
+                values = [[row[j] if j < len(row) else '' for row in values] for j in range(width)]
+            value_ranges.append({'range': range_name, 'values': values} if values else {'range': range_name})
+        return {'valueRanges': value_ranges}
+
+    def values_batch_update(self, body):
+        for item in body['data']:
+            worksheet, cells = self._range(item['range'])
+            worksheet._write(cells, item['values'])
+
+    def batch_update(self, body):
+        for request in body['requests']:
+            if 'appendCells' in request:
+                append = request['appendCells']
+                self._by_id(append['sheetId']).append(
+                    [[next(iter(cell['userEnteredValue'].values())) for cell in row['values']]
+                     for row in append['rows']])
+            elif 'updateCells' in request:
+                update = request['updateCells']
+                grid = update['range']
+                worksheet = self._by_id(grid['sheetId'])
+                for i, row in enumerate(update['rows']):
+                    for j, cell in enumerate(row['values']):
+                        worksheet._set(grid['startRowIndex'] + 1 + i, grid['startColumnIndex'] + 1 + j,
+                                       next(iter(cell['userEnteredValue'].values())))
+            elif 'addSheet' in request:
+                self.add_worksheet(request['addSheet']['properties']['title'])
+        return {'replies': [{} for _ in body['requests']]}
+
+
+class FakeSheetsDB(GoogleSheetsDB):
+    """GoogleSheetsDB on a FakeSpreadsheet, calling it directly without the rate limiter"""
+
+    def __init__(self, spreadsheet: FakeSpreadsheet):
+        self._spreadsheet = spreadsheet
+        super().__init__(sheet_id='fake')
+
+    def _connect(self):
+        self.sheet = self._spreadsheet
+        self._initialize_sheets()
+
+    def _api(self, func, *args, retry_if=None, **kwargs):
+        return func(*args, **kwargs)
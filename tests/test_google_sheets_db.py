@@ -0,0 +1,81 @@
+from fake_sheets import FakeSheetsDB, FakeSpreadsheet
+
+
+def locations(spreadsheet):
+    return spreadsheet.sheets['Locations'].rows[1:]
+
+
+def make_pair():
+    """Two engines on one spreadsheet, as when Flask and Streamlit run side by side"""
+    spreadsheet = FakeSpreadsheet()
+    first = FakeSheetsDB(spreadsheet)
+    first.insert_many('Locations', [{'ID': str(i), 'Location Name': f'Room {i}'} for i in range(1, 6)])
+    second = FakeSheetsDB(spreadsheet)
+    # Both now hold the sheet in their caches
+    assert len(first.get_all('Locations')) == len(second.get_all('Locations')) == 5
+    return spreadsheet, first, second
+
+
+def test_delete_after_rows_moved_elsewhere_removes_the_right_row():
+    spreadsheet, first, second = make_pair()
+    assert first.delete('Locations', 'ID', '2')
+    assert second.delete('Locations', 'ID', '4')
+    assert [row[0] for row in locations(spreadsheet)] == ['1', '3', '5']
+
+
+def test_update_after_rows_moved_elsewhere_writes_the_right_row():
+    spreadsheet, first, second = make_pair()
+    assert first.delete('Locations', 'ID', '2')
+    assert second.update('Locations', 'ID', '5', {'Location Name': 'FIVE'})
+    assert locations(spreadsheet)[-1] == ['5', 'FIVE']
+    assert second.get_by_id('Locations', 'ID', '5') == {'ID': '5', 'Location Name': 'FIVE'}
+
+
+def test_update_many_after_manual_row_insert():
+    spreadsheet, first, _ = make_pair()
+    # A row typed in by hand above the cached ones
+    spreadsheet.sheets['Locations'].rows.insert(1, ['9', 'Manual'])
+    assert first.update_many('Locations', 'ID', {'1': {'Location Name': 'One'},
+                                                 '3': {'Location Name': 'Three'},
+                                                 '7': {'Location Name': 'Missing'}}) == 2
+    assert locations(spreadsheet)[:4] == [['9', 'Manual'], ['1', 'One'], ['2', 'Room 2'], ['3', 'Three']]
+
+
+def test_record_movement_after_asset_rows_moved():
+    spreadsheet = FakeSpreadsheet()
+    first = FakeSheetsDB(spreadsheet)
+    first.insert_many('Assets', [{'Asset Code': f'A-{i}', 'Location': 'Store'} for i in range(1, 4)])
+    second = FakeSheetsDB(spreadsheet)
+    assert len(second.get_all('Assets')) == 3
+    assert first.delete('Assets', 'Asset Code', 'A-1')
+    assert second.record_movement({'ID': '1', 'Asset Code': 'A-3', 'From Location': 'Store',
+                                   'To Location': 'Office'})
+    assets = {r['Asset Code']: r['Location'] for r in FakeSheetsDB(spreadsheet).get_all('Assets')}
+    assert assets == {'A-2': 'Store', 'A-3': 'Office'}
+
+
+def test_write_uses_cache_when_rows_have_not_moved():
+    spreadsheet, first, _ = make_pair()
+    reads = []
+    worksheet = spreadsheet.sheets['Locations']
+    original = worksheet.get_all_values
+    worksheet.get_all_values = lambda: reads.append(1) or original()
+    assert first.update('Locations', 'ID', '3', {'Location Name': 'Lab'})
+    assert reads == []
+    assert locations(spreadsheet)[2] == ['3', 'Lab']
+
+
+def test_allocate_id_sees_ids_stored_by_another_process():
+    _, first, second = make_pair()
+    # second has cached the sheet, so only a fresh read shows first's insert
+    new_id = first.allocate_id('Locations')
+    assert new_id == 6
+    assert first.insert('Locations', {'ID': str(new_id), 'Location Name': 'Annex'})
+    assert second.allocate_id('Locations') == 7
+
+
+def test_allocate_ids_reserves_consecutive_ids():
+    _, first, _ = make_pair()
+    assert first.allocate_ids('Locations', 3) == [6, 7, 8]
+    assert first.allocate_id('Locations') == 9
+    assert first.allocate_ids('Locations', 0) == []
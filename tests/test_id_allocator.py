@@ -0,0 +1,78 @@
+import threading
+
+from id_allocator import IdAllocator, max_id
+
+
+def test_max_id_ignores_blank_and_non_numeric_ids():
+    assert max_id(['3', ' 12 ', '', None, 'A-7', '5']) == 12
+    assert max_id([]) == 0
+
+
+def test_allocate_reads_stored_max_every_time():
+    allocator = IdAllocator()
+    stored = [7]
+    assert allocator.allocate('Locations', 'ID', lambda: stored[0]) == 8
+    # Not yet written: the mark keeps the ID taken
+    assert allocator.allocate('Locations', 'ID', lambda: stored[0]) == 9
+    # Another process stored IDs up to 20
+    stored[0] = 20
+    assert allocator.allocate('Locations', 'ID', lambda: stored[0]) == 21
+
+
+def test_allocate_reserves_a_run_of_ids():
+    allocator = IdAllocator()
+    assert allocator.allocate('ActivityLogs', 'ID', lambda: 4, count=3) == 5
+    assert allocator.allocate('ActivityLogs', 'ID', lambda: 4) == 8
+
+
+def test_sheets_have_separate_marks():
+    allocator = IdAllocator()
+    assert allocator.allocate('Locations', 'ID', lambda: 2) == 3
+    assert allocator.allocate('Brands', 'ID', lambda: 10) == 11
+    assert allocator.allocate('Locations', 'ID', lambda: 0) == 4
+
+
+def test_observe_raises_existing_marks_only():
+    allocator = IdAllocator()
+    allocator.allocate('Locations', 'ID', lambda: 1)
+    allocator.observe('Locations', [{'ID': '40'}, {'ID': 'x'}])
+    allocator.observe('Brands', [{'ID': '99'}])
+    assert allocator.allocate('Locations', 'ID', lambda: 0) == 41
+    assert allocator.allocate('Brands', 'ID', lambda: 5) == 6
+
+
+def test_observe_never_lowers_a_mark():
+    allocator = IdAllocator()
+    allocator.allocate('Locations', 'ID', lambda: 20)
+    allocator.observe('Locations', [{'ID': '3'}])
+    assert allocator.allocate('Locations', 'ID', lambda: 0) == 22
+
+
+def test_forget_leaves_only_the_stored_max():
+    allocator = IdAllocator()
+    allocator.allocate('Locations', 'ID', lambda: 50)
+    allocator.allocate('Brands', 'ID', lambda: 50)
+    allocator.forget('Locations')
+    assert allocator.allocate('Locations', 'ID', lambda: 1) == 2
+    assert allocator.allocate('Brands', 'ID', lambda: 1) == 52
+    allocator.forget()
+    assert allocator.allocate('Brands', 'ID', lambda: 9) == 10
+
+
+def test_concurrent_allocations_are_unique():
+    allocator = IdAllocator()
+    ids = []
+    lock = threading.Lock()
+
+    def worker():
+        for _ in range(200):
+            new_id = allocator.allocate('ActivityLogs', 'ID', lambda: 0)
+            with lock:
+                ids.append(new_id)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sorted(ids) == list(range(1, 1601))
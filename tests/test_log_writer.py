@@ -0,0 +1,78 @@
+import json
+
+import pytest
+
+import log_writer
+from log_writer import ActivityLogWriter
+from sqlite_db import SQLiteDB
+
+
+class FlakyDB(SQLiteDB):
+    """SQLiteDB whose insert_many fails on chosen calls"""
+
+    def __init__(self, fail_calls):
+        super().__init__(':memory:')
+        self.fail_calls = set(fail_calls)
+        self.calls = 0
+
+    def insert_many(self, sheet_name, records):
+        self.calls += 1
+        if self.calls in self.fail_calls:
+            return False
+        return super().insert_many(sheet_name, records)
+
+
+@pytest.fixture
+def journal(tmp_path):
+    return str(tmp_path / 'journal.jsonl')
+
+
+def make_writer(db, journal):
+    writer = ActivityLogWriter(db, journal, flush_interval=3600)
+    writer._stop.set()
+    return writer
+
+
+def test_failed_second_chunk_does_not_rewrite_the_first(journal, monkeypatch):
+    monkeypatch.setattr(log_writer, 'INSERT_CHUNK_SIZE', 2)
+    db = FlakyDB(fail_calls=[2])
+    writer = make_writer(db, journal)
+    for i in range(5):
+        writer.log({'Description': f'entry {i}'})
+
+    assert not writer.flush()
+    assert [e['Description'] for e in db.get_all('ActivityLogs')] == ['entry 0', 'entry 1']
+    assert writer.pending() == 3
+    with open(journal, encoding='utf-8') as f:
+        assert [json.loads(line)['Description'] for line in f] == ['entry 2', 'entry 3', 'entry 4']
+
+    assert writer.flush()
+    logs = db.get_all('ActivityLogs')
+    assert [e['Description'] for e in logs] == [f'entry {i}' for i in range(5)]
+    # IDs allocated for the failed write are not reused, so there may be gaps
+    ids = [int(e['ID']) for e in logs]
+    assert ids[:2] == [1, 2] and ids == sorted(set(ids))
+    assert writer.pending() == 0
+
+
+def test_failed_flush_leaves_entries_without_ids(journal):
+    db = FlakyDB(fail_calls=[1])
+    writer = make_writer(db, journal)
+    writer.log({'Description': 'entry'})
+    assert not writer.flush()
+    with open(journal, encoding='utf-8') as f:
+        assert 'ID' not in json.loads(f.readline())
+    assert writer.flush()
+    logs = db.get_all('ActivityLogs')
+    assert len(logs) == 1 and logs[0]['ID']
+
+
+def test_journal_is_replayed_on_restart(journal):
+    db = FlakyDB(fail_calls=[1])
+    writer = make_writer(db, journal)
+    writer.log({'Description': 'before restart'})
+    assert not writer.flush()
+    restarted = make_writer(db, journal)
+    assert restarted.pending() == 1
+    assert restarted.flush()
+    assert [e['Description'] for e in db.get_all('ActivityLogs')] == ['before restart']
@@ -0,0 +1,65 @@
+from pagination import DEFAULT_PER_PAGE, paginate, sort_key
+
+
+def numbered_rows(count):
+    return [{'ID': str(i), 'Name': f'item {i}'} for i in range(1, count + 1)]
+
+
+def test_defaults_keep_given_order():
+    rows = numbered_rows(60)
+    page = paginate(rows, {}, ['ID'])
+    assert page.page == 1
+    assert page.per_page == DEFAULT_PER_PAGE
+    assert page.total == 60
+    assert page.pages == 2
+    assert [r['ID'] for r in page.items] == [str(i) for i in range(1, 51)]
+    assert page.has_next and not page.has_prev
+
+
+def test_numeric_sort_descending():
+    rows = numbered_rows(30)
+    page = paginate(rows, {'sort': 'ID', 'order': 'desc', 'per_page': '25'}, ['ID'])
+    assert page.items[0]['ID'] == '30'
+    assert page.items[-1]['ID'] == '6'
+    # The caller's list is left alone
+    assert rows[0]['ID'] == '1'
+
+
+def test_unknown_sort_order_and_per_page_fall_back():
+    page = paginate(numbered_rows(5), {'sort': 'Password', 'order': 'sideways', 'per_page': '7'},
+                    ['ID'], default_sort='Name', default_order='desc')
+    assert page.sort == 'Name'
+    assert page.order == 'desc'
+    assert page.per_page == DEFAULT_PER_PAGE
+
+
+def test_page_is_clamped_to_range():
+    rows = numbered_rows(60)
+    assert paginate(rows, {'page': '9'}, []).page == 2
+    assert paginate(rows, {'page': '-3'}, []).page == 1
+    assert paginate(rows, {'page': 'abc'}, []).page == 1
+    last = paginate(rows, {'page': '2'}, [])
+    assert [r['ID'] for r in last.items] == [str(i) for i in range(51, 61)]
+    assert last.offset == 50 and not last.has_next
+
+
+def test_empty_rows_give_one_empty_page():
+    page = paginate([], {'page': '3'}, ['ID'])
+    assert page.page == 1 and page.pages == 1 and page.items == []
+
+
+def test_sort_key_orders_numbers_before_text_case_insensitively():
+    rows = [{'V': 'banana'}, {'V': '1,200'}, {'V': 'Apple'}, {'V': 3}, {'V': '20'}]
+    assert [r['V'] for r in sorted(rows, key=sort_key('V'))] == [3, '20', '1,200', 'Apple', 'banana']
+
+
+def test_window_elides_distant_pages():
+    page = paginate(numbered_rows(25 * 10), {'page': '5', 'per_page': '25'}, [])
+    assert page.window() == [1, None, 3, 4, 5, 6, 7, None, 10]
+    assert paginate(numbered_rows(75), {'per_page': '25'}, []).window() == [1, 2, 3]
+
+
+def test_to_dict():
+    data = paginate(numbered_rows(3), {'sort': 'ID'}, ['ID']).to_dict()
+    assert data['total'] == 3 and data['pages'] == 1 and data['sort'] == 'ID'
+    assert len(data['items']) == 3
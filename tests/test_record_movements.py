@@ -0,0 +1,42 @@
+import pytest
+
+from fake_sheets import FakeSheetsDB, FakeSpreadsheet
+from sheets_mirror import MirroredSheetsDB
+from sqlite_db import SQLiteDB
+
+
+@pytest.fixture(params=['sqlite', 'sheets', 'mirror'])
+def db(request, tmp_path):
+    if request.param == 'sqlite':
+        db = SQLiteDB(':memory:')
+    elif request.param == 'sheets':
+        db = FakeSheetsDB(FakeSpreadsheet())
+    else:
+        db = MirroredSheetsDB(FakeSheetsDB(FakeSpreadsheet()), str(tmp_path / 'mirror.db'), 3600)
+        request.addfinalizer(db.stop)
+    db.insert_many('Assets', [{'Asset Code': 'A-1', 'Location': 'Store'},
+                              {'Asset Code': 'A-2', 'Location': 'Store'}])
+    db.insert('ActivityLogs', {'ID': '7', 'Description': 'Earlier entry'})
+    return db
+
+
+def move(code, notes=''):
+    return {'ID': '', 'Asset Code': code, 'From Location': 'Store', 'To Location': 'Office', 'Notes': notes}
+
+
+def test_record_movements_allocates_missing_ids(db):
+    assert db.record_movements([move('A-1'), move('A-2')],
+                               [{'Description': 'moved A-1'}, {'ID': '20', 'Description': 'moved A-2'}])
+    assert [m['ID'] for m in db.get_all('AssetMovements')] == ['1', '2']
+    assert [e['ID'] for e in db.get_all('ActivityLogs')] == ['7', '8', '20']
+    assert {a['Location'] for a in db.get_all('Assets')} == {'Office'}
+
+
+def test_record_movements_writes_nothing_if_ids_cannot_be_allocated(db, monkeypatch):
+    def fail(*args, **kwargs):
+        raise RuntimeError('ID column unreadable')
+    monkeypatch.setattr(db, 'allocate_ids', fail)
+    assert not db.record_movements([move('A-1')], [{'Description': 'moved A-1'}])
+    assert db.get_all('AssetMovements') == []
+    assert [e['ID'] for e in db.get_all('ActivityLogs')] == ['7']
+    assert {a['Location'] for a in db.get_all('Assets')} == {'Store'}
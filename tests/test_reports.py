@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+import pytest
+
+# reports renders PDFs with reportlab at import time
+pytest.importorskip('reportlab')
+
+from reports import Filter, run_report  # noqa: E402
+from sqlite_db import SQLiteDB  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    db = SQLiteDB(':memory:')
+    db.insert_many('Assets', [
+        {'Asset Code': 'LAPT-0001', 'Item Name': 'Laptop', 'Asset Category': 'IT', 'Brand': 'Dell',
+         'Location': 'Office', 'Asset Status': 'Active', 'Amount': '1000',
+         'Date of Purchase': (date.today() - timedelta(days=730)).isoformat()},
+        {'Asset Code': 'CHAI-0001', 'Item Name': 'Chair', 'Asset Category': 'Furniture', 'Brand': 'Ikea',
+         'Location': 'Office', 'Asset Status': 'Active', 'Amount': '200'},
+        {'Asset Code': 'LAPT-0002', 'Item Name': 'Old laptop', 'Asset Category': 'IT', 'Brand': 'HP',
+         'Location': 'Store', 'Asset Status': 'Retired', 'Amount': '800'},
+    ])
+    # Assets have no Asset Type column, so rates are matched by category
+    db.insert('AssetTypes', {'Asset Code': 'IT', 'Asset Type': 'IT', 'Depreciation Value (%)': '25'})
+    db.insert_many('AssetMovements', [
+        {'ID': '1', 'Asset Code': 'LAPT-0001', 'From Location': 'Store', 'To Location': 'Office',
+         'Movement Date': '2024-01-05', 'Moved By': 'alice'},
+        {'ID': '2', 'Asset Code': 'CHAI-0001', 'From Location': 'Store', 'To Location': 'Office',
+         'Movement Date': '2024-03-10', 'Moved By': 'bob'},
+        {'ID': '3', 'Asset Code': 'LAPT-0002', 'From Location': 'Office', 'To Location': 'Store',
+         'Movement Date': '2024-06-20', 'Moved By': 'Alice'},
+    ])
+    return db
+
+
+def test_filter_matches():
+    row = {'Asset Code': 'LAPT-0001', 'Item Name': 'Laptop', 'Movement Date': '2024-03-10'}
+    assert Filter('code', 'Asset Code').accepts(row, 'LAPT-0001')
+    assert not Filter('code', 'Asset Code').accepts(row, 'lapt-0001')
+    search = Filter('search', match='search', fields=['Asset Code', 'Item Name'])
+    assert search.accepts(row, 'laptop')
+    assert not search.accepts(row, 'chair')
+    assert Filter('date_from', 'Movement Date', 'from').accepts(row, '2024-03-10')
+    assert not Filter('date_from', 'Movement Date', 'from').accepts(row, '2024-03-11')
+    assert Filter('date_to', 'Movement Date', 'to').accepts(row, '2024-12-31')
+    assert not Filter('date_to', 'Movement Date', 'to').accepts(row, '2024-01-01')
+
+
+def test_run_report_applies_filters(db):
+    result = run_report(db, 'assets', {'category': 'IT', 'status': 'Active'}, refresh=True)
+    assert [row['Asset Code'] for row in result.rows] == ['LAPT-0001']
+    assert result.params['category'] == 'IT'
+    # Unfiltered rows are kept for the filter dropdowns
+    assert result.distinct('Asset Category') == ['Furniture', 'IT']
+
+
+def test_run_report_search_and_blank_filters(db):
+    result = run_report(db, 'assets', {'search': 'LAPT', 'location': '  '}, refresh=True)
+    assert [row['Asset Code'] for row in result.rows] == ['LAPT-0001', 'LAPT-0002']
+
+
+def test_run_report_sorts_and_filters_dates(db):
+    result = run_report(db, 'movements', {'date_from': '2024-02-01', 'user': 'alice'}, refresh=True)
+    assert [row['ID'] for row in result.rows] == ['3']
+    result = run_report(db, 'movements', {}, refresh=True)
+    assert [row['ID'] for row in result.rows] == ['3', '2', '1']
+    assert result.headers()[0] == 'ID'
+
+
+def test_run_report_computes_depreciation_without_touching_source(db):
+    result = run_report(db, 'depreciation', {'status': 'Active'}, refresh=True)
+    laptop = next(row for row in result.rows if row['Asset Code'] == 'LAPT-0001')
+    assert laptop['depreciation_percent'] == 25
+    assert laptop['annual_depreciation'] == 250
+    assert 0 < laptop['current_value'] < 1000
+    assert 'current_value' not in result.source_rows[0]
+    totals = result.totals()
+    assert totals[5] == 'TOTALS:'
+    assert totals[6] == 1200
+
+
+def test_run_report_reuses_results_unless_refreshed(db):
+    first = run_report(db, 'assets', {'category': 'IT'}, refresh=True)
+    assert run_report(db, 'assets', {'category': 'IT'}) is first
+    db.insert('Assets', {'Asset Code': 'LAPT-0003', 'Item Name': 'New laptop', 'Asset Category': 'IT'})
+    assert len(run_report(db, 'assets', {'category': 'IT'}, refresh=True).rows) == 3
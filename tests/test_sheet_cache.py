@@ -0,0 +1,100 @@
+from sheet_cache import SheetCache, parse_table
+
+
+def locations_table():
+    return parse_table([
+        ['ID', 'Location Name'],
+        ['1', 'Office'],
+        ['', ''],
+        ['2', ' Store '],
+        ['3', 'Lab'],
+    ], 'ID')
+
+
+def test_parse_table_skips_blank_rows_and_strips_cells():
+    table = locations_table()
+    assert len(table) == 3
+    assert table.records()[1] == {'ID': '2', 'Location Name': 'Store'}
+    assert [table.row_number(pos) for pos in range(3)] == [2, 4, 5]
+    assert table.last_row == 5
+
+
+def test_parse_table_later_duplicate_header_wins():
+    table = parse_table([['ID', 'Name', 'Name'], ['1', 'old', 'new']], 'ID')
+    assert table.records() == [{'ID': '1', 'Name': 'new'}]
+
+
+def test_patch_rebuilds_index_when_key_changes():
+    table = locations_table()
+    pos = table.find('ID', '2')
+    table.patch(pos, {'ID': 20, 'Location Name': 'Warehouse'})
+    assert table.find('ID', '2') is None
+    assert table.find('ID', '20') == pos
+    assert table.record(pos) == {'ID': '20', 'Location Name': 'Warehouse'}
+
+
+def test_patch_ignores_unknown_fields():
+    table = locations_table()
+    table.patch(0, {'Unknown': 'x'})
+    assert table.fields() == ['ID', 'Location Name']
+
+
+def test_remove_shifts_rows_below():
+    table = locations_table()
+    table.remove(table.find('ID', '1'))
+    assert len(table) == 2
+    assert [table.row_number(pos) for pos in range(2)] == [3, 4]
+    assert table.last_row == 4
+    assert table.find('ID', '3') == 1
+    assert table.find('ID', '1') is None
+
+
+def test_append_uses_row_after_last_row():
+    table = locations_table()
+    table.append({'ID': '4', 'Location Name': 'Yard'})
+    assert table.row_number(3) == 6
+    assert table.last_row == 6
+    assert table.find('ID', '4') == 3
+
+
+def test_append_of_blank_record_only_moves_last_row():
+    table = locations_table()
+    table.append({'ID': '', 'Location Name': ''}, 9)
+    assert len(table) == 3
+    assert table.last_row == 9
+
+
+def test_extend_after_trailing_blank_rows():
+    table = locations_table()
+    new = table.extend([['', ''], ['4', 'Yard'], ['', ''], ['5', 'Dock'], ['', ''], ['']])
+    assert new == [{'ID': '4', 'Location Name': 'Yard'}, {'ID': '5', 'Location Name': 'Dock'}]
+    assert [table.row_number(pos) for pos in range(3, 5)] == [7, 9]
+    # The blank rows after the last value were not returned by the sheet
+    assert table.last_row == 9
+    assert table.find('ID', '5') == 4
+
+
+def test_extend_with_only_blank_rows_keeps_last_row():
+    table = locations_table()
+    assert table.extend([['', ''], ['']]) == []
+    assert table.last_row == 5
+
+
+def test_cache_expires_and_keeps_retained_tables():
+    cache = SheetCache(ttl=60, retain=['Locations'], full_sync_interval=60)
+    table = locations_table()
+    cache.put('Locations', table)
+    assert cache.get('Locations') is table
+    cache.expire('Locations')
+    assert cache.get('Locations') is None
+    assert cache.get_retained('Locations') is table
+    cache.touch('Locations')
+    assert cache.get('Locations') is table
+
+
+def test_cache_invalidate_drops_projections():
+    cache = SheetCache(ttl=60)
+    cache.put_projection('Assets', ['Asset Code'], {'Asset Code': ['A-1']})
+    assert cache.get_projection('Assets', ['Asset Code']) == {'Asset Code': ['A-1']}
+    cache.invalidate('Assets')
+    assert cache.get_projection('Assets', ['Asset Code']) is None
@@ -0,0 +1,51 @@
+import pytest
+
+from fake_sheets import FakeSheetsDB, FakeSpreadsheet
+from sheets_mirror import MirroredSheetsDB
+
+
+@pytest.fixture
+def spreadsheet():
+    spreadsheet = FakeSpreadsheet()
+    assets = spreadsheet.sheets['Assets']
+    # A column added to the sheet by hand
+    assets.rows[0].append('Asset Type')
+    width = len(assets.rows[0])
+    for code, asset_type in [('A-1', 'Laptop'), ('A-2', 'Desk')]:
+        row = [''] * width
+        row[0], row[-1] = code, asset_type
+        assets.rows.append(row)
+    return spreadsheet
+
+
+def make_mirror(spreadsheet, path):
+    mirror = MirroredSheetsDB(FakeSheetsDB(spreadsheet), path, 3600)
+    mirror.stop()
+    return mirror
+
+
+def test_mirror_keeps_columns_outside_the_schema(spreadsheet, tmp_path):
+    source = FakeSheetsDB(spreadsheet)
+    mirror = make_mirror(spreadsheet, str(tmp_path / 'mirror.db'))
+    assert mirror.get_all('Assets') == source.get_all('Assets')
+    assert mirror.get_all('Assets', columns=['Asset Type']) == [
+        {'Asset Code': 'A-1', 'Asset Type': 'Laptop'}, {'Asset Code': 'A-2', 'Asset Type': 'Desk'}]
+    assert mirror.get_by_id('Assets', 'Asset Code', 'A-2')['Asset Type'] == 'Desk'
+
+
+def test_extra_columns_survive_a_restart_and_refresh(spreadsheet, tmp_path):
+    path = str(tmp_path / 'mirror.db')
+    make_mirror(spreadsheet, path)
+    spreadsheet.sheets['Assets'].rows[1][-1] = 'Tablet'
+    restarted = make_mirror(spreadsheet, path)
+    # Served from the file left by the first run until the next refresh
+    assert restarted.get_columns('Assets', ['Asset Type'])['Asset Type'] == ['Laptop', 'Desk']
+    assert restarted.refresh()
+    assert restarted.get_columns('Assets', ['Asset Type'])['Asset Type'] == ['Tablet', 'Desk']
+
+
+def test_writes_keep_extra_columns(spreadsheet, tmp_path):
+    mirror = make_mirror(spreadsheet, str(tmp_path / 'mirror.db'))
+    assert mirror.update('Assets', 'Asset Code', 'A-1', {'Asset Type': 'Phone'})
+    assert mirror.insert('Assets', {'Asset Code': 'A-3', 'Asset Type': 'Chair'})
+    assert mirror.get_all('Assets') == FakeSheetsDB(spreadsheet).get_all('Assets')
@@ -0,0 +1,80 @@
+"""Streaming XLSX export built on openpyxl's write-only mode"""
+import tempfile
+from itertools import chain, islice
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import NamedStyle, Font, PatternFill, Alignment, Border, Side
+from openpyxl.utils import get_column_letter
+from typing import Iterable, List, Optional
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+MAX_COLUMN_WIDTH = 50
+# Rows read ahead to size the columns; write-only sheets need widths before the first row
+WIDTH_SAMPLE_ROWS = 1000
+# Exports larger than this spill from memory to a temporary file
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+
+
+def _report_styles() -> List[NamedStyle]:
+    """Header, body and totals styles, registered once per workbook and shared by every cell"""
+    thin = Side(style='thin')
+    border = Border(left=thin, right=thin, top=thin, bottom=thin)
+    return [
+        NamedStyle(name='Report Header', border=border,
+                   fill=PatternFill(start_color='366092', end_color='366092', fill_type='solid'),
+                   font=Font(bold=True, color='FFFFFF', size=12),
+                   alignment=Alignment(horizontal='center', vertical='center')),
+        NamedStyle(name='Report Body', border=border,
+                   alignment=Alignment(vertical='top', horizontal='left')),
+        NamedStyle(name='Report Total', border=border, font=Font(bold=True),
+                   alignment=Alignment(vertical='top', horizontal='left')),
+    ]
+
+
+def _column_widths(headers: List[str], rows: Iterable[List]) -> List[int]:
+    """Widths fitting the longest value of each column, capped at MAX_COLUMN_WIDTH"""
+    lengths = [len(str(h)) for h in headers]
+    for row in rows:
+        for i, value in enumerate(row[:len(lengths)]):
+            if value is not None and len(str(value)) > lengths[i]:
+                lengths[i] = len(str(value))
+    return [min(length + 2, MAX_COLUMN_WIDTH) for length in lengths]
+
+
+def write_xlsx(title: str, headers: List[str], rows: Iterable[List],
+               totals: Optional[List] = None) -> tempfile.SpooledTemporaryFile:
+    """Write one styled sheet in a single pass and return the file, rewound.
+
+    rows may be a generator; only the first WIDTH_SAMPLE_ROWS are held in
+    memory, to size the columns before anything is written.
+    """
+    wb = Workbook(write_only=True)
+    for style in _report_styles():
+        wb.add_named_style(style)
+    ws = wb.create_sheet(title)
+
+    rows = iter(rows)
+    sample = list(islice(rows, WIDTH_SAMPLE_ROWS))
+    widths = _column_widths(headers, sample + ([totals] if totals else []))
+    for i, width in enumerate(widths, start=1):
+        ws.column_dimensions[get_column_letter(i)].width = width
+
+    def styled(values, style):
+        cells = []
+        for value in values:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.style = style
+            cells.append(cell)
+        return cells
+
+    ws.append(styled(headers, 'Report Header'))
+    for row in chain(sample, rows):
+        ws.append(styled(row, 'Report Body'))
+    if totals:
+        ws.append(styled(totals, 'Report Total'))
+
+    output = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    wb.save(output)
+    output.seek(0)
+    return output